@@ -0,0 +1,167 @@
+"""In-process room actors: one asyncio task and mailbox per live room.
+
+Every mutating `RoomViewSet` action for a room is delivered to that room's
+actor as a message and runs to completion before the next one starts, so
+engine transitions for a room never interleave and need no database locks.
+The engine helpers persist through the ORM as they go, so an actor's state
+is flushed on every message (and therefore on game end) rather than on a
+timer.
+
+Rooms are spread over `ROOM_ACTOR_SHARDS` event-loop threads by a hash of
+the room code. `shard_for` is the same key a front-end router would use to
+pin a room to one worker process; `LocalRouter` stands in for that layer
+inside a single process.
+
+Limits: a message runs on a shard thread with that thread's own database
+connection, so it cannot join a transaction the caller has open. Callers
+inside `atomic()` (tests, `rolled_back` fixtures) therefore run the action
+inline instead, unserialized against the actor. And a caller that gives up
+after `ACTOR_CALL_TIMEOUT_SECONDS` does not cancel a message that already
+started: the action may still commit, which the timeout error says.
+"""
+import asyncio
+import concurrent.futures
+import contextvars
+import threading
+import zlib
+from functools import wraps
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+from rest_framework import exceptions, status
+
+from . import tracing
+
+ACTOR_IDLE_SECONDS = 300
+ACTOR_CALL_TIMEOUT_SECONDS = 30
+
+_current_room = contextvars.ContextVar("current_room_actor", default=None)
+
+
+class ActorTimeout(exceptions.APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "The room is busy and the action timed out; it may still have been applied, so reload the room before retrying."
+    default_code = "room_action_timeout"
+
+
+def shard_for(code: str) -> int:
+    return zlib.crc32(code.encode()) % settings.ROOM_ACTOR_SHARDS
+
+
+def _run_message(code: str, fn):
+    token = _current_room.set(code)
+    try:
+        return fn()
+    finally:
+        _current_room.reset(token)
+        close_old_connections()
+
+
+class RoomActor:
+    def __init__(self, shard: "Shard", code: str):
+        self.shard = shard
+        self.code = code
+        self.mailbox = asyncio.Queue()
+        self.task = shard.loop.create_task(self.run())
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                fn, future = await asyncio.wait_for(self.mailbox.get(), ACTOR_IDLE_SECONDS)
+            except asyncio.TimeoutError:
+                if self.mailbox.empty():
+                    self.shard.retire(self)
+                    return
+                continue
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = await loop.run_in_executor(self.shard.executor, _run_message, self.code, fn)
+            except BaseException as exc:
+                future.set_exception(exc)
+            else:
+                future.set_result(result)
+
+
+class Shard:
+    """One event-loop thread owning the actors for the room codes hashed to it."""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.actors = {}
+        self.loop = asyncio.new_event_loop()
+        self.executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=settings.ROOM_ACTOR_THREADS,
+            thread_name_prefix=f"room-shard-{index}",
+        )
+        self.thread = threading.Thread(target=self.loop.run_forever, name=f"room-shard-{index}", daemon=True)
+        self.thread.start()
+
+    def deliver(self, code: str, fn, future) -> None:
+        self.loop.call_soon_threadsafe(self._enqueue, code, fn, future)
+
+    def _enqueue(self, code: str, fn, future) -> None:
+        actor = self.actors.get(code)
+        if actor is None:
+            actor = self.actors[code] = RoomActor(self, code)
+        actor.mailbox.put_nowait((fn, future))
+
+    def retire(self, actor: RoomActor) -> None:
+        if self.actors.get(actor.code) is actor:
+            del self.actors[actor.code]
+
+
+class LocalRouter:
+    """Stand-in for the routing layer: shard index -> local shard, started lazily."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._shards = {}
+
+    def shard(self, index: int) -> Shard:
+        shard = self._shards.get(index)
+        if shard is None:
+            with self._lock:
+                shard = self._shards.get(index)
+                if shard is None:
+                    shard = self._shards[index] = Shard(index)
+        return shard
+
+    def dispatch(self, code: str, fn):
+        future = concurrent.futures.Future()
+        self.shard(shard_for(code)).deliver(code, fn, future)
+        try:
+            return future.result(timeout=ACTOR_CALL_TIMEOUT_SECONDS)
+        except concurrent.futures.TimeoutError:
+            # Only cancels a message still queued; a running one may yet commit.
+            future.cancel()
+            raise ActorTimeout()
+
+
+router = LocalRouter()
+
+
+def dispatch(code: str, fn):
+    """Run `fn` inside the actor for `code`.
+
+    Runs inline when actors are off, when already inside that actor, and when
+    the caller has a transaction open (which a shard thread could not join).
+    """
+    if not settings.ROOM_ACTORS_ENABLED or _current_room.get() == code or connection.in_atomic_block:
+        return fn()
+    return router.dispatch(code, tracing.bind(fn))
+
+
+def room_serialized(method):
+    """Run a detail `RoomViewSet` action as a message to its room's actor."""
+
+    @wraps(method)
+    def wrapper(viewset, request, *args, **kwargs):
+        code = kwargs[viewset.lookup_url_kwarg or viewset.lookup_field]
+        response = dispatch(code, lambda: method(viewset, request, *args, **kwargs))
+        if settings.ROOM_ACTORS_ENABLED:
+            response["X-Room-Shard"] = str(shard_for(code))
+        return response
+
+    return wrapper
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Game, Player, Profile, Room
+from .models import Game, GameResult, Player, Profile, Room, UserGameStats
 
 
 @admin.register(Game)
@@ -28,3 +28,17 @@ class PlayerAdmin(admin.ModelAdmin):
 class ProfileAdmin(admin.ModelAdmin):
     list_display = ("nickname", "user", "created_at")
     search_fields = ("nickname", "user__username", "user__email")
+
+
+@admin.register(GameResult)
+class GameResultAdmin(admin.ModelAdmin):
+    list_display = ("player_name", "user", "game", "won", "points", "ended_at")
+    list_filter = ("won", "game")
+    search_fields = ("player_name", "user__username", "room__code")
+
+
+@admin.register(UserGameStats)
+class UserGameStatsAdmin(admin.ModelAdmin):
+    list_display = ("user", "game", "played", "wins", "points", "best_points", "last_played_at")
+    list_filter = ("game",)
+    search_fields = ("user__username",)
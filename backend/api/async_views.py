@@ -0,0 +1,186 @@
+"""Native async views for the hot read and presence paths.
+
+Under ASGI these run on the event loop: authentication and presence writes
+use the async ORM, and only room serialization (which walks relations
+lazily) hops to a thread. Requests these views don't handle natively, such
+as other HTTP methods or non-JSON formats, are passed to the DRF view for
+the same route.
+"""
+import json
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.utils import timezone
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET
+from rest_framework import exceptions, status
+from rest_framework.authentication import CSRFCheck
+
+from . import catalog, fieldsets, polling, presence
+from .authentication import aauthenticate
+from .db_router import replica_read
+from .models import Player, Room
+from .serializers import GameSerializer, HeartbeatSerializer, PlayerSerializer, RoomDetailSerializer
+from .views import GameViewSet, RoomViewSet, conditional_game_list
+
+NOT_FOUND = {"detail": "No Room matches the given query."}
+
+game_list_view = GameViewSet.as_view({"get": "list", "post": "create"}, basename="game", detail=False)
+room_detail_view = RoomViewSet.as_view({"get": "retrieve"}, basename="room", detail=True)
+room_players_view = RoomViewSet.as_view({"get": "players"}, basename="room", detail=True)
+
+
+def _json_only(request) -> bool:
+    accept = request.META.get("HTTP_ACCEPT", "")
+    return "format" not in request.GET and "msgpack" not in accept and "columnar" not in accept
+
+
+async def _fallback(view, request, **kwargs):
+    return await sync_to_async(view)(request, **kwargs)
+
+
+def _error(detail: str, status_code: int) -> JsonResponse:
+    return JsonResponse({"detail": detail}, status=status_code)
+
+
+async def _authenticate(request):
+    """Set `request.user`; returns an error response when credentials are invalid."""
+    try:
+        request.user = await aauthenticate(request)
+    except exceptions.AuthenticationFailed as exc:
+        return _error(str(exc.detail), exc.status_code)
+    # Session users get the same CSRF check DRF's SessionAuthentication applies.
+    if request.user.is_authenticated and "HTTP_AUTHORIZATION" not in request.META:
+        check = CSRFCheck(lambda request: None)
+        check.process_request(request)
+        reason = check.process_view(request, None, (), {})
+        if reason:
+            return _error(f"CSRF Failed: {reason}", status.HTTP_403_FORBIDDEN)
+    return None
+
+
+def _payload(request) -> dict:
+    if request.content_type == "application/json":
+        try:
+            data = json.loads(request.body or b"{}")
+        except ValueError:
+            return {}
+        return data if isinstance(data, dict) else {}
+    return request.POST.dict()
+
+
+def _room_detail_data(code: str, request, room_fields=None, player_fields=None) -> dict:
+    room = fieldsets.room_detail_queryset(room_fields, player_fields).get(code=code)
+    context = {"request": request, "fields": room_fields, "player_fields": player_fields}
+    return RoomDetailSerializer(room, context=context).data
+
+
+def _room_players_data(room_id: int, request) -> list:
+    players = Player.objects.filter(room_id=room_id).select_related("room__game", "user__profile")
+    return PlayerSerializer(players, many=True, context={"request": request}).data
+
+
+async def _touch_player(code: str, user) -> None:
+    if user.is_authenticated:
+        await Player.objects.filter(room__code=code, user=user).aupdate(last_seen_at=timezone.now())
+
+
+# DRF views are csrf-exempt and re-check CSRF for session users only; these mirror that.
+@replica_read
+@csrf_exempt
+async def game_list(request):
+    if request.method not in {"GET", "HEAD"} or not _json_only(request):
+        return await _fallback(game_list_view, request)
+    games = await sync_to_async(catalog.active_games)()
+    data = GameSerializer(games, many=True).data
+    return conditional_game_list(request, JsonResponse(data, safe=False), data)
+
+
+@replica_read
+@require_GET
+async def room_detail(request, code):
+    if not _json_only(request):
+        return await _fallback(room_detail_view, request, code=code)
+    if failure := await _authenticate(request):
+        return failure
+    try:
+        requested = fieldsets.requested_fieldsets(request.GET)
+    except exceptions.ValidationError as exc:
+        return JsonResponse(exc.detail, status=exc.status_code)
+    await _touch_player(code, request.user)
+    try:
+        data = await sync_to_async(_room_detail_data)(code, request, *requested)
+    except Room.DoesNotExist:
+        return JsonResponse(NOT_FOUND, status=status.HTTP_404_NOT_FOUND)
+    return JsonResponse(data)
+
+
+@replica_read
+@require_GET
+async def room_players(request, code):
+    if not _json_only(request):
+        return await _fallback(room_players_view, request, code=code)
+    if failure := await _authenticate(request):
+        return failure
+    room_id = await Room.objects.filter(code=code).values_list("id", flat=True).afirst()
+    if room_id is None:
+        return JsonResponse(NOT_FOUND, status=status.HTTP_404_NOT_FOUND)
+    return JsonResponse({"players": await sync_to_async(_room_players_data)(room_id, request)})
+
+
+@csrf_exempt
+async def room_heartbeat(request, code):
+    if request.method != "POST":
+        return _error(f'Method "{request.method}" not allowed.', status.HTTP_405_METHOD_NOT_ALLOWED)
+    if failure := await _authenticate(request):
+        return failure
+    if not request.user.is_authenticated:
+        return _error("Authentication credentials were not provided.", status.HTTP_401_UNAUTHORIZED)
+    serializer = HeartbeatSerializer(data=_payload(request))
+    if not serializer.is_valid():
+        return JsonResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    player_id = serializer.validated_data["player_id"]
+    room_id = await Room.objects.filter(code=code).values_list("id", flat=True).afirst()
+    if room_id is None:
+        return JsonResponse(NOT_FOUND, status=status.HTTP_404_NOT_FOUND)
+    if not await presence.arecord_heartbeat(room_id, player_id, request.user):
+        return _error("Player not in room.", status.HTTP_400_BAD_REQUEST)
+    return JsonResponse({"ok": True, "player_id": player_id})
+
+
+@csrf_exempt
+async def room_tv_ping(request, code):
+    if request.method != "POST":
+        return _error(f'Method "{request.method}" not allowed.', status.HTTP_405_METHOD_NOT_ALLOWED)
+    ack = await presence.arecord_tv_ping(code, _payload(request).get("device_id"))
+    if ack is None:
+        return JsonResponse(NOT_FOUND, status=status.HTTP_404_NOT_FOUND)
+    return JsonResponse(ack)
+
+
+@require_GET
+async def room_wait(request, code):
+    """Long-poll companion to `RoomViewSet.retrieve`: GET /rooms/{code}/wait/?version=N&timeout=S.
+
+    Returns as soon as the room version differs from `version` (or immediately
+    when it is omitted), otherwise `{"changed": false}` after the timeout.
+    Accepts the same `profile`/`fields`/`player_fields` as the room detail.
+    `RoomViewSet.wait` serves the same route under WSGI.
+    """
+    if failure := await _authenticate(request):
+        return failure
+    try:
+        requested = fieldsets.requested_fieldsets(request.GET)
+    except exceptions.ValidationError as exc:
+        return JsonResponse(exc.detail, status=exc.status_code)
+
+    since = polling.wait_since(request.GET)
+    version = await polling.await_version(code, since, polling.wait_timeout(request.GET.get("timeout")))
+    if version is None:
+        return JsonResponse(NOT_FOUND, status=status.HTTP_404_NOT_FOUND)
+    if since is not None and version == since:
+        return JsonResponse({"changed": False, "version": version})
+
+    await _touch_player(code, request.user)
+    data = await sync_to_async(_room_detail_data)(code, request, *requested)
+    return JsonResponse({"changed": True, "version": data.get("version", version), "room": data})
@@ -0,0 +1,66 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+TOKEN_CACHE_PREFIX = "auth-token:"
+
+
+def _cache_key(key: str) -> str:
+    return f"{TOKEN_CACHE_PREFIX}{key}"
+
+
+def invalidate_token(key: str) -> None:
+    cache.delete(_cache_key(key))
+
+
+def invalidate_user_tokens(user) -> None:
+    keys = Token.objects.filter(user=user).values_list("key", flat=True)
+    cache.delete_many([_cache_key(key) for key in keys])
+
+
+def _active_user(token):
+    if not token.user.is_active:
+        raise exceptions.AuthenticationFailed(_("User inactive or deleted."))
+    return token.user
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """`TokenAuthentication` that keeps the resolved user (with profile) cached for a short TTL.
+
+    Signals drop the entry when the token is deleted or its user changes. That
+    reaches every worker only through a shared cache; with LocMem, a revoked
+    token stays valid on other workers for up to `AUTH_TOKEN_CACHE_SECONDS`.
+    """
+
+    def authenticate_credentials(self, key):
+        token = cache.get(_cache_key(key))
+        if token is None:
+            try:
+                token = Token.objects.select_related("user__profile").get(key=key)
+            except Token.DoesNotExist:
+                raise exceptions.AuthenticationFailed(_("Invalid token."))
+            if token.user.is_active:
+                cache.set(_cache_key(key), token, settings.AUTH_TOKEN_CACHE_SECONDS)
+        return (_active_user(token), token)
+
+
+async def aauthenticate(request):
+    """Resolve the request user for native async views: cached token first, then the session."""
+    auth = request.META.get("HTTP_AUTHORIZATION", "").split()
+    if not auth or auth[0].lower() != CachedTokenAuthentication.keyword.lower():
+        return await request.auser()
+    if len(auth) != 2:
+        raise exceptions.AuthenticationFailed(_("Invalid token header."))
+    key = auth[1]
+    token = await cache.aget(_cache_key(key))
+    if token is None:
+        try:
+            token = await Token.objects.select_related("user__profile").aget(key=key)
+        except Token.DoesNotExist:
+            raise exceptions.AuthenticationFailed(_("Invalid token."))
+        if token.user.is_active:
+            await cache.aset(_cache_key(key), token, settings.AUTH_TOKEN_CACHE_SECONDS)
+    return _active_user(token)
@@ -0,0 +1,48 @@
+import threading
+import time
+
+from .models import Game
+
+# Signals invalidate the local process; the TTL bounds staleness for other workers.
+CATALOG_TTL_SECONDS = 300
+
+_lock = threading.Lock()
+_catalog = None
+
+
+class _Catalog:
+    def __init__(self, games):
+        self.loaded_at = time.monotonic()
+        self.games = sorted(games, key=lambda game: game.name)
+        self.by_id = {game.id: game for game in self.games}
+        self.by_slug = {game.slug: game for game in self.games}
+        self.active = [game for game in self.games if game.is_active]
+
+
+def _current() -> _Catalog:
+    global _catalog
+    catalog = _catalog
+    if catalog is not None and time.monotonic() - catalog.loaded_at < CATALOG_TTL_SECONDS:
+        return catalog
+    with _lock:
+        if _catalog is None or time.monotonic() - _catalog.loaded_at >= CATALOG_TTL_SECONDS:
+            _catalog = _Catalog(Game.objects.all())
+        return _catalog
+
+
+def invalidate() -> None:
+    global _catalog
+    _catalog = None
+
+
+def active_games() -> list:
+    return list(_current().active)
+
+
+def get_game(game_id=None, slug=None) -> Game:
+    """Look up a game by id or slug, raising `Game.DoesNotExist` like `Game.objects.get`."""
+    catalog = _current()
+    game = catalog.by_id.get(game_id) if game_id else catalog.by_slug.get(slug)
+    if game is None:
+        raise Game.DoesNotExist("Game not found.")
+    return game
@@ -0,0 +1,90 @@
+"""Send safe poll reads to the `replica` database alias, with read-your-writes pinning.
+
+`ReplicaReadMiddleware` turns replica reads on per request: only for safe
+methods on views that opt in (`replica_read_actions` on a viewset, or the
+`replica_read` decorator on a function view), and never for a client that
+wrote within the last `REPLICA_PIN_SECONDS`. Everything else, including all
+writes, uses `default`. Pins live in the cache, so a replica requires the
+shared Redis cache (settings refuse to start without one).
+"""
+import contextvars
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+
+REPLICA_ALIAS = "replica"
+PIN_CACHE_PREFIX = "replica-pin:"
+
+_use_replica = contextvars.ContextVar("use_replica", default=False)
+
+
+def replica_enabled() -> bool:
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+def use_replica(enabled: bool) -> None:
+    _use_replica.set(enabled)
+
+
+def replica_read(view):
+    """Mark a function view as safe to serve from the replica."""
+    view.replica_read = True
+    return view
+
+
+def _pin_key(identity: str) -> str:
+    return PIN_CACHE_PREFIX + hashlib.sha256(identity.encode()).hexdigest()[:32]
+
+
+def _client_keys(request) -> list[str]:
+    # Pin on the credentials the client presents. The address only identifies
+    # fully anonymous clients: everyone behind one NAT or proxy shares it, and
+    # pinning it would send all of them to the primary.
+    identities = [
+        request.META.get("HTTP_AUTHORIZATION", ""),
+        request.COOKIES.get(settings.SESSION_COOKIE_NAME, ""),
+    ]
+    if not any(identities):
+        identities = [request.META.get("REMOTE_ADDR", "")]
+    return [_pin_key(identity) for identity in identities if identity]
+
+
+def pin_to_primary(request, response=None) -> None:
+    keys = _client_keys(request)
+    # A write that hands out a token (register/login) also pins the
+    # token-bearing reads that follow it.
+    data = getattr(response, "data", None)
+    token = data.get("token") if isinstance(data, dict) else None
+    if isinstance(token, str) and token:
+        keys.append(_pin_key(f"Token {token}"))
+    cache.set_many({key: True for key in keys}, settings.REPLICA_PIN_SECONDS)
+
+
+def is_pinned(request) -> bool:
+    return bool(cache.get_many(_client_keys(request)))
+
+
+def view_reads_replica(request, view_func) -> bool:
+    if getattr(view_func, "replica_read", False):
+        return True
+    actions = getattr(view_func, "actions", None) or {}
+    action = actions.get(request.method.lower())
+    return action in getattr(getattr(view_func, "cls", None), "replica_read_actions", ())
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if _use_replica.get() and replica_enabled():
+            return REPLICA_ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != REPLICA_ALIAS
@@ -0,0 +1,100 @@
+"""Sparse fieldsets for room snapshots.
+
+Clients pick the room and player fields they need with `?fields=a,b` and
+`?player_fields=x,y`, or a named `?profile=` below (explicit lists win over
+the profile). The same choice limits the serializer output and the columns
+loaded for the room and its players.
+"""
+from django.db.models import Prefetch
+from rest_framework.exceptions import ValidationError
+
+from .models import Player, Room
+
+PROFILES = {
+    # TV lobby screen: who is in and ready.
+    "tv": (
+        {"id", "code", "game", "status", "version", "tv_connected", "players", "next_poll_ms"},
+        {"id", "name", "is_host", "ready", "online"},
+    ),
+    # Host and player lobby screens. `user_id`, not `user`: that carries
+    # every player's email to everyone in the room.
+    "lobby": (
+        {"id", "code", "game", "status", "version", "tv_connected", "players", "next_poll_ms"},
+        {"id", "name", "user_id", "is_host", "ready", "online"},
+    ),
+    # Phone during a game: own and public per-player state.
+    "controller": (
+        {"id", "code", "game", "status", "state", "version", "players", "next_poll_ms"},
+        {"id", "name", "user_id", "is_host", "ready", "online", "has_guessed", "public_guess", "state"},
+    ),
+}
+
+# Room columns every snapshot needs: redaction and poll hints read the game and state.
+ROOM_BASE_COLUMNS = {"id", "code", "game", "status", "state", "version"}
+ROOM_FIELD_COLUMNS = {
+    "created_at": {"created_at"},
+    "last_activity_at": {"last_activity_at"},
+    "tv_last_seen_at": {"tv_last_seen_at"},
+    "tv_connected": {"tv_last_seen_at"},
+}
+
+# Player columns every snapshot needs: redaction reads `state`, viewer matching `user_id`.
+PLAYER_BASE_COLUMNS = {"id", "room", "user", "state"}
+PLAYER_FIELD_COLUMNS = {
+    "name": {"name"},
+    "device_id": {"device_id"},
+    "is_host": {"is_host"},
+    "ready": {"ready"},
+    "online": {"last_seen_at"},
+    "joined_at": {"joined_at"},
+    "last_seen_at": {"last_seen_at"},
+}
+
+
+def _split(value: str) -> set:
+    return {name.strip() for name in value.split(",") if name.strip()}
+
+
+def requested_fieldsets(query_params):
+    """Return `(room_fields, player_fields)`; either is None when unrestricted."""
+    room_fields = player_fields = None
+    profile = query_params.get("profile")
+    if profile:
+        if profile not in PROFILES:
+            raise ValidationError({"profile": [f"Unknown profile. Choose from: {', '.join(sorted(PROFILES))}."]})
+        room_fields, player_fields = PROFILES[profile]
+    if query_params.get("fields"):
+        room_fields = _split(query_params["fields"])
+    if query_params.get("player_fields"):
+        player_fields = _split(query_params["player_fields"])
+    return room_fields, player_fields
+
+
+def room_columns(room_fields) -> list:
+    columns = set(ROOM_BASE_COLUMNS)
+    for field in room_fields:
+        columns |= ROOM_FIELD_COLUMNS.get(field, set())
+    return sorted(columns)
+
+
+def player_columns(player_fields) -> list:
+    columns = set(PLAYER_BASE_COLUMNS)
+    for field in player_fields:
+        columns |= PLAYER_FIELD_COLUMNS.get(field, set())
+    return sorted(columns)
+
+
+def room_detail_queryset(room_fields=None, player_fields=None):
+    """Rooms with game and players loaded for `RoomDetailSerializer`, limited to the requested fields."""
+    queryset = Room.objects.select_related("game")
+    if room_fields is not None:
+        queryset = queryset.only(*room_columns(room_fields))
+        if "players" not in room_fields:
+            # Still loaded (narrowly) to find the viewer for heartbeats and poll hints.
+            player_fields = set()
+    players = Player.objects.all()
+    if player_fields is not None:
+        players = players.only(*player_columns(player_fields))
+    if player_fields is None or "user" in player_fields:
+        players = players.select_related("user__profile")
+    return queryset.prefetch_related(Prefetch("players", queryset=players))
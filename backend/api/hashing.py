@@ -0,0 +1,126 @@
+"""Password hashing off the request workers.
+
+PBKDF2 is deliberately slow, and a burst of registrations or logins at the
+start of a game night would otherwise pin request workers (and CPU) that
+room polls need. At most `PASSWORD_HASH_MAX_PENDING` hashes may be queued
+or running at once; a request that cannot get a slot within
+`PASSWORD_HASH_WAIT_SECONDS` fails fast with a 503 instead of piling up.
+Hashes run inline by default; set `PASSWORD_HASH_WORKERS` above 0 to run
+them in a small process pool of that size instead.
+
+Workers are spawned, not forked: the server process may already run threads
+(room actor shards, ASGI thread pools) whose locks a fork would copy mid-use.
+Each rejection logs the pool's counters from `metrics()` as a warning.
+"""
+import atexit
+import concurrent.futures
+import logging
+import multiprocessing
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_pool = None
+_slots = None
+
+_metrics = {
+    "submitted": 0,
+    "completed": 0,
+    "rejected": 0,
+    "in_flight": 0,
+    "max_in_flight": 0,
+    "wait_seconds": 0.0,
+    "hash_seconds": 0.0,
+}
+
+
+class HashingBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Too many sign-ins in progress, try again in a moment."
+    default_code = "hashing_busy"
+    # DRF's exception handler turns `wait` into a Retry-After header.
+    wait = 1
+
+
+def _init_worker():
+    import django
+
+    # Lower priority than request workers, so polls win the CPU during a burst.
+    os.nice(5)
+    django.setup()
+
+
+def _executor():
+    global _pool, _slots
+    with _lock:
+        if _slots is None:
+            _slots = threading.BoundedSemaphore(settings.PASSWORD_HASH_MAX_PENDING)
+            if settings.PASSWORD_HASH_WORKERS > 0:
+                _pool = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=settings.PASSWORD_HASH_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                )
+                atexit.register(shutdown)
+    return _pool, _slots
+
+
+def _bump(**changes) -> None:
+    with _lock:
+        for key, value in changes.items():
+            _metrics[key] += value
+        _metrics["max_in_flight"] = max(_metrics["max_in_flight"], _metrics["in_flight"])
+
+
+def _run(fn, *args):
+    pool, slots = _executor()
+    started = time.perf_counter()
+    if not slots.acquire(timeout=settings.PASSWORD_HASH_WAIT_SECONDS):
+        _bump(rejected=1)
+        logger.warning("password hashing busy, rejected a request: %s", metrics())
+        raise HashingBusy()
+    waited = time.perf_counter() - started
+    _bump(submitted=1, in_flight=1, wait_seconds=waited)
+    try:
+        if pool is None:
+            return fn(*args)
+        return pool.submit(fn, *args).result()
+    finally:
+        slots.release()
+        _bump(completed=1, in_flight=-1, hash_seconds=time.perf_counter() - started - waited)
+
+
+def make_password(raw_password: str) -> str:
+    return _run(hashers.make_password, raw_password)
+
+
+def check_password(user, raw_password: str) -> bool:
+    """`user.check_password` through the pool, including the hasher upgrade on success."""
+    is_correct, must_update = _run(hashers.verify_password, raw_password, user.password)
+    if is_correct and must_update:
+        user.password = make_password(raw_password)
+        user.save(update_fields=["password"])
+    return is_correct
+
+
+def shutdown() -> None:
+    """Stop the pool; the next hash starts a new one from current settings."""
+    global _pool, _slots
+    with _lock:
+        if _pool is not None:
+            _pool.shutdown()
+        _pool = _slots = None
+
+
+def metrics() -> dict:
+    """Counters for this process since start (seconds are totals, not averages)."""
+    with _lock:
+        return dict(_metrics)
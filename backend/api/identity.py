@@ -0,0 +1,31 @@
+"""Normalized, index-backed lookups for account emails and profile nicknames.
+
+Emails are stored lower-cased and nicknames with whitespace collapsed. Both
+are matched on `LOWER(column) = LOWER(value)`, which the functional indexes
+from migration 0004 serve (`iexact` compiles to LIKE/UPPER and would scan).
+"""
+from django.contrib.auth import get_user_model
+from django.db.models import Value
+from django.db.models.functions import Lower
+
+from .models import Profile
+
+User = get_user_model()
+
+
+def normalize_email(value: str) -> str:
+    return value.strip().lower()
+
+
+def normalize_nickname(value: str) -> str:
+    return " ".join(value.split())
+
+
+def users_with_email(email: str):
+    return User.objects.alias(email_key=Lower("email")).filter(email_key=Lower(Value(normalize_email(email))))
+
+
+def profiles_with_nickname(nickname: str):
+    return Profile.objects.alias(nickname_key=Lower("nickname")).filter(
+        nickname_key=Lower(Value(normalize_nickname(nickname)))
+    )
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+
+from api import results
+from api.models import Room
+
+
+class Command(BaseCommand):
+    help = (
+        "Record GameResult rows (and stats) for ended rooms that finished before results "
+        "were tracked. Safe to re-run: rooms already recorded are skipped. "
+        "--rebuild-stats recomputes every UserGameStats row from GameResult afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--rebuild-stats", action="store_true")
+        parser.add_argument("--dry-run", action="store_true", help="Only count the rooms that would be recorded.")
+
+    def handle(self, *args, **options):
+        pending = (
+            Room.objects.filter(status=Room.STATUS_ENDED)
+            .exclude(state__has_key=results.RECORDED_KEY)
+            .select_related("game")
+            .order_by("id")
+        )
+        if options["dry_run"]:
+            self.stdout.write(f"{pending.count()} ended rooms without results")
+            return
+
+        rooms = written = 0
+        for room in pending.iterator(chunk_size=options["batch_size"]):
+            # `record` stores the flagged state with a plain update: no version
+            # bump, so polling clients see no change.
+            written += len(results.record(room, dict(room.state or {}), ended_at=room.last_activity_at))
+            rooms += 1
+        self.stdout.write(f"recorded {written} results from {rooms} rooms")
+
+        if options["rebuild_stats"]:
+            self.stdout.write(f"rebuilt {results.rebuild_stats()} stats rows")
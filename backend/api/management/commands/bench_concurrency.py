@@ -0,0 +1,94 @@
+import asyncio
+import json
+import statistics
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+async def _request(host: str, port: int, path: str, timeout: float, body: bool = False):
+    """Minimal HTTP/1.1 GET over a fresh connection; returns (status, seconds[, body])."""
+    started = time.perf_counter()
+    reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    try:
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\nAccept: application/json\r\nConnection: close\r\n\r\n".encode())
+        await writer.drain()
+        status_line = await asyncio.wait_for(reader.readline(), timeout)
+        content = await asyncio.wait_for(reader.read(), timeout)
+    finally:
+        writer.close()
+    result = (int(status_line.split()[1]), time.perf_counter() - started)
+    if body:
+        return (*result, json.loads(content.partition(b"\r\n\r\n")[2] or b"{}"))
+    return result
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure concurrent-connection capacity of a running server: hold N long-poll "
+        "connections open on /rooms/{code}/wait/ and time room GETs issued meanwhile. "
+        "The long-poll is mounted with DJANGO_ASYNC_READ_VIEWS=1: run once against "
+        "`gunicorn backend.wsgi` and once against an ASGI server (e.g. "
+        "`uvicorn backend.asgi:application`) with it set, to compare."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("room", help="Code of an existing room on the target server.")
+        parser.add_argument("--url", default="http://127.0.0.1:8000")
+        parser.add_argument("--connections", type=int, default=200, help="Long-poll connections to hold open.")
+        parser.add_argument("--hold", type=float, default=10, help="Seconds each long-poll waits.")
+        parser.add_argument("--probes", type=int, default=50, help="Room GETs issued while connections are held.")
+        parser.add_argument("--timeout", type=float, default=30)
+
+    def handle(self, *args, **options):
+        target = urlsplit(options["url"])
+        if target.scheme != "http" or not target.hostname:
+            raise CommandError("--url must be a plain http:// URL.")
+        asyncio.run(self.run(target.hostname, target.port or 80, options))
+
+    async def run(self, host, port, options):
+        code = options["room"]
+        status, _, data = await _request(host, port, f"/api/rooms/{code}/wait/", options["timeout"], body=True)
+        if status != 200:
+            raise CommandError(f"Room {code} not reachable (HTTP {status}).")
+
+        hold_path = f"/api/rooms/{code}/wait/?version={data['version']}&timeout={options['hold']}"
+        holders = [
+            asyncio.create_task(_request(host, port, hold_path, options["hold"] + options["timeout"]))
+            for _ in range(options["connections"])
+        ]
+        await asyncio.sleep(0.5)
+
+        probe_latencies, probe_errors = [], 0
+        for _ in range(options["probes"]):
+            try:
+                status, seconds = await _request(host, port, f"/api/rooms/{code}/", options["timeout"])
+            except (OSError, asyncio.TimeoutError):
+                probe_errors += 1
+                continue
+            if status == 200:
+                probe_latencies.append(seconds)
+            else:
+                probe_errors += 1
+
+        results = await asyncio.gather(*holders, return_exceptions=True)
+        held = [result for result in results if not isinstance(result, BaseException) and result[0] == 200]
+
+        self.stdout.write(f"target {host}:{port}, room {code}")
+        self.stdout.write(f"long-polls held: {len(held)}/{options['connections']} completed OK")
+        if held:
+            durations = sorted(seconds for _, seconds in held)
+            self.stdout.write(
+                f"  wait duration p50={statistics.median(durations):.2f}s max={durations[-1]:.2f}s "
+                f"(target {options['hold']:.0f}s; longer means requests queued for a worker)"
+            )
+        if probe_latencies:
+            latencies = sorted(probe_latencies)
+            p95 = latencies[int(len(latencies) * 0.95) - 1] if len(latencies) >= 20 else latencies[-1]
+            self.stdout.write(
+                f"room GET while held: p50={statistics.median(latencies) * 1000:.0f}ms "
+                f"p95={p95 * 1000:.0f}ms errors={probe_errors}/{options['probes']}"
+            )
+        else:
+            self.stdout.write(f"room GET while held: all {options['probes']} probes failed")
@@ -0,0 +1,105 @@
+import statistics
+import threading
+import time
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.test import override_settings
+from rest_framework.test import APIClient
+
+from api import hashing
+from api.tests.fixtures import build_room
+
+User = get_user_model()
+
+
+def _percentiles(samples: list) -> str:
+    if not samples:
+        return "no samples"
+    ordered = sorted(samples)
+    p95 = ordered[max(int(len(ordered) * 0.95) - 1, 0)]
+    return f"p50={statistics.median(ordered) * 1000:.1f}ms p95={p95 * 1000:.1f}ms max={ordered[-1] * 1000:.1f}ms"
+
+
+class Command(BaseCommand):
+    help = (
+        "Registration storm: time room polls while N concurrent sign-ups hash "
+        "passwords, once hashing inline and once through the api.hashing pool. "
+        "Runs in-process on request threads; the accounts it creates are deleted afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--registrations", type=int, default=24)
+        parser.add_argument("--probes", type=int, default=40, help="Baseline room polls before the storm.")
+        parser.add_argument("--interval", type=float, default=0.02, help="Seconds between polls during the storm.")
+        parser.add_argument("--workers", type=int, default=2, help="Pool size for the pooled run.")
+        parser.add_argument("--max-pending", type=int, default=8)
+
+    def handle(self, *args, **options):
+        room = build_room("confinamento-solitario", 4, prefix="storm")
+        run_id = uuid.uuid4().hex[:8]
+        try:
+            for mode, workers in (("inline", 0), ("pool", options["workers"])):
+                with override_settings(PASSWORD_HASH_WORKERS=workers, PASSWORD_HASH_MAX_PENDING=options["max_pending"]):
+                    hashing.shutdown()
+                    hashing.make_password("warm-up")
+                    self.run_storm(mode, room, f"storm-{run_id}-{mode}", options)
+                hashing.shutdown()
+        finally:
+            User.objects.filter(email__startswith=f"storm-{run_id}-").delete()
+            User.objects.filter(players__room=room).delete()
+            room.delete()
+
+    def poll(self, client, path):
+        started = time.perf_counter()
+        response = client.get(path)
+        elapsed = time.perf_counter() - started
+        return elapsed if response.status_code == 200 else None
+
+    def run_storm(self, mode, room, email_prefix, options):
+        poller = APIClient()
+        path = f"/api/rooms/{room.code}/"
+        baseline = [self.poll(poller, path) for _ in range(options["probes"])]
+
+        statuses = []
+        status_lock = threading.Lock()
+
+        def register(index):
+            response = APIClient().post(
+                "/api/auth/register/",
+                {"email": f"{email_prefix}-{index}@example.com", "password": "storm-password", "nickname": f"{email_prefix}-{index}"},
+                format="json",
+            )
+            with status_lock:
+                statuses.append(response.status_code)
+            close_old_connections()
+
+        before = hashing.metrics()
+        threads = [threading.Thread(target=register, args=(index,)) for index in range(options["registrations"])]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        during = []
+        while any(thread.is_alive() for thread in threads):
+            during.append(self.poll(poller, path))
+            time.sleep(options["interval"])
+        for thread in threads:
+            thread.join()
+        storm_seconds = time.perf_counter() - started
+        after = hashing.metrics()
+
+        failed_polls = baseline.count(None) + during.count(None)
+        created = statuses.count(201)
+        busy = statuses.count(503)
+        hashed = after["completed"] - before["completed"]
+        self.stdout.write(f"[{mode}] {options['registrations']} registrations in {storm_seconds:.2f}s: {created} created, {busy} busy (503), {len(statuses) - created - busy} other")
+        self.stdout.write(f"  poll baseline: {_percentiles([s for s in baseline if s is not None])}")
+        self.stdout.write(f"  poll in storm: {_percentiles([s for s in during if s is not None])} ({len(during)} polls, {failed_polls} failed)")
+        if hashed:
+            self.stdout.write(
+                f"  hashing: {hashed} hashes, avg wait {(after['wait_seconds'] - before['wait_seconds']) / hashed * 1000:.0f}ms, "
+                f"avg hash {(after['hash_seconds'] - before['hash_seconds']) / hashed * 1000:.0f}ms, "
+                f"max in flight {after['max_in_flight']}, rejected {after['rejected'] - before['rejected']}"
+            )
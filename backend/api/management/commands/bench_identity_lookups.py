@@ -0,0 +1,88 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api import identity
+from api.models import Profile
+from api.serializers import LoginSerializer, ProfileUpdateSerializer, RegisterSerializer
+from api.tests.fixtures import rolled_back
+
+User = get_user_model()
+
+BATCH_SIZE = 5000
+
+
+class Command(BaseCommand):
+    help = (
+        "Time register/login/profile validation lookups against growing user tables "
+        "(rolled back afterwards) and show the query plan each lookup uses."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, nargs="+", default=[1000, 10000, 100000])
+        parser.add_argument("--iterations", type=int, default=200)
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'users':>8}{'register':>12}{'login':>12}{'nickname':>12}  (us per validation)")
+        with rolled_back():
+            created = 0
+            for target in sorted(options["users"]):
+                self.grow(created, target)
+                created = target
+                self.report(target, options["iterations"])
+            self.explain()
+
+    def grow(self, start, stop):
+        # Mixed-case rows exercise the case-insensitive match.
+        password = make_password(None)
+        for offset in range(start, stop, BATCH_SIZE):
+            indexes = range(offset, min(offset + BATCH_SIZE, stop))
+            users = User.objects.bulk_create(
+                [User(username=f"user{i}@example.com", email=f"User{i}@Example.com", password=password) for i in indexes]
+            )
+            Profile.objects.bulk_create(
+                [Profile(user=user, nickname=f"Player {i}") for i, user in zip(indexes, users)]
+            )
+
+    def time_us(self, iterations, validate) -> float:
+        started = time.perf_counter()
+        for _ in range(iterations):
+            validate()
+        return (time.perf_counter() - started) / iterations * 1_000_000
+
+    def report(self, count, iterations):
+        probe = count // 2
+
+        def register():
+            serializer = RegisterSerializer(
+                data={"email": f"USER{probe}@example.com", "password": "secret123", "nickname": f"player {probe}"}
+            )
+            assert not serializer.is_valid() and {"email", "nickname"} <= set(serializer.errors)
+
+        def login():
+            # Unknown email: the lookup alone, without hashing a password.
+            serializer = LoginSerializer(data={"email": f"missing{probe}@example.com", "password": "x"})
+            assert not serializer.is_valid()
+
+        def nickname():
+            serializer = ProfileUpdateSerializer(data={"nickname": f"PLAYER {probe}"})
+            assert not serializer.is_valid()
+
+        self.stdout.write(
+            f"{count:>8}{self.time_us(iterations, register):>12.0f}"
+            f"{self.time_us(iterations, login):>12.0f}{self.time_us(iterations, nickname):>12.0f}"
+        )
+
+    def explain(self):
+        lookups = [
+            ("email", identity.users_with_email("someone@example.com")),
+            ("nickname", identity.profiles_with_nickname("Someone")),
+        ]
+        for name, queryset in lookups:
+            with CaptureQueriesContext(connection):
+                plan = queryset.explain()
+            self.stdout.write(f"{name} plan: {' | '.join(line.strip() for line in plan.splitlines())}")
@@ -0,0 +1,58 @@
+import secrets
+import time
+
+from django.core.management.base import BaseCommand
+
+from api import rng as room_rng
+
+SUITS = ["hearts", "diamonds", "clubs", "spades"]
+
+
+def _deal(rng, players):
+    return rng.sample(range(1, 101), 3 * players)
+
+
+def _dice(rng, players):
+    return [[rng.randint(1, 6) for _ in range(4)] for _ in range(players)]
+
+
+def _suits(rng, players):
+    return [rng.choice(SUITS) for _ in range(players)] + [rng.random() < 0.5]
+
+
+EVENTS = [("deal (3 cards each)", _deal), ("dice (4 exits each)", _dice), ("suits + coin", _suits)]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare a fresh secrets.SystemRandom per event (the old engine) with the "
+        "per-room seeded generator, per event and per draw. Seed replay is tested in "
+        "api.tests.test_rng."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--players", type=int, default=8)
+        parser.add_argument("--iterations", type=int, default=5000)
+        parser.add_argument("--draws", type=int, default=100000, help="Draws from one generator for the per-draw figure.")
+
+    def handle(self, *args, **options):
+        players, iterations = options["players"], options["iterations"]
+        state = {}
+
+        self.stdout.write(f"{'event':<22}{'system us':>11}{'seeded us':>11}")
+        for name, event in EVENTS:
+            system = self.time_us(iterations, lambda: event(secrets.SystemRandom(), players))
+            seeded = self.time_us(iterations, lambda: event(room_rng.for_state(state), players))
+            self.stdout.write(f"{name:<22}{system:>11.1f}{seeded:>11.1f}")
+
+        draws = options["draws"]
+        system_rng, seeded_rng = secrets.SystemRandom(), room_rng.for_state(state)
+        system = self.time_us(1, lambda: [system_rng.randint(1, 6) for _ in range(draws)]) * 1000 / draws
+        seeded = self.time_us(1, lambda: [seeded_rng.randint(1, 6) for _ in range(draws)]) * 1000 / draws
+        self.stdout.write(f"per draw (randint): system {system:.0f}ns, seeded {seeded:.0f}ns")
+
+    def time_us(self, iterations, fn) -> float:
+        started = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        return (time.perf_counter() - started) / iterations * 1_000_000
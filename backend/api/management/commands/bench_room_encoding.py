@@ -0,0 +1,57 @@
+import time
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from api.middleware import brotli, compress
+from api.renderers import ColumnarJSONRenderer, MessagePackRenderer, msgpack
+from api.serializers import RoomDetailSerializer
+from api.tests.fixtures import build_room, rolled_back
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare encode time and bytes per room (raw and compressed) for the JSON, "
+        "columnar and MessagePack room formats."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--game", default="confinamento-solitario")
+        parser.add_argument("--players", type=int, default=12)
+        parser.add_argument("--iterations", type=int, default=200)
+
+    def handle(self, *args, **options):
+        renderers = [("json", JSONRenderer()), ("columnar", ColumnarJSONRenderer())]
+        if msgpack is not None:
+            renderers.append(("msgpack", MessagePackRenderer()))
+        else:
+            self.stdout.write("msgpack not installed; skipping MessagePack.")
+
+        encodings = ["gzip"] + (["br"] if brotli is not None else [])
+
+        with rolled_back():
+            room = build_room(options["game"], options["players"])
+            iterations = options["iterations"]
+
+            started = time.perf_counter()
+            for _ in range(iterations):
+                data = RoomDetailSerializer(room).data
+            serialize_us = (time.perf_counter() - started) / iterations * 1_000_000
+
+            self.stdout.write(
+                f"{room.game.slug}, {options['players']} players, {iterations} iterations; "
+                f"RoomDetailSerializer: {serialize_us:.0f} us/room"
+            )
+            header = "".join(f"{encoding:>8}" for encoding in encodings)
+            self.stdout.write(f"{'format':<10}{'bytes':>8}{'ratio':>8}{'encode us':>12}{header}")
+            baseline = None
+            for name, renderer in renderers:
+                started = time.perf_counter()
+                for _ in range(iterations):
+                    payload = renderer.render(data)
+                encode_us = (time.perf_counter() - started) / iterations * 1_000_000
+                baseline = baseline or len(payload)
+                compressed = "".join(f"{len(compress(payload, encoding)):>8}" for encoding in encodings)
+                self.stdout.write(
+                    f"{name:<10}{len(payload):>8}{len(payload) / baseline:>8.2f}{encode_us:>12.0f}{compressed}"
+                )
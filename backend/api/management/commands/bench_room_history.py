@@ -0,0 +1,69 @@
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from rest_framework.test import APIClient
+
+from api.models import Game, Player, Room
+from api.tests.fixtures import rolled_back
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Page through /auth/history/ for a user with thousands of rooms (rolled back "
+        "afterwards) and compare keyset pages with the equivalent OFFSET query."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rooms", type=int, default=5000, help="Rooms the heavy user joined.")
+        parser.add_argument("--others", type=int, default=3, help="Other players per room.")
+        parser.add_argument("--limit", type=int, default=50)
+
+    def handle(self, *args, **options):
+        with rolled_back():
+            user = self.build_history(options["rooms"], options["others"])
+            client = APIClient()
+            client.force_authenticate(user)
+
+            timings, rows = [], 0
+            url = f"/api/auth/history/?limit={options['limit']}"
+            while url:
+                started = time.perf_counter()
+                data = client.get(url).json()
+                timings.append(time.perf_counter() - started)
+                rows += len(data["results"])
+                url = data["next"]
+
+            players = Player.objects.filter(user=user).order_by("-joined_at", "-id")
+            deepest = max(rows - options["limit"], 0)
+            started = time.perf_counter()
+            list(players.select_related("room__game")[deepest : deepest + options["limit"]])
+            offset_ms = (time.perf_counter() - started) * 1000
+
+            self.stdout.write(f"{rows} rooms in {len(timings)} pages of {options['limit']}")
+            self.stdout.write(
+                f"keyset page: first={timings[0] * 1000:.1f}ms median={statistics.median(timings) * 1000:.1f}ms "
+                f"last={timings[-1] * 1000:.1f}ms"
+            )
+            self.stdout.write(f"OFFSET {deepest} query alone: {offset_ms:.1f}ms")
+            self.stdout.write(f"plan: {' | '.join(line.strip() for line in players.explain().splitlines())}")
+
+    def build_history(self, room_count, others):
+        password = make_password(None)
+        user = User.objects.create(username="history@example.com", email="history@example.com", password=password)
+        neighbours = User.objects.bulk_create(
+            [User(username=f"history-{i}@example.com", email=f"history-{i}@example.com", password=password) for i in range(others)]
+        )
+        game = Game.objects.get(slug="confinamento-solitario")
+        rooms = Room.objects.bulk_create(
+            [Room(code=f"H{i:05d}", game=game, status=Room.STATUS_ENDED, state={"winners": []}) for i in range(room_count)]
+        )
+        Player.objects.bulk_create(
+            [Player(room=room, user=member, name=member.username) for room in rooms for member in [user, *neighbours]],
+            batch_size=5000,
+        )
+        return user
@@ -0,0 +1,185 @@
+import json
+import statistics
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api import catalog, fieldsets, views
+from api.models import Game, Player, Room
+from api.serializers import PlayerSerializer, RoomDetailSerializer
+from api.tests.fixtures import build_room, rolled_back
+
+# Query counts are the same on every machine, so they are committed. Timings
+# are not: they only compare against runs on the same machine, kept locally.
+DEFAULT_BASELINE = Path(settings.BASE_DIR) / "benchmarks" / "baseline.json"
+DEFAULT_TIMINGS = Path(settings.BASE_DIR) / "benchmarks" / "timings.local.json"
+
+
+def _set_player_states(room: Room, update) -> None:
+    players = list(Player.objects.filter(room=room).order_by("id"))
+    for index, player in enumerate(players):
+        player.state = {**(player.state or {}), **update(index, player)}
+    Player.objects.bulk_update(players, ["state"])
+
+
+def _engine_room(room: Room) -> Room:
+    return Room.objects.select_related("game").get(pk=room.pk)
+
+
+def _apply_play(room):
+    players = list(Player.objects.filter(room=room))
+    # The highest card is always a cut: exercises the victim search and the co-op penalty.
+    player, card = max(((player, max(player.state["hand"])) for player in players), key=lambda pair: pair[1])
+    room = _engine_room(room)
+    return lambda: views._apply_play(room, player, card)
+
+
+def _resolve_beleza(room):
+    _set_player_states(room, lambda index, player: {"guess": (index * 7) % 101})
+    room = _engine_room(room)
+    return lambda: views._resolve_beleza(room, force=True)
+
+
+def _resolve_leilao(room):
+    _set_player_states(room, lambda index, player: {"bid": index * 3, "submitted": True})
+    room = _engine_room(room)
+    return lambda: views._resolve_leilao(room, force=True)
+
+
+def _resolve_sugoroku(room):
+    room = _engine_room(room)
+    return lambda: views._resolve_sugoroku(room)
+
+
+def _blef_resolve_round(room):
+    ids = list(Player.objects.filter(room=room).order_by("id").values_list("id", flat=True))
+    _set_player_states(room, lambda index, player: {"guess_winner_id": ids[(index + 1) % len(ids)]})
+    room = _engine_room(room)
+    return lambda: views._blef_resolve_round(room, dict(room.state))
+
+
+def _resolve_confinamento(room):
+    # Everyone guesses right: no eliminations, so the round (and its query count) is the same every run.
+    _set_player_states(room, lambda index, player: {"guess": player.state["suit"]})
+    room = _engine_room(room)
+    return lambda: views._resolve_confinamento(room, force=True)
+
+
+def _player_serializer(room):
+    room = fieldsets.room_detail_queryset().get(pk=room.pk)
+    return lambda: PlayerSerializer(room.players.all(), many=True).data
+
+
+def _room_detail_serializer(room):
+    room = fieldsets.room_detail_queryset().get(pk=room.pk)
+    return lambda: RoomDetailSerializer(room).data
+
+
+# name -> (game, setup). Setup runs untimed on a fresh started room and
+# returns the call to time.
+CASES = {
+    "apply_play": ("read-my-mind", _apply_play),
+    "resolve_beleza": ("concurso-de-beleza", _resolve_beleza),
+    "resolve_leilao": ("leilao-de-cem-votos", _resolve_leilao),
+    "resolve_sugoroku": ("future-sugoroku", _resolve_sugoroku),
+    "blef_resolve_round": ("blef-jack", _blef_resolve_round),
+    "resolve_confinamento": ("confinamento-solitario", _resolve_confinamento),
+    "PlayerSerializer": ("confinamento-solitario", _player_serializer),
+    "RoomDetailSerializer": ("confinamento-solitario", _room_detail_serializer),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the engine hot paths and room serializers at several player counts, with "
+        "cold (catalog and cache cleared) and warm caches. --check fails when a query "
+        "count exceeds the committed baseline; --check-time also fails on slowdowns "
+        "beyond the tolerance against timings saved on this machine. --update-baseline "
+        "rewrites the query baseline and saves the local timings."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--players", type=int, nargs="+", default=[4, 8, 16])
+        parser.add_argument("--case", nargs="+", choices=sorted(CASES), default=None)
+        parser.add_argument("--repeat", type=int, default=7, help="Timed runs per measurement; the median is kept.")
+        parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Committed query counts.")
+        parser.add_argument("--timings", default=str(DEFAULT_TIMINGS), help="This machine's timings (not committed).")
+        parser.add_argument("--tolerance", type=float, default=0.5, help="Allowed slowdown as a fraction of the local timing.")
+        parser.add_argument("--min-delta-ms", type=float, default=0.5, help="Ignore slowdowns smaller than this.")
+        parser.add_argument("--check", action="store_true")
+        parser.add_argument("--check-time", action="store_true", help="Also fail on slowdowns (implies --check).")
+        parser.add_argument("--update-baseline", action="store_true")
+
+    def handle(self, *args, **options):
+        baseline_path = Path(options["baseline"])
+        timings_path = Path(options["timings"])
+        baseline = json.loads(baseline_path.read_text()) if baseline_path.is_file() else {}
+        timings = json.loads(timings_path.read_text()) if timings_path.is_file() else {}
+        if options["check_time"] and not timings and not options["update_baseline"]:
+            raise CommandError(f"No local timings at {timings_path}; run with --update-baseline on this machine first.")
+        queries_by_key = {}
+        ms_by_key = {}
+        failures = []
+
+        self.stdout.write(f"{'case':<30}{'players':>8}{'cache':>6}{'ms':>9}{'local ms':>10}{'queries':>9}{'base':>6}")
+        for name in options["case"] or CASES:
+            for player_count in options["players"]:
+                for cache_state in ("cold", "warm"):
+                    key = f"{name}/{player_count}/{cache_state}"
+                    ms, queries = self.measure(name, player_count, cache_state == "cold", options["repeat"])
+                    ms_by_key[key] = round(ms, 3)
+                    queries_by_key[key] = queries
+                    base = baseline.get(key)
+                    local_ms = timings.get(key)
+                    self.stdout.write(
+                        f"{name:<30}{player_count:>8}{cache_state:>6}{ms:>9.2f}"
+                        f"{f'{local_ms:.2f}' if local_ms is not None else '-':>10}"
+                        f"{queries:>9}{base['queries'] if base else '-':>6}"
+                    )
+                    if base and queries > base["queries"]:
+                        failures.append(f"{key} queries {base['queries']} -> {queries}")
+                    if options["check_time"] and local_ms is not None and self.slower(ms, local_ms, options):
+                        failures.append(f"{key} {local_ms:.2f}ms -> {ms:.2f}ms")
+
+        if options["update_baseline"]:
+            baseline_path.parent.mkdir(parents=True, exist_ok=True)
+            merged = {**baseline, **{key: {"queries": count} for key, count in queries_by_key.items()}}
+            baseline_path.write_text(json.dumps(merged, indent=2, sort_keys=True) + "\n")
+            timings_path.write_text(json.dumps({**timings, **ms_by_key}, indent=2, sort_keys=True) + "\n")
+            self.stdout.write(f"wrote {len(queries_by_key)} query counts to {baseline_path} and timings to {timings_path}")
+        if failures:
+            message = "Regressions: " + "; ".join(failures)
+            if options["check"] or options["check_time"]:
+                raise CommandError(message)
+            self.stdout.write(message)
+
+    def slower(self, ms, local_ms, options) -> bool:
+        return ms - local_ms > options["min_delta_ms"] and ms > local_ms * (1 + options["tolerance"])
+
+    def measure(self, name, player_count, cold, repeat):
+        game, setup = CASES[name]
+        timings = []
+        queries = 0
+        for _ in range(repeat):
+            with rolled_back():
+                try:
+                    room = build_room(game, player_count)
+                except Game.DoesNotExist:
+                    raise CommandError("run seed_games first")
+                call = setup(room)
+                if cold:
+                    catalog.invalidate()
+                    cache.clear()
+                else:
+                    catalog.active_games()
+                with CaptureQueriesContext(connection) as captured:
+                    started = time.perf_counter()
+                    call()
+                    timings.append((time.perf_counter() - started) * 1000)
+                queries = max(queries, len(captured.captured_queries))
+        return statistics.median(timings), queries
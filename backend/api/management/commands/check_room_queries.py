@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.models import Game
+from api.tests.fixtures import CASES, prepared
+
+
+class Command(BaseCommand):
+    help = (
+        "Report the queries (and bytes of SQL) each room action issues, as an "
+        "authenticated player, at several player counts. The budgets and the constant "
+        "count per action are asserted by api.tests.test_room_queries."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--players", type=int, nargs="+", default=[2, 8, 16])
+        parser.add_argument("--action", nargs="+", default=None, help="Only these actions.")
+        parser.add_argument("--verbose-sql", action="store_true", help="Print each captured query.")
+
+    def handle(self, *args, **options):
+        cases = [case for case in CASES if not options["action"] or case.name in options["action"]]
+        self.stdout.write(f"{'action':<26}{'game':<24}" + "".join(f"{f'n={count}':>7}" for count in options["players"]) + f"{'sql bytes':>11}")
+        for case in cases:
+            counts = []
+            for player_count in options["players"]:
+                queries, status_code = self.measure(case, player_count)
+                if status_code != case.status:
+                    raise CommandError(f"{case.name} ({case.game}, {player_count} players) returned HTTP {status_code}")
+                counts.append(len(queries))
+                if options["verbose_sql"]:
+                    self.stdout.write(f"  {case.name} with {player_count} players:")
+                    for query in queries:
+                        self.stdout.write(f"    {query['sql']}")
+            sql_bytes = sum(len(query["sql"]) for query in queries)
+            growth = "" if len(set(counts)) == 1 else "  grows with players"
+            self.stdout.write(f"{case.name:<26}{case.game:<24}" + "".join(f"{count:>7}" for count in counts) + f"{sql_bytes:>11}{growth}")
+
+    def measure(self, case, player_count):
+        try:
+            with prepared(case, player_count) as send, CaptureQueriesContext(connection) as captured:
+                response = send()
+        except Game.DoesNotExist:
+            raise CommandError("run seed_games first")
+        return captured.captured_queries, response.status_code
@@ -0,0 +1,57 @@
+import pstats
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        "Summarize request profiles written by ProfilingMiddleware: per endpoint, the "
+        "number of profiled requests and the top functions by time per request. "
+        "--folded merges the stack samples into one flamegraph input."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dir", default=None, help="Profile directory (default: PROFILE_DIR).")
+        parser.add_argument("--endpoint", default=None, help="Only endpoints containing this text.")
+        parser.add_argument("--top", type=int, default=15)
+        parser.add_argument("--sort", choices=["cumulative", "tottime"], default="cumulative")
+        parser.add_argument("--folded", default=None, help="Write merged stack samples to this file.")
+
+    def handle(self, *args, **options):
+        root = Path(options["dir"] or settings.PROFILE_DIR)
+        if not root.is_dir():
+            raise CommandError(f"No profiles in {root}.")
+        endpoints = sorted(
+            path for path in root.iterdir()
+            if path.is_dir() and (not options["endpoint"] or options["endpoint"] in path.name)
+        )
+        folded = Counter()
+        for directory in endpoints:
+            profiles = sorted(directory.glob("*.prof"))
+            if not profiles:
+                continue
+            self.report(directory.name, profiles, options["sort"], options["top"])
+            for path in directory.glob("*.folded"):
+                for line in path.read_text().splitlines():
+                    stack, _, count = line.rpartition(" ")
+                    folded[f"{directory.name};{stack}"] += int(count)
+
+        if options["folded"]:
+            Path(options["folded"]).write_text("".join(f"{stack} {count}\n" for stack, count in folded.items()))
+            self.stdout.write(f"wrote {len(folded)} stacks to {options['folded']}")
+
+    def report(self, endpoint, profiles, sort, top):
+        stats = pstats.Stats(*(str(path) for path in profiles))
+        requests = len(profiles)
+        self.stdout.write(f"\n{endpoint}: {requests} requests, {stats.total_tt / requests * 1000:.1f}ms profiled each")
+        self.stdout.write(f"{'cum ms/req':>11}{'own ms/req':>11}{'calls/req':>10}  function")
+        column = 3 if sort == "cumulative" else 2
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][column], reverse=True)
+        for (filename, line, name), (_, calls, own, cumulative, _) in rows[:top]:
+            where = name if filename == "~" else f"{Path(filename).name}:{line}({name})"
+            self.stdout.write(
+                f"{cumulative / requests * 1000:>11.2f}{own / requests * 1000:>11.2f}{calls / requests:>10.1f}  {where}"
+            )
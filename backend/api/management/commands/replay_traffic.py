@@ -0,0 +1,378 @@
+import asyncio
+import gzip
+import json
+import re
+import time
+import uuid
+from collections import defaultdict
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from api import views
+
+MAX_SPEED = 50
+REPLAY_PASSWORD = "replay-traffic"
+# The replayer registers its own user per recorded user instead.
+SKIPPED_PATHS = {
+    "/api/auth/register/",
+    "/api/auth/login/",
+    "/api/auth/logout/",
+    "/api/auth/password/",
+    "/api/auth/profile/",
+}
+ROOM_PATH = re.compile(r"^/api/rooms/([^/]+)/")
+NUMERIC_SEGMENT = re.compile(r"/\d+(?=/)")
+# Rooms created before the recording started are created with the game their
+# first game action belongs to.
+ACTION_GAMES = {
+    "read_my_mind_": views.READ_MY_MIND_SLUG,
+    "confinamento_": views.CONFINAMENTO_SLUG,
+    "beleza_": views.BELEZA_SLUG,
+    "sugoroku_": views.SUGOROKU_SLUG,
+    "leilao_": views.LEILAO_SLUG,
+    "blef_jack_": views.BLEF_JACK_SLUG,
+}
+
+
+def load_records(paths) -> list:
+    """Read recorded JSONL (gzipped or not); a truncated last gzip member is skipped."""
+    files = []
+    for path in map(Path, paths):
+        files.extend(sorted(path.glob("*.jsonl*")) if path.is_dir() else [path])
+    records = []
+    for path in files:
+        opener = gzip.open if path.suffix == ".gz" else open
+        try:
+            with opener(path, "rt") as traffic_file:
+                for line in traffic_file:
+                    records.append(json.loads(line))
+        except (EOFError, gzip.BadGzipFile, json.JSONDecodeError):
+            pass
+    return sorted(records, key=lambda record: record["ts"])
+
+
+def room_code(path: str):
+    match = ROOM_PATH.match(path)
+    return match.group(1) if match else None
+
+
+def endpoint(path: str) -> str:
+    return NUMERIC_SEGMENT.sub("/{id}", ROOM_PATH.sub("/api/rooms/{code}/", path))
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0.0
+
+
+def summarize(results) -> dict:
+    groups = defaultdict(list)
+    for result in results:
+        groups[result["endpoint"]].append(result)
+        groups["all"].append(result)
+    summary = {}
+    for name, group in groups.items():
+        timings = [result["ms"] for result in group]
+        recorded = [result["recorded_ms"] for result in group]
+        summary[name] = {
+            "count": len(group),
+            "errors": sum(1 for result in group if result["status"] == 0 or result["status"] >= 500),
+            "client_errors": sum(1 for result in group if 400 <= result["status"] < 500),
+            "status_changed": sum(1 for result in group if result["status"] != result["recorded_status"]),
+            "p50_ms": round(percentile(timings, 0.5), 2),
+            "p95_ms": round(percentile(timings, 0.95), 2),
+            "p99_ms": round(percentile(timings, 0.99), 2),
+            "recorded_p50_ms": round(percentile(recorded, 0.5), 2),
+            "lag_p95_ms": round(percentile([result["lag_ms"] for result in group], 0.95), 2),
+        }
+    return summary
+
+
+class Replay:
+    """Re-drive recorded sessions (one per user, or per client when anonymous) against a server."""
+
+    def __init__(self, records, host, port, speed, timeout, default_game):
+        self.records = records
+        self.host = host
+        self.port = port
+        self.speed = speed
+        self.timeout = timeout
+        self.default_game = default_game
+        self.run_id = uuid.uuid4().hex[:6]
+        self.sessions = defaultdict(list)
+        self.room_games = {}
+        self.room_users = defaultdict(list)
+        self.player_owners = {}
+        self.created_rooms = set()
+        for record in records:
+            self.sessions[record["user"] or record["client"]].append(record)
+            code = record.get("room") or room_code(record["path"])
+            if code is None:
+                continue
+            if record.get("room"):
+                self.created_rooms.add(code)
+            if record["user"] and record["user"] not in self.room_users[code]:
+                self.room_users[code].append(record["user"])
+            action = record["path"][len(f"/api/rooms/{code}/"):].rstrip("/")
+            game = next((slug for prefix, slug in ACTION_GAMES.items() if action.startswith(prefix)), None)
+            if game and code not in self.room_games:
+                self.room_games[code] = game
+            if record.get("player"):
+                self.player_owners[record["player"]] = (code, record["user"])
+        self.tokens = {}
+        self.user_ids = {}
+        self.rooms = {}
+        self.players = {}
+        self.results = []
+
+    async def request(self, method, path, token=None, body=None, until=None):
+        """Minimal HTTP/1.1 request over a fresh connection; returns (status, ms, JSON body).
+
+        With `until`, the response is read as a stream until the event is set,
+        and the time is to the first byte.
+        """
+        payload = json.dumps(body).encode() if body is not None else b""
+        accept = "text/event-stream" if until is not None else "application/json"
+        headers = [f"{method} {path} HTTP/1.1", f"Host: {self.host}", f"Accept: {accept}", "Connection: close"]
+        if token:
+            headers.append(f"Authorization: Token {token}")
+        if body is not None:
+            headers += ["Content-Type: application/json", f"Content-Length: {len(payload)}"]
+        started = time.perf_counter()
+        writer = None
+        try:
+            reader, writer = await asyncio.wait_for(asyncio.open_connection(self.host, self.port), self.timeout)
+            writer.write(("\r\n".join(headers) + "\r\n\r\n").encode() + payload)
+            await writer.drain()
+            status_line = await asyncio.wait_for(reader.readline(), self.timeout)
+            ms = (time.perf_counter() - started) * 1000
+            if until is not None:
+                while not until.is_set() and await self._read_some(reader, until):
+                    pass
+                return int(status_line.split()[1]), ms, None
+            content = await asyncio.wait_for(reader.read(), self.timeout)
+            ms = (time.perf_counter() - started) * 1000
+        except (OSError, asyncio.TimeoutError, IndexError, ValueError):
+            return 0, (time.perf_counter() - started) * 1000, None
+        finally:
+            if writer is not None:
+                writer.close()
+        try:
+            data = json.loads(content.partition(b"\r\n\r\n")[2] or b"null")
+        except ValueError:
+            data = None
+        return int(status_line.split()[1]), ms, data
+
+    async def _read_some(self, reader, until) -> bool:
+        read = asyncio.ensure_future(reader.read(4096))
+        stopped = asyncio.ensure_future(until.wait())
+        done, pending = await asyncio.wait({read, stopped}, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        return read in done and bool(read.result())
+
+    async def setup(self):
+        """Register a user per recorded user and create the rooms that predate the recording."""
+        limit = asyncio.Semaphore(8)
+
+        async def register(user):
+            suffix = f"{self.run_id}-{user.partition(':')[2]}"
+            body = {"email": f"replay-{suffix}@example.com", "nickname": f"replay-{suffix}", "password": REPLAY_PASSWORD}
+            async with limit:
+                status, _, data = await self.request("POST", "/api/auth/register/", body=body)
+            if status != 201:
+                raise CommandError(f"Unable to register a replay user (HTTP {status}).")
+            self.tokens[user] = data["token"]
+            self.user_ids[user] = data["user"]["id"]
+
+        await asyncio.gather(*(register(user) for user in {record["user"] for record in self.records if record["user"]}))
+
+        loop = asyncio.get_running_loop()
+        for code, users in self.room_users.items():
+            self.rooms[code] = loop.create_future()
+            if code in self.created_rooms or not users:
+                continue
+            game = self.room_games.get(code, self.default_game)
+            status, _, data = await self.request("POST", "/api/rooms/", self.tokens[users[0]], {"game_slug": game})
+            if status != 201:
+                raise CommandError(f"Unable to create a {game} room (HTTP {status}).")
+            self.rooms[code].set_result(data["code"])
+            self.learn(code, users[0], data)
+            for user in users[1:]:
+                _, _, joined = await self.request("POST", f"/api/rooms/{data['code']}/join/", self.tokens[user], {})
+                self.learn(code, user, joined)
+
+    def learn(self, code, user, data) -> None:
+        """Remember the local player id a response reveals for (recorded room, user)."""
+        if not isinstance(data, dict):
+            return
+        player_id = data.get("player_id") or (data.get("player") or {}).get("id")
+        for player in data.get("players") or []:
+            if (player.get("user") or {}).get("id") == self.user_ids.get(user):
+                player_id = player["id"]
+        if player_id:
+            self.players[(code, user)] = player_id
+
+    def translate(self, value, key=""):
+        if isinstance(value, dict):
+            return {item_key: self.translate(item, item_key) for item_key, item in value.items()}
+        if isinstance(value, list):
+            return [self.translate(item, key) for item in value]
+        if key.endswith("player_id") and isinstance(value, str):
+            return self.players.get(self.player_owners.get(value), 0)
+        return value
+
+    async def send(self, record, lag_ms, until=None):
+        code = room_code(record["path"])
+        path = record["path"]
+        if code in self.rooms:
+            try:
+                local = await asyncio.wait_for(asyncio.shield(self.rooms[code]), self.timeout)
+            except asyncio.TimeoutError:
+                local = None
+            if local:
+                path = path.replace(f"/api/rooms/{code}/", f"/api/rooms/{local}/", 1)
+        if record["query"]:
+            path = f"{path}?{record['query']}"
+        body = self.translate(record["body"]) if record["body"] is not None else None
+        if body is None and record["method"] not in {"GET", "HEAD", "OPTIONS"}:
+            body = {}
+        status, ms, data = await self.request(record["method"], path, self.tokens.get(record["user"]), body, until)
+        if record.get("room"):
+            future = self.rooms[record["room"]]
+            if not future.done():
+                future.set_result(data.get("code") if status == 201 and isinstance(data, dict) else None)
+        self.learn(record.get("room") or code, record["user"], data)
+        self.results.append(
+            {
+                "endpoint": f"{record['method']} {endpoint(record['path'])}",
+                "status": status,
+                "ms": ms,
+                "recorded_ms": record["ms"],
+                "recorded_status": record["status"],
+                "lag_ms": lag_ms,
+            }
+        )
+
+    async def run_session(self, records, start, first_ts, finished, streams):
+        loop = asyncio.get_running_loop()
+        for record in records:
+            due = start + (record["ts"] - first_ts) / self.speed
+            await asyncio.sleep(max(0.0, due - loop.time()))
+            lag_ms = (loop.time() - due) * 1000
+            if record.get("stream"):
+                # Streams (TVs) stay open until every other request has been replayed.
+                streams.append(asyncio.ensure_future(self.send(record, lag_ms, finished)))
+            else:
+                await self.send(record, lag_ms)
+
+    async def run(self) -> float:
+        await self.setup()
+        loop = asyncio.get_running_loop()
+        start = loop.time() + 0.5
+        finished = asyncio.Event()
+        streams = []
+        await asyncio.gather(
+            *(
+                self.run_session(records, start, self.records[0]["ts"], finished, streams)
+                for records in self.sessions.values()
+            )
+        )
+        finished.set()
+        await asyncio.gather(*streams)
+        return loop.time() - start
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay traffic recorded with DJANGO_RECORD_TRAFFIC against a running server, "
+        f"1x to {MAX_SPEED}x faster, keeping each session's request order and spacing. "
+        "Save the summary with --output for each build and diff two with --compare."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="*", help="Recorded files or directories (default: TRAFFIC_DIR).")
+        parser.add_argument("--url", default="http://127.0.0.1:8000")
+        parser.add_argument("--speed", type=float, default=1.0, help="Time compression; 10 replays an hour in six minutes.")
+        parser.add_argument("--skip", type=float, default=0.0, help="Seconds of recording to skip.")
+        parser.add_argument("--duration", type=float, default=None, help="Seconds of recording to replay.")
+        parser.add_argument("--default-game", default=views.CONFINAMENTO_SLUG, help="Game for pre-existing rooms with no game actions.")
+        parser.add_argument("--timeout", type=float, default=30)
+        parser.add_argument("--output", default=None, help="Write the summary JSON here.")
+        parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="Diff two --output summaries.")
+
+    def handle(self, *args, **options):
+        if options["compare"]:
+            self.compare(*options["compare"])
+            return
+        target = urlsplit(options["url"])
+        if target.scheme != "http" or not target.hostname:
+            raise CommandError("--url must be a plain http:// URL.")
+        if not 0 < options["speed"] <= MAX_SPEED:
+            raise CommandError(f"--speed must be above 0 and at most {MAX_SPEED}.")
+
+        records = load_records(options["paths"] or [settings.TRAFFIC_DIR])
+        if records:
+            window_start = records[0]["ts"] + options["skip"]
+            window_end = window_start + options["duration"] if options["duration"] is not None else float("inf")
+            records = [
+                record
+                for record in records
+                if window_start <= record["ts"] < window_end and record["path"] not in SKIPPED_PATHS
+            ]
+        if not records:
+            raise CommandError("No recorded requests to replay.")
+
+        replay = Replay(records, target.hostname, target.port or 80, options["speed"], options["timeout"], options["default_game"])
+        wall = asyncio.run(replay.run())
+        summary = {
+            "url": options["url"],
+            "speed": options["speed"],
+            "sessions": len(replay.sessions),
+            "recorded_seconds": round(records[-1]["ts"] - records[0]["ts"], 3),
+            "wall_seconds": round(wall, 3),
+            "endpoints": summarize(replay.results),
+        }
+        self.report(summary)
+        if options["output"]:
+            Path(options["output"]).write_text(json.dumps(summary, indent=2, sort_keys=True) + "\n")
+            self.stdout.write(f"wrote {options['output']}")
+
+    def report(self, summary):
+        self.stdout.write(
+            f"{summary['sessions']} sessions, {summary['recorded_seconds']:.1f}s recorded, "
+            f"replayed in {summary['wall_seconds']:.1f}s at {summary['speed']}x"
+        )
+        self.stdout.write(
+            f"{'endpoint':<48}{'count':>7}{'p50':>8}{'p95':>8}{'p99':>8}{'rec p50':>9}{'5xx':>6}{'4xx':>6}{'changed':>9}{'lag p95':>9}"
+        )
+        for name, row in sorted(summary["endpoints"].items(), key=lambda item: (item[0] == "all", item[0])):
+            self.stdout.write(
+                f"{name:<48}{row['count']:>7}{row['p50_ms']:>8.1f}{row['p95_ms']:>8.1f}{row['p99_ms']:>8.1f}"
+                f"{row['recorded_p50_ms']:>9.1f}{row['errors']:>6}{row['client_errors']:>6}{row['status_changed']:>9}{row['lag_p95_ms']:>9.1f}"
+            )
+
+    def compare(self, before_path, after_path):
+        try:
+            before, after = (json.loads(Path(path).read_text())["endpoints"] for path in (before_path, after_path))
+        except (OSError, ValueError, KeyError) as exc:
+            raise CommandError(f"Unable to read summaries: {exc}") from exc
+
+        def delta(old, new):
+            return f"{(new - old) / old * 100:+.0f}%" if old else "-"
+
+        self.stdout.write(f"{'endpoint':<48}{'count':>7}{'p50 ms':>20}{'p95 ms':>20}{'5xx':>10}{'4xx':>10}")
+        for name in sorted(set(before) | set(after), key=lambda name: (name == "all", name)):
+            old, new = before.get(name), after.get(name)
+            if old is None or new is None:
+                self.stdout.write(f"{name:<48}{'only in ' + ('after' if old is None else 'before'):>17}")
+                continue
+            self.stdout.write(
+                f"{name:<48}{new['count']:>7}"
+                f"{old['p50_ms']:>7.1f}->{new['p50_ms']:<6.1f}{delta(old['p50_ms'], new['p50_ms']):>5}"
+                f"{old['p95_ms']:>7.1f}->{new['p95_ms']:<6.1f}{delta(old['p95_ms'], new['p95_ms']):>5}"
+                f"{old['errors']:>5}->{new['errors']:<3}{old['client_errors']:>5}->{new['client_errors']:<3}"
+            )
@@ -0,0 +1,64 @@
+import json
+import statistics
+from collections import Counter, defaultdict
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from api import slow_queries
+
+SORT_KEYS = {
+    "total": lambda group: sum(group["ms"]),
+    "count": lambda group: len(group["ms"]),
+    "max": lambda group: max(group["ms"]),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Group the slow query log (SLOW_QUERY_LOG) by normalized SQL: count, timing "
+        "percentiles, a histogram, the api/ call sites and the captured EXPLAIN plan."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--log", default=None, help="Log file (default: SLOW_QUERY_LOG).")
+        parser.add_argument("--top", type=int, default=10)
+        parser.add_argument("--sort", choices=sorted(SORT_KEYS), default="total")
+        parser.add_argument("--no-plans", action="store_true")
+
+    def handle(self, *args, **options):
+        path = Path(options["log"] or settings.SLOW_QUERY_LOG)
+        if not path.is_file():
+            raise CommandError(f"No slow query log at {path}.")
+
+        groups = defaultdict(lambda: {"ms": [], "buckets": Counter(), "sites": Counter(), "plan": None})
+        for line in path.read_text().splitlines():
+            entry = json.loads(line)
+            group = groups[entry["sig"]]
+            group["sql"] = entry["sql"]
+            group["ms"].append(entry["ms"])
+            group["buckets"][entry["bucket"]] += 1
+            group["sites"][entry["site"] or "(outside api/)"] += 1
+            group["plan"] = entry.get("plan") or group["plan"]
+
+        ranked = sorted(groups.items(), key=lambda item: SORT_KEYS[options["sort"]](item[1]), reverse=True)
+        self.stdout.write(f"{len(groups)} distinct slow statements in {path}")
+        for sig, group in ranked[: options["top"]]:
+            self.report(sig, group, show_plan=not options["no_plans"])
+
+    def report(self, sig, group, show_plan):
+        timings = sorted(group["ms"])
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        self.stdout.write(
+            f"\n[{sig}] {len(timings)}x  total {sum(timings):.1f}ms  "
+            f"p50 {statistics.median(timings):.1f}ms  p95 {p95:.1f}ms  max {timings[-1]:.1f}ms"
+        )
+        self.stdout.write(f"  {group['sql'][:300]}")
+        labels = [f"<{bound}ms" for bound in slow_queries.BUCKETS_MS] + [f">={slow_queries.BUCKETS_MS[-1]}ms"]
+        self.stdout.write("  histogram: " + "  ".join(f"{label} {group['buckets'][label]}" for label in labels if group["buckets"][label]))
+        for site, count in group["sites"].most_common(3):
+            self.stdout.write(f"  {count:>5}x {site}")
+        if show_plan and group["plan"]:
+            for line in group["plan"].splitlines():
+                self.stdout.write(f"  | {line}")
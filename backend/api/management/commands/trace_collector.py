@@ -0,0 +1,82 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+OTLP_TRACES_PATH = "/v1/traces"
+
+
+def _attribute(value: dict):
+    if "intValue" in value:
+        return int(value["intValue"])
+    if "boolValue" in value:
+        return value["boolValue"]
+    return value.get("stringValue")
+
+
+def spans_from_otlp(payload: dict):
+    """Flatten an OTLP/HTTP JSON export into `tracing` JSONL span dicts."""
+    for resource_spans in payload.get("resourceSpans", []):
+        for scope_spans in resource_spans.get("scopeSpans", []):
+            for span in scope_spans.get("spans", []):
+                start, end = int(span["startTimeUnixNano"]), int(span["endTimeUnixNano"])
+                yield {
+                    "trace_id": span["traceId"],
+                    "span_id": span["spanId"],
+                    "parent_id": span.get("parentSpanId") or None,
+                    "name": span["name"],
+                    "start_ns": start,
+                    "duration_ms": round((end - start) / 1_000_000, 3),
+                    "attributes": {item["key"]: _attribute(item["value"]) for item in span.get("attributes", [])},
+                }
+
+
+class Command(BaseCommand):
+    help = (
+        "Local stand-in for an OTLP/HTTP collector: accepts JSON trace exports on "
+        f"{OTLP_TRACES_PATH} (DJANGO_TRACING=otlp) and appends the spans to a JSONL "
+        "file for trace_report."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=4318)
+        parser.add_argument("--output", default=None, help="JSONL file (default: TRACE_FILE).")
+
+    def handle(self, *args, **options):
+        output = options["output"] or settings.TRACE_FILE
+        stdout = self.stdout
+        lock = threading.Lock()
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                if self.path != OTLP_TRACES_PATH:
+                    self.send_error(404)
+                    return
+                try:
+                    payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                    spans = list(spans_from_otlp(payload))
+                except (ValueError, KeyError):
+                    self.send_error(400)
+                    return
+                with lock:
+                    with open(output, "a") as trace_file:
+                        trace_file.writelines(json.dumps(span) + "\n" for span in spans)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.end_headers()
+                self.wfile.write(b"{}")
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((options["host"], options["port"]), Handler)
+        stdout.write(f"collecting OTLP traces on http://{options['host']}:{options['port']}{OTLP_TRACES_PATH} into {output}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
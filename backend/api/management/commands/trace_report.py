@@ -0,0 +1,45 @@
+import json
+import statistics
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        "Summarize tracing spans (TRACE_FILE) by span name and player count: spans, "
+        "mean/p95 duration and mean queries, to show which engine phase scales badly."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--file", default=None, help="Span JSONL file (default: TRACE_FILE).")
+        parser.add_argument("--game", default=None, help="Only spans for this game slug.")
+        parser.add_argument("--name", default=None, help="Only span names containing this text.")
+
+    def handle(self, *args, **options):
+        path = Path(options["file"] or settings.TRACE_FILE)
+        if not path.is_file():
+            raise CommandError(f"No trace file at {path}.")
+
+        groups = defaultdict(lambda: {"ms": [], "queries": []})
+        for line in path.read_text().splitlines():
+            span = json.loads(line)
+            attributes = span["attributes"]
+            if options["game"] and attributes.get("game.slug") != options["game"]:
+                continue
+            if options["name"] and options["name"] not in span["name"]:
+                continue
+            group = groups[(span["name"], attributes.get("room.players"))]
+            group["ms"].append(span["duration_ms"])
+            group["queries"].append(attributes.get("db.queries", 0))
+
+        self.stdout.write(f"{'span':<40}{'players':>8}{'spans':>7}{'mean ms':>9}{'p95 ms':>9}{'queries':>9}")
+        for (name, players), group in sorted(groups.items(), key=lambda item: (item[0][0], item[0][1] or 0)):
+            timings = sorted(group["ms"])
+            p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+            self.stdout.write(
+                f"{name:<40}{players if players is not None else '-':>8}{len(timings):>7}"
+                f"{statistics.fmean(timings):>9.2f}{p95:>9.2f}{statistics.fmean(group['queries']):>9.1f}"
+            )
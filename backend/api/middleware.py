@@ -0,0 +1,227 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.regex_helper import _lazy_re_compile
+from django.utils.text import compress_string
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from . import db_router, profiling, recording, tracing
+
+try:
+    import brotli
+except ImportError:  # Optional: fall back to gzip only.
+    brotli = None
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+ACCEPTS_BR = _lazy_re_compile(r"\bbr\b")
+ACCEPTS_GZIP = _lazy_re_compile(r"\bgzip\b")
+
+
+def compress(content: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(content, quality=5)
+    return compress_string(content, max_random_bytes=GZipMiddleware.max_random_bytes)
+
+
+def negotiate_encoding(accept_encoding: str):
+    if brotli is not None and ACCEPTS_BR.search(accept_encoding):
+        return "br"
+    if ACCEPTS_GZIP.search(accept_encoding):
+        return "gzip"
+    return None
+
+
+class APICompressionMiddleware(MiddlewareMixin):
+    """Compress API responses above `API_COMPRESSION_MIN_BYTES` with brotli (when installed) or gzip."""
+
+    def process_response(self, request, response):
+        if not request.path.startswith(settings.API_COMPRESSION_PATH_PREFIX):
+            return response
+        # Token-bearing auth responses stay uncompressed (BREACH).
+        if request.path.startswith(settings.API_COMPRESSION_PATH_PREFIX + "auth/"):
+            return response
+        if response.streaming or response.has_header("Content-Encoding"):
+            return response
+        if len(response.content) < settings.API_COMPRESSION_MIN_BYTES:
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = negotiate_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if encoding is None:
+            return response
+
+        compressed = compress(response.content, encoding)
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response["Content-Length"] = str(len(compressed))
+        response["Content-Encoding"] = encoding
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+        return response
+
+
+class AsyncWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """WhiteNoise that stays on the event loop for non-static requests under ASGI.
+
+    Plain `WhiteNoiseMiddleware` is sync-only, which makes Django run every
+    request (async views included) on a thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    def _find(self, path):
+        return self.find_file(path) if self.autorefresh else self.files.get(path)
+
+    async def __acall__(self, request):
+        if request.path_info.startswith(self.static_prefix):
+            static_file = await sync_to_async(self._find)(request.path_info)
+            if static_file is not None:
+                return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
+
+
+class ReplicaReadMiddleware(MiddlewareMixin):
+    """Route opted-in safe reads to the replica; pin clients to the primary after a write."""
+
+    def process_request(self, request):
+        db_router.use_replica(False)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not db_router.replica_enabled() or request.method not in SAFE_METHODS:
+            return None
+        if db_router.view_reads_replica(request, view_func) and not db_router.is_pinned(request):
+            db_router.use_replica(True)
+            request.reads_replica = True
+        return None
+
+    def process_response(self, request, response):
+        db_router.use_replica(False)
+        if getattr(request, "reads_replica", False):
+            response["X-Read-Replica"] = "1"
+        elif (
+            db_router.replica_enabled()
+            and request.method not in SAFE_METHODS
+            and response.status_code < 400
+        ):
+            db_router.pin_to_primary(request, response)
+        return response
+
+
+class ProfilingMiddleware(MiddlewareMixin):
+    """Profile sampled or explicitly requested view calls (see `api.profiling`)."""
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not profiling.enabled() or iscoroutinefunction(view_func) or not profiling.requested(request):
+            return None
+        request.profile = profiling.RequestProfile(profiling.endpoint_label(request, view_func))
+        request.profile.start()
+        return None
+
+    def process_response(self, request, response):
+        profile = getattr(request, "profile", None)
+        if profile is not None:
+            response["X-Profile-Id"] = f"{profile.label}/{profile.finish()}"
+        return response
+
+
+class TracingMiddleware:
+    """Open the root tracing span for each request (see `api.tracing`).
+
+    Sync and async capable, so it doesn't push ASGI requests onto a thread.
+    The span lives in a context variable, which the async path keeps on the
+    request's task; sync views called through `sync_to_async` inherit it.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        span = tracing.start_span("request", {"http.method": request.method})
+        try:
+            response = self.get_response(request)
+            span.attributes["http.status_code"] = response.status_code
+            return response
+        finally:
+            self.end_span(request, span)
+
+    async def __acall__(self, request):
+        span = tracing.start_span("request", {"http.method": request.method})
+        try:
+            response = await self.get_response(request)
+            span.attributes["http.status_code"] = response.status_code
+            return response
+        finally:
+            self.end_span(request, span)
+
+    def end_span(self, request, span):
+        if request.resolver_match is not None:
+            span.name = profiling.endpoint_label(request, request.resolver_match.func)
+        # In the context that started the span, so not via sync_to_async; exporting
+        # appends one line (jsonl) or only enqueues (otlp).
+        span.end()
+
+
+class TrafficRecorderMiddleware:
+    """Record API requests for `replay_traffic` (see `api.recording`).
+
+    Sync and async capable. On the async path the record is written through
+    `sync_to_async`: resolving `request.user` and flushing the buffer may
+    touch the database and the disk.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not request.path.startswith(recording.RECORD_PATH_PREFIX):
+            return self.get_response(request)
+        # Read the body before the view consumes the stream.
+        body = recording.request_body(request)
+        started = time.time()
+        clock = time.perf_counter()
+        response = self.get_response(request)
+        recording.record(request, response, body, started, (time.perf_counter() - clock) * 1000)
+        return response
+
+    async def __acall__(self, request):
+        if not request.path.startswith(recording.RECORD_PATH_PREFIX):
+            return await self.get_response(request)
+        body = recording.request_body(request)
+        started = time.time()
+        clock = time.perf_counter()
+        response = await self.get_response(request)
+        ms = (time.perf_counter() - clock) * 1000
+        await sync_to_async(recording.record)(request, response, body, started, ms)
+        return response
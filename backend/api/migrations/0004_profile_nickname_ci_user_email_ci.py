@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:40
+
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+
+USER_EMAIL_INDEX = models.Index(django.db.models.functions.text.Lower('email'), name='api_user_email_ci')
+
+
+def _user_model(apps):
+    return apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+
+
+def add_user_email_index(apps, schema_editor):
+    # The user model belongs to another app, so the index is managed here.
+    schema_editor.add_index(_user_model(apps), USER_EMAIL_INDEX)
+
+
+def remove_user_email_index(apps, schema_editor):
+    schema_editor.remove_index(_user_model(apps), USER_EMAIL_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_room_version'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        # After the last auth migration: SQLite rebuilds auth_user on alters,
+        # dropping indexes the auth app does not know about.
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='profile',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('nickname'), name='unique_profile_nickname_ci'),
+        ),
+        migrations.RunPython(add_user_email_index, remove_user_email_index),
+    ]
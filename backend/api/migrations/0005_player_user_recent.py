@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:42
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_profile_nickname_ci_user_email_ci'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='player',
+            index=models.Index(fields=['user', '-joined_at', '-id'], name='player_user_recent'),
+        ),
+    ]
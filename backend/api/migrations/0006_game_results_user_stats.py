@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:44
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_player_user_recent'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GameResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('player_name', models.CharField(blank=True, max_length=80)),
+                ('won', models.BooleanField(default=False)),
+                ('points', models.IntegerField(blank=True, null=True)),
+                ('ended_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('game', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='results', to='api.game')),
+                ('room', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='results', to='api.room')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='game_results', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-ended_at'],
+                'indexes': [models.Index(fields=['user', '-ended_at'], name='result_user_recent')],
+            },
+        ),
+        migrations.CreateModel(
+            name='UserGameStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('played', models.PositiveIntegerField(default=0)),
+                ('wins', models.PositiveIntegerField(default=0)),
+                ('points', models.IntegerField(default=0)),
+                ('best_points', models.IntegerField(default=0)),
+                ('last_played_at', models.DateTimeField(blank=True, null=True)),
+                ('game', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='user_stats', to='api.game')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='game_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-wins', '-points', '-id'],
+                'indexes': [models.Index(fields=['game', '-wins', '-points', '-id'], name='stats_game_leaderboard')],
+                'constraints': [models.UniqueConstraint(fields=('user', 'game'), name='unique_stats_per_user_game')],
+            },
+        ),
+    ]
@@ -1,7 +1,13 @@
 import secrets
 import string
+from functools import partial
+
 from django.conf import settings
-from django.db import models
+from django.core.cache import cache
+from django.db import connections, models, router, transaction
+from django.db.models import F
+from django.db.models.functions import Lower
+from django.db.models.sql import UpdateQuery
 from django.utils import timezone
 
 
@@ -20,6 +26,14 @@ class Game(models.Model):
         return self.name
 
 
+ROOM_VERSION_CACHE_PREFIX = "room-version:"
+ROOM_VERSION_CACHE_SECONDS = 3600
+
+
+def room_version_key(code: str) -> str:
+    return f"{ROOM_VERSION_CACHE_PREFIX}{code}"
+
+
 class Room(models.Model):
     STATUS_LOBBY = "lobby"
     STATUS_LIVE = "live"
@@ -31,6 +45,9 @@ class Room(models.Model):
         (STATUS_ENDED, "Ended"),
     ]
 
+    # Saves touching only these fields don't change what clients render.
+    PRESENCE_FIELDS = {"last_activity_at", "tv_last_seen_at", "tv_device_id"}
+
     code = models.CharField(max_length=6, unique=True, db_index=True)
     game = models.ForeignKey(Game, on_delete=models.PROTECT, related_name="rooms")
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_LOBBY)
@@ -39,6 +56,9 @@ class Room(models.Model):
     tv_last_seen_at = models.DateTimeField(null=True, blank=True)
     tv_device_id = models.CharField(max_length=120, blank=True)
     state = models.JSONField(default=dict, blank=True)
+    version = models.PositiveIntegerField(default=0)
+    # Counts the games started in this room; keys their `GameResult` rows.
+    game_number = models.PositiveIntegerField(default=0)
 
     class Meta:
         ordering = ["-created_at"]
@@ -48,7 +68,7 @@ class Room(models.Model):
 
     def touch(self) -> None:
         self.last_activity_at = timezone.now()
-        self.save(update_fields=["last_activity_at"])
+        self.save(update_fields=["last_activity_at", "version"])
 
     @classmethod
     def _generate_code(cls, length: int = 4) -> str:
@@ -69,7 +89,44 @@ class Room(models.Model):
     def save(self, *args, **kwargs):
         if not self.code:
             self.code = self.generate_unique_code()
+        update_fields = kwargs.get("update_fields")
+        if self._state.adding:
+            self.version += 1
+            super().save(*args, **kwargs)
+            return
+        if update_fields is not None and set(update_fields) <= self.PRESENCE_FIELDS:
+            super().save(*args, **kwargs)
+            return
+        # Bump the version in the database, not from this instance's copy, so
+        # concurrent saves of one room never hand out the same version twice.
+        # `_do_update` folds it into the save's UPDATE and reads it back.
+        if update_fields is None:
+            update_fields = [field.name for field in self._meta.concrete_fields if not field.primary_key]
+        kwargs["update_fields"] = [*(name for name in update_fields if name != "version"), "version"]
+        self.version = F("version") + 1
         super().save(*args, **kwargs)
+        # Like Model.save: an instance read from the replica still writes to the primary.
+        using = kwargs.get("using") or router.db_for_write(type(self), instance=self)
+        # Wakes `wait` long-polls without each of them polling the database.
+        transaction.on_commit(
+            partial(cache.set, room_version_key(self.code), self.version, ROOM_VERSION_CACHE_SECONDS), using=using
+        )
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        if not any(field.name == "version" and hasattr(value, "resolve_expression") for field, _, value in values):
+            return super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update)
+        # One `UPDATE ... RETURNING version` instead of an UPDATE and a read.
+        query = base_qs.filter(pk=pk_val).query.chain(UpdateQuery)
+        query.add_update_fields(values)
+        statement, params = query.get_compiler(using).as_sql()
+        connection = connections[using]
+        with connection.cursor() as cursor:
+            cursor.execute(f"{statement} RETURNING {connection.ops.quote_name(self._meta.get_field('version').column)}", params)
+            row = cursor.fetchone()
+        if row is None:
+            return False
+        self.version = row[0]
+        return True
 
 
 class Player(models.Model):
@@ -88,6 +145,10 @@ class Player(models.Model):
         constraints = [
             models.UniqueConstraint(fields=["room", "user"], name="unique_player_per_room"),
         ]
+        indexes = [
+            # Room history: a user's rooms, newest first (keyset pagination).
+            models.Index(fields=["user", "-joined_at", "-id"], name="player_user_recent"),
+        ]
 
     def __str__(self) -> str:
         label = self.name or self.user.username
@@ -101,6 +162,62 @@ class Profile(models.Model):
 
     class Meta:
         ordering = ["nickname"]
+        constraints = [
+            # Nicknames are unique ignoring case; also serves `identity` lookups.
+            models.UniqueConstraint(Lower("nickname"), name="unique_profile_nickname_ci"),
+        ]
 
     def __str__(self) -> str:
         return self.nickname
+
+
+class GameResult(models.Model):
+    """One player's outcome in a finished game, written when the room ends."""
+
+    room = models.ForeignKey(Room, on_delete=models.SET_NULL, null=True, blank=True, related_name="results")
+    game = models.ForeignKey(Game, on_delete=models.PROTECT, related_name="results")
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="game_results")
+    player_name = models.CharField(max_length=80, blank=True)
+    won = models.BooleanField(default=False)
+    points = models.IntegerField(null=True, blank=True)
+    ended_at = models.DateTimeField(default=timezone.now)
+    # `Room.game_number` of the game; null for results recorded before it existed.
+    game_number = models.PositiveIntegerField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-ended_at"]
+        indexes = [
+            models.Index(fields=["user", "-ended_at"], name="result_user_recent"),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["room", "user", "game_number"], name="unique_result_per_game"),
+        ]
+
+    def __str__(self) -> str:
+        outcome = "won" if self.won else "lost"
+        return f"{self.player_name or self.user_id} {outcome} {self.game.name}"
+
+
+class UserGameStats(models.Model):
+    """Running per-user, per-game totals over `GameResult`, updated as results are recorded."""
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="game_stats")
+    game = models.ForeignKey(Game, on_delete=models.CASCADE, related_name="user_stats")
+    played = models.PositiveIntegerField(default=0)
+    wins = models.PositiveIntegerField(default=0)
+    points = models.IntegerField(default=0)
+    best_points = models.IntegerField(default=0)
+    last_played_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-wins", "-points", "-id"]
+        constraints = [
+            models.UniqueConstraint(fields=["user", "game"], name="unique_stats_per_user_game"),
+        ]
+        indexes = [
+            # Per-game leaderboard, read a page at a time (keyset pagination).
+            models.Index(fields=["game", "-wins", "-points", "-id"], name="stats_game_leaderboard"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.user_id} - {self.game.name}: {self.wins}/{self.played}"
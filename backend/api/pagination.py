@@ -0,0 +1,93 @@
+"""Keyset (seek) pagination.
+
+Pages are cut with `WHERE (a, b, id) < (cursor_a, cursor_b, cursor_id)` on
+an index over the same columns, never with OFFSET, so page 500 costs the
+same as page 1. The cursor is an opaque token holding the ordering values
+of the last row of the previous page.
+"""
+import base64
+import binascii
+import json
+import operator
+from functools import reduce
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """Pages in `ordering`, which must end in a unique field and match an index."""
+
+    ordering = ("-joined_at", "-id")
+    cursor_query_param = "cursor"
+    page_size_query_param = "limit"
+    page_size = 20
+    max_page_size = 100
+    invalid_cursor_message = "Invalid cursor."
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        limit = self.get_page_size(request)
+        position = self.decode_cursor(request, queryset.model)
+        queryset = queryset.order_by(*self.ordering)
+        if position is not None:
+            queryset = queryset.filter(self.after(position))
+        rows = list(queryset[: limit + 1])
+        self.has_next = len(rows) > limit
+        self.page = rows[:limit]
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(size, 1), self.max_page_size)
+
+    def fields(self):
+        return [name.lstrip("-") for name in self.ordering]
+
+    def after(self, position) -> Q:
+        """Rows strictly after `position`: (a < x) OR (a = x AND b < y) OR ..."""
+        clauses, equal = [], {}
+        for name, value in zip(self.ordering, position):
+            field = name.lstrip("-")
+            lookup = "lt" if name.startswith("-") else "gt"
+            clauses.append(Q(**equal, **{f"{field}__{lookup}": value}))
+            equal[field] = value
+        return reduce(operator.or_, clauses)
+
+    def decode_cursor(self, request, model):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            values = json.loads(base64.urlsafe_b64decode(token.encode()))
+            if not isinstance(values, list) or len(values) != len(self.ordering):
+                raise ValueError(token)
+            return [model._meta.get_field(name).to_python(value) for name, value in zip(self.fields(), values)]
+        except (binascii.Error, UnicodeDecodeError, ValueError, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, row) -> str:
+        values = [getattr(row, name) for name in self.fields()]
+        # Full-precision isoformat: the cursor must compare equal to the stored value.
+        raw = json.dumps(values, default=lambda value: value.isoformat())
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+
+class LeaderboardPagination(KeysetPagination):
+    ordering = ("-wins", "-points", "-id")
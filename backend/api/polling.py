@@ -0,0 +1,168 @@
+"""`next_poll_ms` hints: how long a client can wait before polling a room again.
+
+Rooms only change on player actions and at deadlines (`deadline_ts`,
+`next_round_ts`), so a live room is polled tightly just after its next
+deadline and while other players' moves are pending, and loosely while the
+room is waiting on the viewer's own move (their ack reports it). Lobby and
+ended rooms back off.
+
+The `wait` long-poll (`wait_for_version` under WSGI, `await_version` under
+ASGI) blocks until a room's version moves instead.
+"""
+import asyncio
+import time
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from .models import Room, room_version_key
+from .presence import ONLINE_WINDOW_SECONDS
+
+POLL_MIN_MS = 1000
+POLL_DEFAULT_MS = 5000
+POLL_OTHERS_PENDING_MS = 3000
+POLL_VIEWER_PENDING_MS = 10000
+POLL_LOBBY_MS = 8000
+# Well inside the online window, so players still on an ended room's screen
+# don't flicker offline between polls.
+POLL_ENDED_MS = ONLINE_WINDOW_SECONDS * 1000 // 3
+# Poll just after a deadline so the tick that resolves it has run.
+DEADLINE_GRACE_MS = 300
+
+DEADLINE_KEYS = ("deadline_ts", "next_round_ts")
+
+
+def _confinamento_pending(state: dict, player_state: dict) -> bool:
+    return player_state.get("guess") is None
+
+
+def _beleza_pending(state: dict, player_state: dict) -> bool:
+    return state.get("phase") == "guess" and player_state.get("guess") is None
+
+
+def _sugoroku_pending(state: dict, player_state: dict) -> bool:
+    return state.get("phase") == "choice" and not player_state.get("cleared") and player_state.get("choice") is None
+
+
+def _leilao_pending(state: dict, player_state: dict) -> bool:
+    return not player_state.get("submitted")
+
+
+def _blef_jack_pending(state: dict, player_state: dict) -> bool:
+    if state.get("phase") == "declare":
+        return player_state.get("declared_value") is None
+    if state.get("phase") == "guess":
+        return player_state.get("guess_winner_id") is None
+    return False
+
+
+# Per game: is the room still waiting on this player's move?
+VIEWER_PENDING = {
+    "confinamento-solitario": _confinamento_pending,
+    "concurso-de-beleza": _beleza_pending,
+    "future-sugoroku": _sugoroku_pending,
+    "leilao-de-cem-votos": _leilao_pending,
+    "blef-jack": _blef_jack_pending,
+}
+
+
+def viewer_pending(room: Room, viewer) -> bool:
+    if viewer is None:
+        return False
+    player_state = viewer.state or {}
+    if player_state.get("eliminated"):
+        return False
+    pending = VIEWER_PENDING.get(room.game.slug)
+    return bool(pending and pending(room.state or {}, player_state))
+
+
+def next_deadline_ms(state: dict, now_ts: float):
+    deadlines = [state[key] for key in DEADLINE_KEYS if isinstance(state.get(key), (int, float))]
+    upcoming = [deadline for deadline in deadlines if deadline > now_ts]
+    if not upcoming:
+        return None
+    return int((min(upcoming) - now_ts) * 1000) + DEADLINE_GRACE_MS
+
+
+def next_poll_ms(room: Room, viewer=None) -> int:
+    """Suggested delay before the next poll of `room` by `viewer` (a `Player`, or None for TVs/guests)."""
+    if room.status == Room.STATUS_ENDED:
+        return POLL_ENDED_MS
+    if room.status == Room.STATUS_LOBBY:
+        return POLL_LOBBY_MS
+    if viewer_pending(room, viewer):
+        interval = POLL_VIEWER_PENDING_MS
+    elif room.game.slug in VIEWER_PENDING:
+        interval = POLL_OTHERS_PENDING_MS
+    else:
+        interval = POLL_DEFAULT_MS
+    until_deadline = next_deadline_ms(room.state or {}, timezone.now().timestamp())
+    if until_deadline is not None:
+        interval = min(interval, until_deadline)
+    return max(POLL_MIN_MS, interval)
+
+
+WAIT_TIMEOUT_SECONDS = 25
+WAIT_MAX_TIMEOUT_SECONDS = 55
+# Waiters watch the version room saves publish to the cache, and only read the
+# database every WAIT_DB_CHECK_SECONDS in case the write landed in another
+# process's local-memory cache.
+WAIT_POLL_SECONDS = 0.5
+WAIT_DB_CHECK_SECONDS = 5
+
+
+def wait_timeout(value, limit: float = WAIT_MAX_TIMEOUT_SECONDS) -> float:
+    try:
+        timeout = float(value)
+    except (TypeError, ValueError):
+        timeout = WAIT_TIMEOUT_SECONDS
+    return min(max(timeout, 0), limit)
+
+
+def wait_since(params):
+    try:
+        return int(params["version"])
+    except (KeyError, ValueError):
+        return None
+
+
+def _room_versions(code: str):
+    return Room.objects.filter(code=code).values_list("version", flat=True)
+
+
+def wait_for_version(code: str, since, timeout: float):
+    """Block until the room's version differs from `since`, for at most `timeout` seconds.
+
+    Returns the last version seen: `since` on timeout, None when the room
+    doesn't exist. Holds the calling thread throughout.
+    """
+    versions = _room_versions(code)
+    version = versions.first()
+    checked_at = time.monotonic()
+    deadline = checked_at + timeout
+    while since is not None and version == since and time.monotonic() < deadline:
+        time.sleep(WAIT_POLL_SECONDS)
+        cached = cache.get(room_version_key(code))
+        if cached is not None and cached > version:
+            version = cached
+        elif time.monotonic() - checked_at >= WAIT_DB_CHECK_SECONDS:
+            version = versions.first()
+            checked_at = time.monotonic()
+    return version
+
+
+async def await_version(code: str, since, timeout: float):
+    """`wait_for_version` for the event loop."""
+    versions = _room_versions(code)
+    version = await versions.afirst()
+    checked_at = time.monotonic()
+    deadline = checked_at + timeout
+    while since is not None and version == since and time.monotonic() < deadline:
+        await asyncio.sleep(WAIT_POLL_SECONDS)
+        cached = await cache.aget(room_version_key(code))
+        if cached is not None and cached > version:
+            version = cached
+        elif time.monotonic() - checked_at >= WAIT_DB_CHECK_SECONDS:
+            version = await versions.afirst()
+            checked_at = time.monotonic()
+    return version
@@ -0,0 +1,59 @@
+"""Presence writes shared by the DRF room actions and the native async views.
+
+Each write comes as a sync/async pair over the same queries. Both are plain
+UPDATEs of presence fields, which never bump the room version.
+"""
+from django.utils import timezone
+
+from .models import Player, Room
+
+# A player seen within this window shows as online.
+ONLINE_WINDOW_SECONDS = 30
+
+
+def _heartbeat_players(room_id: int, player_id: int, user):
+    return Player.objects.filter(id=player_id, room_id=room_id, user=user)
+
+
+def record_heartbeat(room_id: int, player_id: int, user) -> bool:
+    """Mark the caller's player as seen; False when it isn't theirs or not in the room."""
+    now = timezone.now()
+    if not _heartbeat_players(room_id, player_id, user).update(last_seen_at=now):
+        return False
+    Room.objects.filter(id=room_id).update(last_activity_at=now)
+    return True
+
+
+async def arecord_heartbeat(room_id: int, player_id: int, user) -> bool:
+    now = timezone.now()
+    if not await _heartbeat_players(room_id, player_id, user).aupdate(last_seen_at=now):
+        return False
+    await Room.objects.filter(id=room_id).aupdate(last_activity_at=now)
+    return True
+
+
+def _tv_ping_fields(device_id) -> dict:
+    fields = {"tv_last_seen_at": timezone.now()}
+    device_id = str(device_id or "").strip()
+    if device_id:
+        fields["tv_device_id"] = device_id
+    return fields
+
+
+def _tv_ping_ack(fields) -> dict:
+    return {"ok": True, "tv_connected": True, "tv_last_seen_at": fields["tv_last_seen_at"]}
+
+
+def record_tv_ping(code: str, device_id) -> dict | None:
+    """Mark the room's TV as seen; returns the ack, or None when the room doesn't exist."""
+    fields = _tv_ping_fields(device_id)
+    if not Room.objects.filter(code=code).update(**fields):
+        return None
+    return _tv_ping_ack(fields)
+
+
+async def arecord_tv_ping(code: str, device_id) -> dict | None:
+    fields = _tv_ping_fields(device_id)
+    if not await Room.objects.filter(code=code).aupdate(**fields):
+        return None
+    return _tv_ping_ack(fields)
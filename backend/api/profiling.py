@@ -0,0 +1,107 @@
+"""Opt-in profiling of live requests.
+
+`ProfilingMiddleware` profiles a random `PROFILE_SAMPLE_RATE` fraction of
+sync view calls, plus any request carrying `X-Profile: <PROFILE_TOKEN>`.
+Each profiled request writes two files under
+`PROFILE_DIR/<endpoint>/`, where the endpoint is the DRF viewset action
+(`RoomViewSet.sugoroku_tick`) or the function view:
+
+- `<name>.prof`: cProfile stats, for `pstats`, snakeviz and `profile_report`.
+- `<name>.folded`: wall-clock stack samples taken every
+  `PROFILE_INTERVAL_MS` ms, one `frame;frame;frame count` line per stack, ready
+  for flamegraph.pl or speedscope.
+
+Only the request thread is profiled. Actions dispatched to room actors
+(`ROOM_ACTORS_ENABLED`) run on an actor thread and show up as a wait, and
+async views are skipped.
+"""
+import cProfile
+import os
+import random
+import re
+import secrets
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+
+PROFILE_HEADER = "X-Profile"
+UNSAFE_LABEL_CHARS = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+def enabled() -> bool:
+    return settings.PROFILE_SAMPLE_RATE > 0 or bool(settings.PROFILE_TOKEN)
+
+
+def requested(request) -> bool:
+    token = settings.PROFILE_TOKEN
+    if token and secrets.compare_digest(request.headers.get(PROFILE_HEADER, ""), token):
+        return True
+    return random.random() < settings.PROFILE_SAMPLE_RATE
+
+
+def endpoint_label(request, view_func) -> str:
+    cls = getattr(view_func, "cls", None)
+    if cls is not None:
+        actions = getattr(view_func, "actions", None) or {}
+        method = request.method.lower()
+        return f"{cls.__name__}.{actions.get(method, method)}"
+    return f"{view_func.__module__}.{view_func.__name__}"
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    return f"{Path(code.co_filename).stem}:{code.co_qualname}"
+
+
+class StackSampler(threading.Thread):
+    """Count the stacks of one thread, sampled every `interval` seconds."""
+
+    def __init__(self, thread_id: int, interval: float):
+        super().__init__(name="profile-sampler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            names = []
+            while frame is not None:
+                names.append(_frame_name(frame))
+                frame = frame.f_back
+            if names:
+                self.stacks[";".join(reversed(names))] += 1
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self.join()
+
+
+class RequestProfile:
+    def __init__(self, label: str):
+        self.label = label
+        self.profiler = cProfile.Profile()
+        self.sampler = StackSampler(threading.get_ident(), settings.PROFILE_INTERVAL_MS / 1000)
+
+    def start(self) -> None:
+        self.started = time.perf_counter()
+        self.sampler.start()
+        self.profiler.enable()
+
+    def finish(self) -> str:
+        """Stop profiling and write both files; returns their shared name."""
+        self.profiler.disable()
+        self.sampler.stop()
+        elapsed_ms = (time.perf_counter() - self.started) * 1000
+        directory = Path(settings.PROFILE_DIR) / UNSAFE_LABEL_CHARS.sub("_", self.label)
+        directory.mkdir(parents=True, exist_ok=True)
+        name = f"{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}-{secrets.token_hex(3)}-{elapsed_ms:.0f}ms"
+        self.profiler.dump_stats(directory / f"{name}.prof")
+        folded = "".join(f"{stack} {count}\n" for stack, count in self.sampler.stacks.items())
+        (directory / f"{name}.folded").write_text(folded)
+        return name
@@ -0,0 +1,155 @@
+"""Opt-in recording of live API traffic for `replay_traffic`.
+
+With `TRAFFIC_RECORD` on, `TrafficRecorderMiddleware` logs every request
+under `/api/` as one JSON line in gzipped files under `TRAFFIC_DIR`
+(`<YYYYmmdd-HH>-<pid>.jsonl.gz`, one per process and hour):
+
+- `ts`, `ms`, `status`: wall-clock start, server time and response status.
+- `method`, `path`, `query`, `body`: the request, anonymized (see `anonymize`).
+- `user`, `client`: keyed hashes of the user id and of the client address
+  and user agent, which group requests into sessions.
+- `room`, `player`: references taken from the response (the code of a
+  created room, the hashed id of the caller's player) so the replayer can
+  map recorded rooms and players onto the ones it creates.
+- `stream`: set for streaming (SSE) responses.
+
+Records are buffered and written as gzip members every
+`FLUSH_EVERY` records or `FLUSH_SECONDS`, and on exit; a crash loses at most
+the buffer. Auth bodies (passwords, emails) are never recorded.
+"""
+import atexit
+import gzip
+import hashlib
+import hmac
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode
+
+from django.conf import settings
+
+RECORD_PATH_PREFIX = "/api/"
+UNRECORDED_BODY_PREFIX = "/api/auth/"
+MAX_BODY_BYTES = 64 * 1024
+FLUSH_EVERY = 200
+FLUSH_SECONDS = 5.0
+
+# Values the replayer needs verbatim: game moves, modes and query switches.
+# Every other string is replaced by a keyed hash, so equal inputs stay equal.
+REPLAYABLE_KEYS = {
+    "action",
+    "direction",
+    "fields",
+    "game_slug",
+    "guess",
+    "mode",
+    "omit",
+    "op",
+    "snapshot",
+    "timeout",
+    "version",
+}
+
+
+def digest(kind: str, value) -> str:
+    mac = hmac.new(settings.SECRET_KEY.encode(), f"{kind}:{value}".encode(), hashlib.sha256)
+    return f"{kind}:{mac.hexdigest()[:12]}"
+
+
+def anonymize(value, key: str = ""):
+    """Hash personal strings and player ids; keep numbers, flags and game moves."""
+    if isinstance(value, dict):
+        return {item_key: anonymize(item, item_key) for item_key, item in value.items()}
+    if isinstance(value, list):
+        return [anonymize(item, key) for item in value]
+    if key.endswith("player_id") and isinstance(value, int) and not isinstance(value, bool):
+        return digest("p", value)
+    if isinstance(value, str) and value and key not in REPLAYABLE_KEYS and not value.isdigit():
+        return digest("s", value)
+    return value
+
+
+def request_body(request):
+    if request.path.startswith(UNRECORDED_BODY_PREFIX):
+        return None
+    if not request.content_type.startswith("application/json"):
+        return None
+    if int(request.META.get("CONTENT_LENGTH") or 0) > MAX_BODY_BYTES:
+        return None
+    try:
+        return anonymize(json.loads(request.body or b"null"))
+    except ValueError:
+        return None
+
+
+def _references(request, response) -> dict:
+    data = getattr(response, "data", None)
+    if not isinstance(data, dict):
+        return {}
+    references = {}
+    player_id = data.get("player_id") or (data.get("player") or {}).get("id")
+    if request.method == "POST" and request.path == f"{RECORD_PATH_PREFIX}rooms/" and data.get("code"):
+        references["room"] = data["code"]
+        user_id = getattr(request.user, "id", None)
+        player_id = next(
+            (player["id"] for player in data.get("players") or [] if (player.get("user") or {}).get("id") == user_id),
+            None,
+        )
+    if player_id:
+        references["player"] = digest("p", player_id)
+    return references
+
+
+class Recorder:
+    """Buffer records and append them to this process's gzipped JSONL file."""
+
+    def __init__(self):
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._flushed_at = time.monotonic()
+        atexit.register(self.flush)
+
+    def add(self, record: dict) -> None:
+        with self._lock:
+            self._buffer.append(json.dumps(record, separators=(",", ":")) + "\n")
+            due = len(self._buffer) >= FLUSH_EVERY or time.monotonic() - self._flushed_at >= FLUSH_SECONDS
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            lines, self._buffer = self._buffer, []
+            self._flushed_at = time.monotonic()
+            if not lines:
+                return
+            directory = Path(settings.TRAFFIC_DIR)
+            directory.mkdir(parents=True, exist_ok=True)
+            path = directory / f"{time.strftime('%Y%m%d-%H')}-{os.getpid()}.jsonl.gz"
+            # Each flush appends a gzip member; gzip readers concatenate them.
+            with gzip.open(path, "at", compresslevel=6) as traffic_file:
+                traffic_file.writelines(lines)
+
+
+recorder = Recorder()
+
+
+def record(request, response, body, started: float, ms: float) -> None:
+    user = request.user if hasattr(request, "user") else None
+    client = f"{request.META.get('REMOTE_ADDR', '')}|{request.headers.get('User-Agent', '')}"
+    entry = {
+        "ts": round(started, 3),
+        "ms": round(ms, 3),
+        "method": request.method,
+        "path": request.path,
+        "query": urlencode(anonymize(dict(parse_qsl(request.META.get("QUERY_STRING", ""))))),
+        "status": response.status_code,
+        "user": digest("u", user.id) if user is not None and user.is_authenticated else None,
+        "client": digest("c", client),
+        "body": body,
+        **_references(request, response),
+    }
+    if response.streaming:
+        entry["stream"] = True
+    recorder.add(entry)
@@ -0,0 +1,97 @@
+from datetime import datetime
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+try:
+    import msgpack
+except ImportError:  # Optional: MessagePack is only offered when installed.
+    msgpack = None
+
+TIMESTAMP_FIELDS = {"created_at", "last_activity_at", "tv_last_seen_at", "joined_at", "last_seen_at"}
+
+
+def _timestamp(value):
+    if not isinstance(value, str):
+        return value
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        return value
+
+
+def _flatten(data: dict, prefix: str = "") -> dict:
+    flat = {}
+    for key, value in data.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict) and key != "state":
+            flat.update(_flatten(value, prefix=f"{name}."))
+        elif key in TIMESTAMP_FIELDS:
+            flat[name] = _timestamp(value)
+        else:
+            flat[name] = value
+    return flat
+
+
+def _columns(rows: list) -> dict:
+    """Turn a list of player dicts into parallel arrays keyed by (dotted) field name."""
+    flat_rows = [_flatten(row) for row in rows]
+    names = []
+    for row in flat_rows:
+        for name in row:
+            if name not in names:
+                names.append(name)
+    return {"count": len(flat_rows), "columns": {name: [row.get(name) for row in flat_rows] for name in names}}
+
+
+def to_columnar(data):
+    """Compact layout: epoch timestamps and `players` as columns instead of one object per player."""
+    if isinstance(data, list):
+        return [to_columnar(item) for item in data]
+    if not isinstance(data, dict):
+        return data
+    compact = {}
+    for key, value in data.items():
+        if key == "players" and isinstance(value, list) and all(isinstance(row, dict) for row in value):
+            compact[key] = _columns(value)
+        elif key in TIMESTAMP_FIELDS:
+            compact[key] = _timestamp(value)
+        elif key == "state":
+            compact[key] = value
+        else:
+            compact[key] = to_columnar(value)
+    return compact
+
+
+class ColumnarJSONRenderer(JSONRenderer):
+    media_type = "application/vnd.rollmee.columnar+json"
+    format = "columnar"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return super().render(to_columnar(data), accepted_media_type, renderer_context)
+
+
+class MessagePackRenderer(BaseRenderer):
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(to_columnar(data), use_bin_type=True, default=str)
+
+
+class EventStreamRenderer(BaseRenderer):
+    """Lets `text/event-stream` clients through content negotiation; errors are sent as JSON."""
+
+    media_type = "text/event-stream"
+    format = "event-stream"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return JSONRenderer().render(data)
+
+
+ROOM_RENDERER_CLASSES = [ColumnarJSONRenderer]
+if msgpack is not None:
+    ROOM_RENDERER_CLASSES.append(MessagePackRenderer)
@@ -0,0 +1,134 @@
+"""Game results and the per-user stats built from them.
+
+When a room ends, `record` writes one `GameResult` per player and folds
+them into `UserGameStats` with in-place increments, so stats pages and
+leaderboards never rescan room state. `_set_room_state` calls it once per
+game; the `results_recorded` flag in the room state (cleared when a new
+game starts) keeps later saves of the ended room from counting it twice.
+The `end` action sets the flag itself, so a game the host stops early is
+never recorded.
+
+Two requests can both load the room before either ends it, so the
+in-memory flag alone isn't enough: `record` first claims the room with a
+conditional UPDATE, and only the caller that sets the flag in the database
+writes results. The unique (room, user, game_number) constraint backs that
+up, so a duplicate insert fails instead of double-counting stats.
+"""
+from django.db import transaction
+from django.db.models import Case, Count, F, IntegerField, Max, Q, Sum, Value, When
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from .models import GameResult, Player, Room, UserGameStats
+
+RECORDED_KEY = "results_recorded"
+
+
+def winner_ids(room: Room, state: dict, players) -> set:
+    if "winners" in state:
+        return set(state["winners"] or [])
+    if room.game.slug == "read-my-mind":
+        # Versus: whoever is left. Co-op: everyone, if the team kept a life.
+        if state.get("mode") == "versus":
+            return {player.id for player in players if not (player.state or {}).get("eliminated")}
+        if state.get("lives", 0) > 0:
+            return {player.id for player in players}
+    return set()
+
+
+def _points(player: Player):
+    points = (player.state or {}).get("points")
+    return points if isinstance(points, int) else None
+
+
+def needs_recording(room: Room, state: dict) -> bool:
+    return room.status == Room.STATUS_ENDED and not state.get(RECORDED_KEY)
+
+
+def claim(room: Room, state: dict) -> bool:
+    """Store `state` only if the room isn't recorded in the database yet; True for the one caller that does."""
+    return bool(Room.objects.filter(pk=room.pk).exclude(state__has_key=RECORDED_KEY).update(state=state))
+
+
+def record(room: Room, state: dict, ended_at=None) -> list:
+    """Write results for the ended `room` and update its players' stats; marks `state` as recorded.
+
+    Returns no results when another caller already recorded the room.
+    """
+    state[RECORDED_KEY] = True
+    ended_at = ended_at or timezone.now()
+    with transaction.atomic():
+        if not claim(room, state):
+            return []
+        players = list(Player.objects.filter(room=room).only("id", "user_id", "name", "state"))
+        if not players:
+            return []
+        winners = winner_ids(room, state, players)
+        results = GameResult.objects.bulk_create(
+            [
+                GameResult(
+                    room=room,
+                    game_id=room.game_id,
+                    user_id=player.user_id,
+                    player_name=player.name,
+                    won=player.id in winners,
+                    points=_points(player),
+                    ended_at=ended_at,
+                    game_number=room.game_number,
+                )
+                for player in players
+            ]
+        )
+        UserGameStats.objects.bulk_create(
+            [UserGameStats(user_id=result.user_id, game_id=result.game_id) for result in results],
+            ignore_conflicts=True,
+        )
+        # One UPDATE for every player: per-user amounts come from CASE
+        # expressions, and the columns still increment in the database.
+        wins = _per_user(results, lambda result: int(result.won))
+        points = _per_user(results, lambda result: result.points or 0)
+        UserGameStats.objects.filter(game_id=room.game_id, user_id__in=[result.user_id for result in results]).update(
+            played=F("played") + 1,
+            wins=F("wins") + wins,
+            points=F("points") + points,
+            best_points=Greatest("best_points", points),
+            last_played_at=Greatest(Coalesce("last_played_at", Value(ended_at)), Value(ended_at)),
+        )
+    return results
+
+
+def _per_user(results, value) -> Case:
+    return Case(
+        *[When(user_id=result.user_id, then=Value(value(result))) for result in results],
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+
+
+def rebuild_stats() -> int:
+    """Recompute every `UserGameStats` row from `GameResult`; returns the row count."""
+    totals = GameResult.objects.values("user_id", "game_id").annotate(
+        played=Count("id"),
+        wins=Count("id", filter=Q(won=True)),
+        total_points=Coalesce(Sum("points"), 0),
+        best=Coalesce(Max("points"), 0),
+        last=Max("ended_at"),
+    )
+    with transaction.atomic():
+        UserGameStats.objects.all().delete()
+        rows = UserGameStats.objects.bulk_create(
+            [
+                UserGameStats(
+                    user_id=row["user_id"],
+                    game_id=row["game_id"],
+                    played=row["played"],
+                    wins=row["wins"],
+                    points=row["total_points"],
+                    best_points=max(row["best"], 0),
+                    last_played_at=row["last"],
+                )
+                for row in totals.order_by()
+            ],
+            batch_size=1000,
+        )
+    return len(rows)
@@ -0,0 +1,46 @@
+"""Per-room seeded randomness.
+
+Each game draws a 128-bit seed from the OS once, when it starts, and keeps
+it in room state as `state["rng"] = {"seed": <hex>, "step": n}`. Every
+random event (a deal, a dice roll, a suit shuffle) takes the next step and
+makes all of its draws from one `random.Random` seeded with `(seed, step)`.
+Draws are then plain in-process arithmetic instead of an `os.urandom` call
+each, and a game can be replayed from its seed for disputes or debugging
+(on the same Python version, whose sampling algorithms it relies on).
+
+The seed is kept from clients while the game runs (see `RoomSerializer`)
+and revealed once the room has ended.
+"""
+import random
+import secrets
+
+STATE_KEY = "rng"
+SEED_BITS = 128
+
+
+def new_state() -> dict:
+    return {"seed": f"{secrets.randbits(SEED_BITS):032x}", "step": 0}
+
+
+def start():
+    """Seed a new game: returns its `state["rng"]` entry and the generator for its first event."""
+    rng_state = new_state()
+    return rng_state, for_state({STATE_KEY: rng_state})
+
+
+def replay(seed: str, step: int) -> random.Random:
+    """The generator a room used for event `step`."""
+    return random.Random((int(seed, 16) << 32) | step)
+
+
+def for_state(state: dict) -> random.Random:
+    """Generator for the room's next random event; advances the stored step.
+
+    Rooms whose game started before seeding get a seed on first use.
+    """
+    rng_state = state.get(STATE_KEY)
+    if not rng_state:
+        rng_state = state[STATE_KEY] = new_state()
+    generator = replay(rng_state["seed"], rng_state["step"])
+    rng_state["step"] += 1
+    return generator
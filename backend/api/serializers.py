@@ -4,7 +4,8 @@ from django.utils import timezone
 from rest_framework import serializers
 from rest_framework.authtoken.models import Token
 
-from .models import Game, Player, Profile, Room
+from . import catalog, hashing, identity, polling, presence, tracing
+from .models import Game, Player, Profile, Room, UserGameStats
 
 User = get_user_model()
 
@@ -29,22 +30,24 @@ class RegisterSerializer(serializers.Serializer):
     nickname = serializers.CharField(max_length=80)
 
     def validate_email(self, value):
-        if User.objects.filter(email=value).exists():
+        email = identity.normalize_email(value)
+        if identity.users_with_email(email).exists():
             raise serializers.ValidationError("Email already in use.")
-        return value
+        return email
 
     def validate_nickname(self, value):
-        nickname = value.strip()
+        nickname = identity.normalize_nickname(value)
         if not nickname:
             raise serializers.ValidationError("Nickname is required.")
-        if Profile.objects.filter(nickname__iexact=nickname).exists():
+        if identity.profiles_with_nickname(nickname).exists():
             raise serializers.ValidationError("Nickname already in use.")
         return nickname
 
     def create(self, validated_data):
-        email = validated_data["email"].strip().lower()
-        nickname = validated_data["nickname"].strip()
-        user = User.objects.create_user(username=email, email=email, password=validated_data["password"])
+        email = validated_data["email"]
+        nickname = validated_data["nickname"]
+        password = hashing.make_password(validated_data["password"])
+        user = User.objects.create(username=email, email=email, password=password)
         Profile.objects.create(user=user, nickname=nickname)
         token, _ = Token.objects.get_or_create(user=user)
         return {"user": user, "token": token}
@@ -55,12 +58,11 @@ class LoginSerializer(serializers.Serializer):
     password = serializers.CharField(write_only=True)
 
     def validate(self, attrs):
-        email = attrs.get("email").strip().lower()
         try:
-            user = User.objects.get(email=email)
+            user = identity.users_with_email(attrs.get("email")).get()
         except User.DoesNotExist:
             raise serializers.ValidationError("Invalid credentials.")
-        if not user.check_password(attrs.get("password")):
+        if not hashing.check_password(user, attrs.get("password")):
             raise serializers.ValidationError("Invalid credentials.")
         attrs["user"] = user
         return attrs
@@ -77,8 +79,23 @@ class GameSerializer(serializers.ModelSerializer):
         fields = ["id", "slug", "name", "description", "min_players", "max_players", "is_active"]
 
 
-class PlayerSerializer(serializers.ModelSerializer):
+class SparseFieldsMixin:
+    """Drop fields not listed in `context[sparse_fields_key]` (see `fieldsets`)."""
+
+    sparse_fields_key = None
+
+    def get_fields(self):
+        fields = super().get_fields()
+        requested = self.context.get(self.sparse_fields_key)
+        if requested is None:
+            return fields
+        return {name: field for name, field in fields.items() if name in requested}
+
+
+class PlayerSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    sparse_fields_key = "player_fields"
     user = UserSerializer(read_only=True)
+    user_id = serializers.IntegerField(read_only=True)
     online = serializers.SerializerMethodField()
     has_guessed = serializers.SerializerMethodField()
     public_guess = serializers.SerializerMethodField()
@@ -89,6 +106,7 @@ class PlayerSerializer(serializers.ModelSerializer):
             "id",
             "name",
             "user",
+            "user_id",
             "device_id",
             "is_host",
             "ready",
@@ -104,7 +122,7 @@ class PlayerSerializer(serializers.ModelSerializer):
     def get_online(self, instance):
         if not instance.last_seen_at:
             return False
-        return timezone.now() - instance.last_seen_at <= timedelta(seconds=30)
+        return timezone.now() - instance.last_seen_at <= timedelta(seconds=presence.ONLINE_WINDOW_SECONDS)
 
     def get_has_guessed(self, instance):
         if instance.room.game.slug != "confinamento-solitario":
@@ -121,9 +139,13 @@ class PlayerSerializer(serializers.ModelSerializer):
 
     def to_representation(self, instance):
         data = super().to_representation(instance)
+        if "state" not in data:
+            return data
         request = self.context.get("request")
         state = data.get("state") or {}
         if isinstance(state, dict):
+            # Copy: the JSON field hands back the instance's own dict.
+            state = dict(state)
             if instance.room.game.slug == "confinamento-solitario":
                 # Never expose guesses; reveal suit to other players only.
                 has_guessed = instance.state.get("guess") is not None
@@ -156,6 +178,57 @@ class PlayerSerializer(serializers.ModelSerializer):
         return data
 
 
+class RoomHistorySerializer(serializers.ModelSerializer):
+    """One row of a user's room history: the room they joined and how it went for them."""
+
+    code = serializers.CharField(source="room.code")
+    game_slug = serializers.CharField(source="room.game.slug")
+    game_name = serializers.CharField(source="room.game.name")
+    status = serializers.CharField(source="room.status")
+    won = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Player
+        fields = ["id", "code", "game_slug", "game_name", "status", "name", "is_host", "joined_at", "won"]
+
+    def get_won(self, instance):
+        if instance.room.status != Room.STATUS_ENDED:
+            return None
+        # `room_winners` is annotated by the history query so the state blob stays unloaded.
+        return instance.id in (instance.room_winners or [])
+
+
+class UserGameStatsSerializer(serializers.ModelSerializer):
+    game_slug = serializers.CharField(source="game.slug")
+    game_name = serializers.CharField(source="game.name")
+
+    class Meta:
+        model = UserGameStats
+        fields = ["game_slug", "game_name", "played", "wins", "points", "best_points", "last_played_at"]
+
+
+class LeaderboardEntrySerializer(serializers.ModelSerializer):
+    user_id = serializers.IntegerField()
+    nickname = serializers.SerializerMethodField()
+
+    class Meta:
+        model = UserGameStats
+        fields = ["user_id", "nickname", "played", "wins", "points", "best_points"]
+
+    def get_nickname(self, instance):
+        profile = getattr(instance.user, "profile", None)
+        return profile.nickname if profile else instance.user.username
+
+
+class PlayerAckSerializer(PlayerSerializer):
+    """The acting player's own (redacted) view, returned in action acks."""
+
+    sparse_fields_key = None
+
+    class Meta(PlayerSerializer.Meta):
+        fields = ["id", "ready", "state"]
+
+
 class RoomSerializer(serializers.ModelSerializer):
     game = GameSerializer(read_only=True)
     tv_connected = serializers.SerializerMethodField()
@@ -172,6 +245,7 @@ class RoomSerializer(serializers.ModelSerializer):
             "tv_last_seen_at",
             "tv_connected",
             "state",
+            "version",
         ]
         read_only_fields = [
             "id",
@@ -181,6 +255,7 @@ class RoomSerializer(serializers.ModelSerializer):
             "tv_last_seen_at",
             "tv_connected",
             "state",
+            "version",
         ]
 
     def get_tv_connected(self, instance):
@@ -188,20 +263,37 @@ class RoomSerializer(serializers.ModelSerializer):
             return False
         return timezone.now() - instance.tv_last_seen_at <= timedelta(seconds=20)
 
+    @tracing.traced
     def to_representation(self, instance):
         data = super().to_representation(instance)
+        if "state" not in data:
+            return data
         state = data.get("state") or {}
-        if isinstance(state, dict) and instance.game.slug == "confinamento-solitario":
-            state.pop("valete_player_id", None)
+        if isinstance(state, dict):
+            state = dict(state)
+            if instance.game.slug == "confinamento-solitario":
+                state.pop("valete_player_id", None)
+            if instance.status != Room.STATUS_ENDED:
+                # The seed predicts every draw; it is revealed once the game is over.
+                state.pop("rng", None)
             data["state"] = state
         return data
 
 
-class RoomDetailSerializer(RoomSerializer):
+class RoomDetailSerializer(SparseFieldsMixin, RoomSerializer):
+    sparse_fields_key = "fields"
     players = PlayerSerializer(many=True, read_only=True)
+    next_poll_ms = serializers.SerializerMethodField()
 
     class Meta(RoomSerializer.Meta):
-        fields = RoomSerializer.Meta.fields + ["players"]
+        fields = RoomSerializer.Meta.fields + ["players", "next_poll_ms"]
+
+    def get_next_poll_ms(self, instance):
+        request = self.context.get("request")
+        viewer = None
+        if request and request.user.is_authenticated:
+            viewer = next((player for player in instance.players.all() if player.user_id == request.user.id), None)
+        return polling.next_poll_ms(instance, viewer)
 
 
 class RoomCreateSerializer(serializers.Serializer):
@@ -215,10 +307,7 @@ class RoomCreateSerializer(serializers.Serializer):
         game_id = attrs.get("game_id")
         game_slug = attrs.get("game_slug")
         try:
-            if game_id:
-                game = Game.objects.get(id=game_id)
-            else:
-                game = Game.objects.get(slug=game_slug)
+            game = catalog.get_game(game_id=game_id, slug=game_slug)
         except Game.DoesNotExist as exc:
             raise serializers.ValidationError("Game not found.") from exc
 
@@ -269,26 +358,30 @@ class JoinRoomSerializer(serializers.Serializer):
         else:
             player.last_seen_at = timezone.now()
             player.save(update_fields=["last_seen_at"])
-        room.last_activity_at = timezone.now()
-        room.save(update_fields=["last_activity_at"])
+        room.touch()
         return player
 
 
 class HeartbeatSerializer(serializers.Serializer):
     player_id = serializers.IntegerField()
 
-    def create(self, validated_data):
-        room = self.context["room"]
-        request = self.context["request"]
-        if not request.user.is_authenticated:
-            raise serializers.ValidationError("Authentication required.")
-        player = Player.objects.get(id=validated_data["player_id"], room=room, user=request.user)
-        now = timezone.now()
-        player.last_seen_at = now
-        player.save(update_fields=["last_seen_at"])
-        room.last_activity_at = now
-        room.save(update_fields=["last_activity_at"])
-        return player
+
+BATCH_OPS = ("heartbeat", "ready", "state", "retrieve")
+BATCH_MAX_OPS = 10
+
+
+class BatchOperationSerializer(serializers.Serializer):
+    op = serializers.ChoiceField(choices=BATCH_OPS)
+    data = serializers.DictField(required=False, default=dict)
+
+
+class BatchSerializer(serializers.Serializer):
+    ops = BatchOperationSerializer(many=True, allow_empty=False)
+
+    def validate_ops(self, value):
+        if len(value) > BATCH_MAX_OPS:
+            raise serializers.ValidationError(f"At most {BATCH_MAX_OPS} operations per batch.")
+        return value
 
 
 class ChangeGameSerializer(serializers.Serializer):
@@ -301,10 +394,7 @@ class ChangeGameSerializer(serializers.Serializer):
         game_id = attrs.get("game_id")
         game_slug = attrs.get("game_slug")
         try:
-            if game_id:
-                game = Game.objects.get(id=game_id)
-            else:
-                game = Game.objects.get(slug=game_slug)
+            game = catalog.get_game(game_id=game_id, slug=game_slug)
         except Game.DoesNotExist as exc:
             raise serializers.ValidationError("Game not found.") from exc
         attrs["game"] = game
@@ -317,7 +407,7 @@ class ReadySerializer(serializers.Serializer):
     def create(self, validated_data):
         room = self.context["room"]
         request = self.context["request"]
-        player = Player.objects.get(room=room, user=request.user)
+        player = Player.objects.only("id", "ready").get(room=room, user=request.user)
         player.ready = validated_data["ready"]
         player.last_seen_at = timezone.now()
         player.save(update_fields=["ready", "last_seen_at"])
@@ -331,7 +421,7 @@ class PlayerStateSerializer(serializers.Serializer):
     def create(self, validated_data):
         room = self.context["room"]
         request = self.context["request"]
-        player = Player.objects.get(room=room, user=request.user)
+        player = Player.objects.only("id").get(room=room, user=request.user)
         player.state = validated_data["state"]
         player.last_seen_at = timezone.now()
         player.save(update_fields=["state", "last_seen_at"])
@@ -343,9 +433,9 @@ class ProfileUpdateSerializer(serializers.Serializer):
     nickname = serializers.CharField(max_length=80)
 
     def validate_nickname(self, value):
-        nickname = value.strip()
+        nickname = identity.normalize_nickname(value)
         request = self.context.get("request")
-        qs = Profile.objects.filter(nickname__iexact=nickname)
+        qs = identity.profiles_with_nickname(nickname)
         if request and request.user.is_authenticated:
             qs = qs.exclude(user=request.user)
         if qs.exists():
@@ -376,13 +466,13 @@ class PasswordChangeSerializer(serializers.Serializer):
         request = self.context.get("request")
         if not request or not request.user.is_authenticated:
             raise serializers.ValidationError("Authentication required.")
-        if not request.user.check_password(attrs["current_password"]):
+        if not hashing.check_password(request.user, attrs["current_password"]):
             raise serializers.ValidationError("Invalid current password.")
         return attrs
 
     def create(self, validated_data):
         request = self.context["request"]
-        request.user.set_password(validated_data["new_password"])
+        request.user.password = hashing.make_password(validated_data["new_password"])
         request.user.save(update_fields=["password"])
         return request.user
 
@@ -0,0 +1,50 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from . import catalog, slow_queries, tracing
+from .authentication import invalidate_token, invalidate_user_tokens
+from .models import Game, Profile
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=Game)
+@receiver(post_delete, sender=Game)
+def invalidate_game_catalog(sender, **kwargs):
+    catalog.invalidate()
+    # Drop anything another request reloaded before the write committed.
+    transaction.on_commit(catalog.invalidate)
+
+
+@receiver(post_save, sender=User)
+def invalidate_cached_user(sender, instance, created, **kwargs):
+    # Covers password changes, deactivation and admin edits.
+    if not created:
+        invalidate_user_tokens(instance)
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def invalidate_cached_profile(sender, instance, **kwargs):
+    invalidate_user_tokens(instance.user_id)
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance, **kwargs):
+    invalidate_token(instance.key)
+
+
+@receiver(connection_created)
+def install_slow_query_wrapper(sender, connection, **kwargs):
+    if slow_queries.enabled() and slow_queries.wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(slow_queries.wrapper)
+
+
+@receiver(connection_created)
+def install_tracing_wrapper(sender, connection, **kwargs):
+    if tracing.enabled() and tracing.count_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(tracing.count_query)
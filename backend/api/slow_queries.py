@@ -0,0 +1,144 @@
+"""Capture slow SQL with its call site and query plan.
+
+With `SLOW_QUERY_MS` above zero, every database connection gets `wrapper`
+as an execute wrapper (see `signals.install_slow_query_wrapper`). A
+statement that takes at least that long is appended as one JSON line to
+`SLOW_QUERY_LOG`, with:
+
+- `sig`: a hash of the normalized SQL (literals, placeholders and `IN`
+  lists folded), so the same ORM pattern groups together whatever its
+  arguments.
+- `site`: the innermost `api/` frame that issued it, e.g.
+  `models.py:70 (generate_unique_code)`.
+- `plan`: the backend's `EXPLAIN` output (`EXPLAIN QUERY PLAN` on SQLite),
+  taken the first time each process sees a signature. With
+  `SLOW_QUERY_EXPLAIN_ANALYZE`, SELECTs get `EXPLAIN ANALYZE` on backends
+  that support it. That runs the query a second time, so it is opt-in.
+
+`slow_query_report` groups the lines by signature, with counts, timing
+percentiles and a histogram over `BUCKETS_MS`.
+"""
+import hashlib
+import json
+import logging
+import re
+import sys
+import threading
+import time
+from contextlib import nullcontext
+from pathlib import Path
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+
+logger = logging.getLogger(__name__)
+
+API_DIR = Path(__file__).resolve().parent
+BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE")
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%s|\?")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE = re.compile(r"\s+")
+
+_lock = threading.Lock()
+_explained = set()
+
+
+def enabled() -> bool:
+    return settings.SLOW_QUERY_MS > 0
+
+
+def normalize(sql: str) -> str:
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _IN_LIST.sub("(...)", sql)
+    return _SPACE.sub(" ", sql).strip()
+
+
+def signature(normalized: str) -> str:
+    return hashlib.sha1(normalized.encode()).hexdigest()[:12]
+
+
+def bucket(ms: float) -> str:
+    for bound in BUCKETS_MS:
+        if ms < bound:
+            return f"<{bound}ms"
+    return f">={BUCKETS_MS[-1]}ms"
+
+
+def call_site() -> str | None:
+    frame = sys._getframe(2)
+    while frame is not None:
+        path = Path(frame.f_code.co_filename)
+        if path.is_relative_to(API_DIR) and path.name != "slow_queries.py":
+            return f"{path.relative_to(API_DIR)}:{frame.f_lineno} ({frame.f_code.co_name})"
+        frame = frame.f_back
+    return None
+
+
+def explain(connection, sql, params) -> str | None:
+    statement = sql.lstrip().split(None, 1)[0].upper() if sql.strip() else ""
+    if statement not in EXPLAINABLE:
+        return None
+    options = {}
+    if settings.SLOW_QUERY_EXPLAIN_ANALYZE and statement == "SELECT" and connection.vendor == "postgresql":
+        options["analyze"] = True
+    prefix = connection.ops.explain_query_prefix(**options)
+    # On PostgreSQL a failed statement aborts the transaction it runs in, so
+    # inside one the EXPLAIN gets a savepoint. Elsewhere it is left alone:
+    # SQLite can't open a savepoint while the slow query's cursor (an INSERT
+    # ... RETURNING) is still being fetched, and a failure aborts nothing.
+    isolate = connection.in_atomic_block and connection.vendor == "postgresql"
+    try:
+        with transaction.atomic(using=connection.alias, savepoint=True) if isolate else nullcontext():
+            # A backend cursor, not `connection.cursor()`: skips the execute
+            # wrappers, so the EXPLAIN is neither timed nor explained itself.
+            cursor = connection.create_cursor()
+            try:
+                with connection.wrap_database_errors:
+                    cursor.execute(f"{prefix} {sql}", params)
+                    rows = cursor.fetchall()
+            finally:
+                cursor.close()
+    except DatabaseError as exc:
+        return f"EXPLAIN failed: {exc}"
+    return "\n".join(str(row[-1]) for row in rows)
+
+
+def wrapper(execute, sql, params, many, context):
+    started = time.perf_counter()
+    result = execute(sql, params, many, context)
+    ms = (time.perf_counter() - started) * 1000
+    if ms >= settings.SLOW_QUERY_MS:
+        record(context["connection"], sql, params, many, ms)
+    return result
+
+
+def record(connection, sql, params, many, ms) -> None:
+    normalized = normalize(sql)
+    sig = signature(normalized)
+    entry = {
+        "ts": time.time(),
+        "sig": sig,
+        "sql": normalized,
+        "ms": round(ms, 3),
+        "bucket": bucket(ms),
+        "site": call_site(),
+        "alias": connection.alias,
+        "many": many,
+    }
+    with _lock:
+        first = (connection.alias, sig) not in _explained
+        _explained.add((connection.alias, sig))
+    if first:
+        if not many:
+            entry["plan"] = explain(connection, sql, params)
+        logger.warning("slow query %s (%.1fms) at %s: %s", sig, ms, entry["site"], normalized)
+    line = json.dumps(entry) + "\n"
+    with _lock:
+        with open(settings.SLOW_QUERY_LOG, "a") as log:
+            log.write(line)
@@ -0,0 +1,101 @@
+import asyncio
+import json
+import time
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from .models import Room
+from .serializers import RoomDetailSerializer
+
+STREAM_POLL_SECONDS = 1
+STREAM_PRESENCE_SECONDS = 10
+# Resend even without changes so `online`/`tv_connected` flags stay fresh.
+STREAM_REFRESH_SECONDS = 20
+# Bounded so stale connections get recycled; EventSource reconnects.
+STREAM_MAX_SECONDS = 300
+STREAM_RETRY_MS = 2000
+
+
+def _snapshot(room_id: int) -> str:
+    room = Room.objects.select_related("game").prefetch_related("players").get(pk=room_id)
+    # No request in context: PlayerSerializer redacts exactly as for an anonymous TV.
+    data = RoomDetailSerializer(room).data
+    return f"id: {room.version}\nevent: room\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n"
+
+
+def _mark_tv_present(room_id: int, device_id: str) -> None:
+    fields = {"tv_last_seen_at": timezone.now()}
+    if device_id:
+        fields["tv_device_id"] = device_id
+    # Queryset update: presence must not bump the room version.
+    Room.objects.filter(pk=room_id).update(**fields)
+
+
+def _current_version(room_id: int):
+    return Room.objects.filter(pk=room_id).values_list("version", flat=True).first()
+
+
+def _gone() -> str:
+    return "event: gone\ndata: {}\n\n"
+
+
+class _RoomEvents:
+    """One stream's state. `poll` does a round of database work and returns the events to send."""
+
+    def __init__(self, room_id: int, device_id: str):
+        self.room_id = room_id
+        self.device_id = device_id
+        self.sent_version = None
+        self.sent_at = self.presence_at = 0.0
+
+    def poll(self) -> tuple[list[str], bool]:
+        """Events to send now, and whether the stream is over."""
+        now = time.monotonic()
+        if now - self.presence_at >= STREAM_PRESENCE_SECONDS:
+            _mark_tv_present(self.room_id, self.device_id)
+            self.presence_at = now
+        version = _current_version(self.room_id)
+        if version is None:
+            return [_gone()], True
+        if version != self.sent_version or now - self.sent_at >= STREAM_REFRESH_SECONDS:
+            self.sent_version, self.sent_at = version, now
+            return [_snapshot(self.room_id)], False
+        return [], False
+
+
+async def aroom_events(room_id: int, device_id: str = ""):
+    """Server-sent events for one room: a snapshot per version change, with TV presence.
+
+    For the ASGI server; each poll's queries take one `sync_to_async` hop.
+    """
+    yield f"retry: {STREAM_RETRY_MS}\n\n"
+    events = _RoomEvents(room_id, device_id)
+    started = time.monotonic()
+    while time.monotonic() - started < STREAM_MAX_SECONDS:
+        chunks, done = await sync_to_async(events.poll)()
+        for chunk in chunks:
+            yield chunk
+        if done:
+            return
+        await asyncio.sleep(STREAM_POLL_SECONDS)
+
+
+def room_events(room_id: int, device_id: str = "", max_seconds: int = STREAM_MAX_SECONDS):
+    """`aroom_events` for WSGI servers.
+
+    Each open stream holds a worker thread (and its database connection) for
+    up to `max_seconds`, so keep that below the server's worker timeout and
+    size the thread pool for one thread per TV. EventSource reconnects when
+    the stream ends.
+    """
+    yield f"retry: {STREAM_RETRY_MS}\n\n"
+    events = _RoomEvents(room_id, device_id)
+    started = time.monotonic()
+    while time.monotonic() - started < max_seconds:
+        chunks, done = events.poll()
+        yield from chunks
+        if done:
+            return
+        time.sleep(STREAM_POLL_SECONDS)
@@ -0,0 +1,239 @@
+"""Rooms and room-action cases shared by the tests and the bench/check commands."""
+import time
+from contextlib import contextmanager
+from typing import Callable, NamedTuple
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from api import catalog, views
+from api.authentication import CachedTokenAuthentication
+from api.models import Game, Player, Profile, Room
+
+User = get_user_model()
+
+
+class Rollback(Exception):
+    pass
+
+
+@contextmanager
+def rolled_back():
+    """Run a block against the real database and discard everything it wrote."""
+    try:
+        with transaction.atomic():
+            yield
+            raise Rollback
+    except Rollback:
+        pass
+
+
+def build_room(game_slug: str, player_count: int, start: bool = True, prefix: str = "bench") -> Room:
+    """Create a room with `player_count` ready players, optionally started through the API."""
+    game = Game.objects.get(slug=game_slug)
+    room = Room.objects.create(game=game)
+    unusable = make_password(None)
+    users = User.objects.bulk_create(
+        [
+            User(username=f"{prefix}-{room.code}-{index}@example.com", email=f"{prefix}-{room.code}-{index}@example.com", password=unusable)
+            for index in range(player_count)
+        ]
+    )
+    Profile.objects.bulk_create(
+        [Profile(user=user, nickname=f"{prefix}-{room.code}-{index}") for index, user in enumerate(users)]
+    )
+    Player.objects.bulk_create(
+        [
+            Player(room=room, user=user, name=f"Player {index + 1}", is_host=index == 0, ready=True)
+            for index, user in enumerate(users)
+        ]
+    )
+    if start:
+        response = APIClient().post(f"/api/rooms/{room.code}/start/", {"mode": "coop"}, format="json")
+        if response.status_code != 200:
+            raise RuntimeError(f"Unable to start {game_slug}: {response.status_code}")
+    return Room.objects.select_related("game").prefetch_related("players").get(pk=room.pk)
+
+
+class Case(NamedTuple):
+    """One room action to measure, as the host (the first player).
+
+    `setup(room, players)` runs untimed before the request, e.g. to submit
+    everyone else's move so the request resolves the round. `payload(room,
+    actor)` builds the JSON body; None sends a bodiless request.
+    """
+
+    name: str
+    game: str
+    method: str
+    suffix: str
+    payload: Callable | None = None
+    setup: Callable | None = None
+    started: bool = True
+    status: int = 200
+
+
+def _update_players(players, update) -> None:
+    for index, player in enumerate(players):
+        player.state = {**(player.state or {}), **update(index, player)}
+    Player.objects.bulk_update(players, ["state"])
+
+
+def _update_room(room, **values) -> None:
+    state = Room.objects.get(pk=room.pk).state
+    Room.objects.filter(pk=room.pk).update(state={**state, **values})
+
+
+def _expired(room, players):
+    _update_room(room, deadline_ts=time.time() - 1)
+
+
+def _round_break_over(room, players):
+    _update_room(room, phase="round_break", next_round_ts=time.time() - 1)
+
+
+def _cut_ready(room, players):
+    # The host holds the highest card, so playing it is a cut with a victim to find.
+    _update_players(players, lambda index, player: {"hand": [100] if index == 0 else [index + 1]})
+
+
+def _others_guessed_suit(room, players):
+    _update_players(players[1:], lambda index, player: {"guess": player.state["suit"]})
+
+
+def _all_guessed_suit(room, players):
+    _update_players(players, lambda index, player: {"guess": player.state["suit"]})
+    _expired(room, players)
+
+
+def _others_guessed_number(room, players):
+    _update_players(players[1:], lambda index, player: {"guess": (index * 7) % 101})
+
+
+def _all_guessed_number(room, players):
+    _update_players(players, lambda index, player: {"guess": (index * 7) % 101})
+    _expired(room, players)
+
+
+def _dice_rolled(room, players):
+    state = views._roll_sugoroku(Room.objects.get(pk=room.pk))
+    Room.objects.filter(pk=room.pk).update(state=state)
+    return state
+
+
+def _all_moved(room, players):
+    dice = _dice_rolled(room, players)["dice"]["0,0"]
+    directions = sorted(dice)
+    _update_players(players, lambda index, player: {"choice": {"action": "move", "direction": directions[index % len(directions)]}})
+    _expired(room, players)
+
+
+def _penalty_pending(room, players):
+    _update_room(room, pending_penalties={"1,1": {"amount": 2, "player_ids": [players[-1].id], "opener_id": players[0].id}})
+
+
+def _others_bid(room, players):
+    _update_players(players[1:], lambda index, player: {"bid": 1, "submitted": True})
+
+
+def _all_bid(room, players):
+    _update_players(players, lambda index, player: {"bid": index, "submitted": True})
+    _expired(room, players)
+
+
+def _others_guessed_winner(room, players):
+    _update_players(players[1:], lambda index, player: {"guess_winner_id": players[0].id})
+
+
+def _last_player(room, players):
+    return Player.objects.filter(room=room).order_by("-id").values_list("id", flat=True).first()
+
+
+CONFINAMENTO = "confinamento-solitario"
+GAME_SLUGS = [
+    views.READ_MY_MIND_SLUG,
+    views.CONFINAMENTO_SLUG,
+    views.BELEZA_SLUG,
+    views.SUGOROKU_SLUG,
+    views.LEILAO_SLUG,
+    views.BLEF_JACK_SLUG,
+]
+
+# Every detail action of `RoomViewSet` except `stream` and `wait` (open-ended
+# SSE and long-poll responses). Game actions are set up so the request does
+# the round's work.
+CASES = [
+    Case("retrieve", CONFINAMENTO, "get", ""),
+    Case("players", CONFINAMENTO, "get", "players/"),
+    Case("join", CONFINAMENTO, "post", "join/", lambda room, player: {}),
+    Case("heartbeat", CONFINAMENTO, "post", "heartbeat/", lambda room, player: {"player_id": player.id}),
+    Case("ready", CONFINAMENTO, "post", "ready/", lambda room, player: {"ready": True}),
+    Case("state", CONFINAMENTO, "post", "state/", lambda room, player: {"state": {}}),
+    Case("tv_ping", CONFINAMENTO, "post", "tv_ping/", lambda room, player: {"device_id": "tv"}),
+    Case("end", CONFINAMENTO, "post", "end/", lambda room, player: {}),
+    Case("batch", CONFINAMENTO, "post", "batch/", lambda room, player: {"ops": [{"op": "heartbeat"}, {"op": "retrieve"}]}),
+    *[
+        Case("start", game, "post", "start/", lambda room, player: {"mode": "coop"}, started=False)
+        for game in GAME_SLUGS
+    ],
+    Case("restart", CONFINAMENTO, "post", "restart/", lambda room, player: {}),
+    Case("change_game", CONFINAMENTO, "post", "change_game/", lambda room, player: {"game_slug": views.BELEZA_SLUG}),
+    Case("read_my_mind_mode", views.READ_MY_MIND_SLUG, "post", "read_my_mind_mode/", lambda room, player: {"mode": "versus"}),
+    Case("read_my_mind_play", views.READ_MY_MIND_SLUG, "post", "read_my_mind_play/", lambda room, player: {"card": 100}, _cut_ready),
+    Case("read_my_mind_tick", views.READ_MY_MIND_SLUG, "post", "read_my_mind_tick/", lambda room, player: {}, _round_break_over),
+    Case(
+        "confinamento_guess", CONFINAMENTO, "post", "confinamento_guess/",
+        lambda room, player: {"guess": player.state["suit"]}, _others_guessed_suit,
+    ),
+    Case("confinamento_tick", CONFINAMENTO, "post", "confinamento_tick/", lambda room, player: {}, _all_guessed_suit),
+    Case("beleza_guess", views.BELEZA_SLUG, "post", "beleza_guess/", lambda room, player: {"value": 50}, _others_guessed_number),
+    Case("beleza_tick", views.BELEZA_SLUG, "post", "beleza_tick/", lambda room, player: {}, _all_guessed_number),
+    Case("sugoroku_roll", views.SUGOROKU_SLUG, "post", "sugoroku_roll/", lambda room, player: {}),
+    Case("sugoroku_move", views.SUGOROKU_SLUG, "post", "sugoroku_move/", lambda room, player: {"action": "stay"}),
+    Case("sugoroku_unlock", views.SUGOROKU_SLUG, "post", "sugoroku_unlock/", lambda room, player: {}),
+    Case("sugoroku_tick", views.SUGOROKU_SLUG, "post", "sugoroku_tick/", lambda room, player: {}, _all_moved),
+    Case(
+        "sugoroku_penalty_choice", views.SUGOROKU_SLUG, "post", "sugoroku_penalty_choice/",
+        lambda room, player: {"target_player_id": _last_player(room, player)}, _penalty_pending,
+    ),
+    Case("leilao_bid", views.LEILAO_SLUG, "post", "leilao_bid/", lambda room, player: {"bid": 10}, _others_bid),
+    Case("leilao_tick", views.LEILAO_SLUG, "post", "leilao_tick/", lambda room, player: {}, _all_bid),
+    Case("blef_jack_bet", views.BLEF_JACK_SLUG, "post", "blef_jack_bet/", lambda room, player: {"bet": 1}, status=400),
+    Case("blef_jack_declare", views.BLEF_JACK_SLUG, "post", "blef_jack_declare/", lambda room, player: {"declared_value": 15}),
+    Case(
+        "blef_jack_guess", views.BLEF_JACK_SLUG, "post", "blef_jack_guess/",
+        lambda room, player: {"winner_player_id": player.id}, _others_guessed_winner,
+    ),
+]
+
+
+@contextmanager
+def prepared(case: Case, player_count: int):
+    """Set up `case` on a fresh room, inside a rolled-back transaction.
+
+    Yields a callable that sends the request and returns the response; time or
+    count queries around that call only.
+    """
+    with rolled_back():
+        room = build_room(case.game, player_count, start=case.started, prefix="queries")
+        players = list(room.players.order_by("id").select_related("user__profile"))
+        if case.setup:
+            case.setup(room, players)
+        actor = Player.objects.select_related("user__profile").get(pk=players[0].pk)
+        # A real token, so the async views (DJANGO_ASYNC_READ_VIEWS) authenticate
+        # too; resolving it once caches the user with its profile, as in production.
+        token = Token.objects.create(user=actor.user).key
+        CachedTokenAuthentication().authenticate_credentials(token)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+        path = f"/api/rooms/{room.code}/{case.suffix}"
+        payload = case.payload(room, actor) if case.payload else None
+        # Whichever case runs first would otherwise pay for loading the game catalog.
+        catalog.active_games()
+        if payload is None:
+            yield lambda: getattr(client, case.method)(path)
+        else:
+            yield lambda: getattr(client, case.method)(path, payload, format="json")
@@ -0,0 +1,35 @@
+import threading
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from api import actors
+
+
+@override_settings(ROOM_ACTORS_ENABLED=True)
+class DispatchTests(SimpleTestCase):
+    def test_runs_on_a_shard_thread_outside_transactions(self):
+        thread = actors.dispatch("1234", threading.current_thread)
+        self.assertTrue(thread.name.startswith("room-shard-"))
+
+    def test_timeout_leaves_the_action_running(self):
+        release = threading.Event()
+        applied = threading.Event()
+
+        def action():
+            release.wait(5)
+            applied.set()
+
+        with mock.patch.object(actors, "ACTOR_CALL_TIMEOUT_SECONDS", 0.05):
+            with self.assertRaises(actors.ActorTimeout) as raised:
+                actors.LocalRouter().dispatch("1234", action)
+        self.assertEqual(raised.exception.status_code, 503)
+        self.assertIn("may still have been applied", str(raised.exception.detail))
+        release.set()
+        self.assertTrue(applied.wait(5))
+
+
+@override_settings(ROOM_ACTORS_ENABLED=True)
+class DispatchInTransactionTests(TestCase):
+    def test_runs_inline_inside_the_callers_transaction(self):
+        self.assertIs(actors.dispatch("1234", threading.current_thread), threading.current_thread())
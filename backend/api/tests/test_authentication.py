@@ -0,0 +1,43 @@
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
+from rest_framework import exceptions
+from rest_framework.authtoken.models import Token
+
+from api.authentication import CachedTokenAuthentication, aauthenticate
+
+
+class CachedTokenTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user("bia@example.com", "bia@example.com", "sabado")
+        self.token = Token.objects.create(user=self.user)
+
+    def authenticate(self):
+        return CachedTokenAuthentication().authenticate_credentials(self.token.key)[0]
+
+    def aauthenticate(self):
+        request = RequestFactory().get("/", HTTP_AUTHORIZATION=f"Token {self.token.key}")
+        return async_to_sync(aauthenticate)(request)
+
+    def check_deleted_token_is_rejected(self, authenticate):
+        self.assertEqual(authenticate(), self.user)
+        with self.assertNumQueries(0):
+            authenticate()
+        self.token.delete()
+        with self.assertRaises(exceptions.AuthenticationFailed):
+            authenticate()
+
+    def test_deleted_token_is_rejected(self):
+        self.check_deleted_token_is_rejected(self.authenticate)
+
+    def test_deleted_token_is_rejected_by_async_views(self):
+        self.check_deleted_token_is_rejected(self.aauthenticate)
+
+    def test_deactivated_user_is_rejected_from_the_cache(self):
+        self.assertEqual(self.authenticate(), self.user)
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(exceptions.AuthenticationFailed):
+            self.authenticate()
@@ -0,0 +1,60 @@
+import gzip
+import json
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils.cache import has_vary_header
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from api import catalog
+from api.tests.fixtures import build_room
+from api.models import Player
+
+PLAYER_COUNT = 12
+
+
+class APICompressionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command("seed_games", stdout=StringIO())
+
+    def setUp(self):
+        catalog.invalidate()
+        self.room = build_room("confinamento-solitario", PLAYER_COUNT, prefix="gzip")
+        host = Player.objects.filter(room=self.room).order_by("id").first()
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {Token.objects.create(user=host.user).key}")
+
+    def get_room(self, accept_encoding=None):
+        headers = {"HTTP_ACCEPT_ENCODING": accept_encoding} if accept_encoding else {}
+        response = self.client.get(f"/api/rooms/{self.room.code}/", **headers)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_gzip_is_negotiated_and_shrinks_the_room_detail(self):
+        plain = self.get_room()
+        compressed = self.get_room("gzip, deflate")
+        self.assertEqual(compressed["Content-Encoding"], "gzip")
+        self.assertEqual(int(compressed["Content-Length"]), len(compressed.content))
+        body = gzip.decompress(compressed.content)
+        # Same document; only the players' last-seen timestamps move between the two GETs.
+        self.assertEqual(len(body), len(plain.content))
+        self.assertEqual(len(json.loads(body)["players"]), PLAYER_COUNT)
+        self.assertLess(len(compressed.content), len(plain.content) / 3)
+
+    def test_vary_is_set_whether_or_not_the_client_accepts_gzip(self):
+        plain = self.get_room()
+        self.assertFalse(plain.has_header("Content-Encoding"))
+        for response in (plain, self.get_room("gzip")):
+            self.assertTrue(has_vary_header(response, "Accept-Encoding"))
+
+    def test_responses_below_the_threshold_stay_uncompressed(self):
+        size = len(self.get_room().content)
+        with override_settings(API_COMPRESSION_MIN_BYTES=size + 1):
+            response = self.get_room("gzip")
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertFalse(has_vary_header(response, "Accept-Encoding"))
+        with override_settings(API_COMPRESSION_MIN_BYTES=size):
+            self.assertEqual(self.get_room("gzip")["Content-Encoding"], "gzip")
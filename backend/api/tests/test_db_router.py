@@ -0,0 +1,51 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from rest_framework.response import Response
+
+from api import catalog, db_router
+from api.tests.fixtures import build_room
+from api.models import Room
+
+ADDRESS = "203.0.113.7"
+
+
+class ReplicaPinTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+
+    def request(self, token=None, address=ADDRESS):
+        headers = {"HTTP_AUTHORIZATION": f"Token {token}"} if token else {}
+        return self.factory.get("/api/rooms/1234/", REMOTE_ADDR=address, **headers)
+
+    def test_write_pins_only_the_writers_credentials(self):
+        db_router.pin_to_primary(self.request("alice"))
+        self.assertTrue(db_router.is_pinned(self.request("alice", address="198.51.100.1")))
+        self.assertFalse(db_router.is_pinned(self.request("bob")))
+        self.assertFalse(db_router.is_pinned(self.request()))
+
+    def test_anonymous_clients_pin_by_address(self):
+        db_router.pin_to_primary(self.request())
+        self.assertTrue(db_router.is_pinned(self.request()))
+        self.assertFalse(db_router.is_pinned(self.request("bob")))
+
+    def test_issued_token_is_pinned(self):
+        db_router.pin_to_primary(self.request(), Response({"token": "fresh"}))
+        self.assertTrue(db_router.is_pinned(self.request("fresh", address="198.51.100.1")))
+
+
+class ReplicaInstanceWriteTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command("seed_games", stdout=StringIO())
+
+    def test_room_read_from_the_replica_bumps_its_version_on_the_primary(self):
+        catalog.invalidate()
+        room = build_room("confinamento-solitario", 2, prefix="replica")
+        version = Room.objects.get(pk=room.pk).version
+        room._state.db = db_router.REPLICA_ALIAS
+        room.save(update_fields=["state"])
+        self.assertEqual(Room.objects.get(pk=room.pk).version, version + 1)
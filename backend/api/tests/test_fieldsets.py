@@ -0,0 +1,35 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from api import catalog, fieldsets
+from api.models import Player
+from api.tests.fixtures import build_room
+
+
+class RoomProfileTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command("seed_games", stdout=StringIO())
+
+    def setUp(self):
+        catalog.invalidate()
+        self.room = build_room("confinamento-solitario", 3, prefix="profile")
+        self.players = list(Player.objects.filter(room=self.room).order_by("id"))
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {Token.objects.create(user=self.players[0].user).key}")
+
+    def test_profiles_expose_user_ids_but_not_users(self):
+        user_ids = {player.user_id for player in self.players}
+        for profile in fieldsets.PROFILES:
+            with self.subTest(profile=profile):
+                response = self.client.get(f"/api/rooms/{self.room.code}/", {"profile": profile})
+                self.assertEqual(response.status_code, 200)
+                self.assertNotIn(b"@example.com", response.content)
+                for player in response.json()["players"]:
+                    self.assertNotIn("user", player)
+                    if profile != "tv":
+                        self.assertIn(player["user_id"], user_ids)
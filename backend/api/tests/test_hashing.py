@@ -0,0 +1,37 @@
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from api import hashing
+
+
+@override_settings(PASSWORD_HASH_WORKERS=0)
+class PasswordHashingTests(TestCase):
+    def setUp(self):
+        hashing.shutdown()
+        self.addCleanup(hashing.shutdown)
+
+    def register(self, password):
+        return APIClient().post(
+            "/api/auth/register/", {"email": "bia@example.com", "password": password, "nickname": "Bia"}, format="json"
+        )
+
+    def test_registration_hashes_once(self):
+        with mock.patch.object(hashing, "_run", wraps=hashing._run) as run:
+            response = self.register("Sabado-Night-42")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(run.call_count, 1)
+        self.assertEqual(hashing.metrics()["in_flight"], 0)
+
+    @override_settings(PASSWORD_HASH_MAX_PENDING=1, PASSWORD_HASH_WAIT_SECONDS=0)
+    def test_full_pool_answers_busy(self):
+        _, slots = hashing._executor()
+        slots.acquire()
+        try:
+            with self.assertLogs("api.hashing", "WARNING"):
+                response = self.register("Sabado-Night-42")
+        finally:
+            slots.release()
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "1")
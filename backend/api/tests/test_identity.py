@@ -0,0 +1,36 @@
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from api import hashing
+
+PASSWORD = "Sabado-Night-42"
+
+
+@override_settings(PASSWORD_HASH_WORKERS=0)
+class IdentityTests(TestCase):
+    def setUp(self):
+        hashing.shutdown()
+        self.addCleanup(hashing.shutdown)
+        self.client = APIClient()
+        response = self.register("Ana@Example.com", "Ana  Maria")
+        self.assertEqual(response.status_code, 201)
+
+    def register(self, email, nickname):
+        return self.client.post(
+            "/api/auth/register/", {"email": email, "password": PASSWORD, "nickname": nickname}, format="json"
+        )
+
+    def test_email_is_unique_ignoring_case(self):
+        response = self.register(" ANA@example.COM ", "Someone Else")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("email", response.data)
+
+    def test_nickname_is_unique_ignoring_case_and_spacing(self):
+        response = self.register("other@example.com", "ana maria")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("nickname", response.data)
+
+    def test_login_ignores_email_case(self):
+        response = self.client.post("/api/auth/login/", {"email": "ANA@EXAMPLE.COM", "password": PASSWORD}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["user"]["email"], "ana@example.com")
@@ -0,0 +1,46 @@
+import json
+from unittest import mock
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.http import JsonResponse
+from django.test import RequestFactory, SimpleTestCase
+
+from api import recording, tracing
+from api.middleware import TracingMiddleware, TrafficRecorderMiddleware
+
+
+def sync_view(request):
+    return JsonResponse({"ok": True, "span": tracing.current() is not None})
+
+
+async def async_view(request):
+    return sync_view(request)
+
+
+class HybridMiddlewareTests(SimpleTestCase):
+    """Request middlewares run on either handler without an extra thread hop."""
+
+    def call(self, middleware_class, view):
+        middleware = middleware_class(view)
+        self.assertEqual(iscoroutinefunction(middleware), iscoroutinefunction(view))
+        request = RequestFactory().post("/api/rooms/1234/ready/", json.dumps({"ready": True}), content_type="application/json")
+        request.resolver_match = None
+        if iscoroutinefunction(middleware):
+            return async_to_sync(middleware)(request)
+        return middleware(request)
+
+    def test_tracing_opens_the_request_span(self):
+        for view in (sync_view, async_view):
+            with self.subTest(view=view.__name__), mock.patch.object(tracing, "export") as export:
+                response = self.call(TracingMiddleware, view)
+                self.assertTrue(json.loads(response.content)["span"])
+                [spans] = export.call_args.args
+                self.assertEqual([span.attributes["http.status_code"] for span in spans], [200])
+                self.assertIsNone(tracing.current())
+
+    def test_traffic_recorder_records_the_request(self):
+        for view in (sync_view, async_view):
+            with self.subTest(view=view.__name__), mock.patch.object(recording.recorder, "add") as add:
+                self.call(TrafficRecorderMiddleware, view)
+                [entry] = add.call_args.args
+                self.assertEqual((entry["path"], entry["status"], entry["body"]), ("/api/rooms/1234/ready/", 200, {"ready": True}))
@@ -0,0 +1,62 @@
+import json
+from io import StringIO
+
+from asgiref.sync import async_to_sync
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from api import async_views, catalog
+from api.tests.fixtures import build_room
+from api.models import Player, Room
+
+ASYNC_VIEWS = {"heartbeat": async_views.room_heartbeat, "tv_ping": async_views.room_tv_ping}
+
+
+class PresenceTests(TestCase):
+    """The DRF actions and the async views answer presence writes the same way."""
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command("seed_games", stdout=StringIO())
+
+    def setUp(self):
+        catalog.invalidate()
+        self.room = build_room("confinamento-solitario", 2, prefix="presence")
+        self.host, self.guest = Player.objects.filter(room=self.room).order_by("id")
+        self.token = Token.objects.create(user=self.host.user).key
+
+    def drf_post(self, code, action, data):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Token {self.token}")
+        response = client.post(f"/api/rooms/{code}/{action}/", data, format="json")
+        return response.status_code, response.json()
+
+    def async_post(self, code, action, data):
+        request = RequestFactory().post(
+            f"/api/rooms/{code}/{action}/", json.dumps(data), content_type="application/json",
+            HTTP_AUTHORIZATION=f"Token {self.token}",
+        )
+        response = async_to_sync(ASYNC_VIEWS[action])(request, code=code)
+        return response.status_code, json.loads(response.content)
+
+    def check_presence(self, post):
+        code = self.room.code
+        version = Room.objects.get(pk=self.room.pk).version
+        self.assertEqual(post(code, "heartbeat", {"player_id": self.host.id}), (200, {"ok": True, "player_id": self.host.id}))
+        self.assertEqual(post(code, "heartbeat", {"player_id": self.guest.id}), (400, {"detail": "Player not in room."}))
+        self.assertEqual(post(code, "heartbeat", {"player_id": "x"}), (400, {"player_id": ["A valid integer is required."]}))
+        status_code, ack = post(code, "tv_ping", {"device_id": " tv-1 "})
+        self.assertEqual((status_code, ack["tv_connected"]), (200, True))
+        self.assertEqual(post("0000", "tv_ping", {})[0], 404)
+        room = Room.objects.get(pk=self.room.pk)
+        self.assertEqual(room.tv_device_id, "tv-1")
+        # Presence never bumps the version clients poll on.
+        self.assertEqual(room.version, version)
+
+    def test_drf_actions(self):
+        self.check_presence(self.drf_post)
+
+    def test_async_views(self):
+        self.check_presence(self.async_post)
@@ -0,0 +1,70 @@
+import time
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import IntegrityError, transaction
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from api import catalog, results
+from api.tests.fixtures import build_room
+from api.models import GameResult, Player, Room, UserGameStats
+from api.views import _set_room_state
+
+CONFINAMENTO = "confinamento-solitario"
+
+
+class GameResultRecordingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command("seed_games", stdout=StringIO())
+
+    def setUp(self):
+        catalog.invalidate()
+        self.room = build_room(CONFINAMENTO, 3, prefix="results")
+        self.players = list(Player.objects.filter(room=self.room).order_by("id"))
+        self.client = APIClient()
+        self.client.force_authenticate(self.players[0].user)
+
+    def post(self, action):
+        return self.client.post(f"/api/rooms/{self.room.code}/{action}/", {"guess": "hearts"}, format="json")
+
+    def expire_round(self):
+        state = Room.objects.get(pk=self.room.pk).state
+        Room.objects.filter(pk=self.room.pk).update(state={**state, "deadline_ts": time.time() - 1})
+
+    def test_forced_end_records_nothing(self):
+        self.post("end")
+        self.expire_round()
+        self.assertEqual(self.post("confinamento_tick").data["status"], Room.STATUS_ENDED)
+        self.post("confinamento_guess")
+        self.assertFalse(GameResult.objects.filter(room=self.room).exists())
+
+    def test_finished_game_is_recorded_once(self):
+        # Only the valete guesses right, so the round eliminates everyone else.
+        valete_id = Room.objects.get(pk=self.room.pk).state["valete_player_id"]
+        for player in self.players:
+            player.state = {**player.state, "guess": player.state["suit"] if player.id == valete_id else "none"}
+        Player.objects.bulk_update(self.players, ["state"])
+        self.expire_round()
+        self.assertEqual(self.post("confinamento_tick").data["status"], Room.STATUS_ENDED)
+        self.post("confinamento_tick")
+        self.post("end")
+        self.assertEqual(GameResult.objects.filter(room=self.room).count(), len(self.players))
+
+    def test_racing_callers_record_the_game_once(self):
+        Room.objects.filter(pk=self.room.pk).update(status=Room.STATUS_ENDED)
+        # Both callers loaded the room before either saved the ended state.
+        first, second = Room.objects.get(pk=self.room.pk), Room.objects.get(pk=self.room.pk)
+        for room in (first, second):
+            _set_room_state(room, {**room.state, "winners": [self.players[0].id]})
+        self.assertEqual(GameResult.objects.filter(room=self.room).count(), len(self.players))
+        self.assertEqual(set(UserGameStats.objects.values_list("played", flat=True)), {1})
+        self.assertTrue(Room.objects.get(pk=self.room.pk).state[results.RECORDED_KEY])
+
+    def test_duplicate_results_for_one_game_are_rejected(self):
+        result = GameResult(room=self.room, game_id=self.room.game_id, user=self.players[0].user, game_number=1)
+        result.save()
+        result.pk = None
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            result.save()
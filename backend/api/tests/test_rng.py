@@ -0,0 +1,23 @@
+from django.test import SimpleTestCase
+
+from api import rng as room_rng
+
+
+class RoomRngTests(SimpleTestCase):
+    def test_each_event_takes_the_next_step(self):
+        state = {}
+        room_rng.for_state(state)
+        room_rng.for_state(state)
+        self.assertEqual(state["rng"]["step"], 2)
+        self.assertEqual(len(state["rng"]["seed"]), 32)
+
+    def test_seed_replays_every_event(self):
+        state = {}
+        draws = [room_rng.for_state(state).sample(range(1, 101), 24) for _ in range(3)]
+        seed = state["rng"]["seed"]
+        self.assertEqual([room_rng.replay(seed, step).sample(range(1, 101), 24) for step in range(3)], draws)
+
+    def test_events_draw_differently(self):
+        state = {}
+        first, second = (room_rng.for_state(state).sample(range(1, 101), 24) for _ in range(2))
+        self.assertNotEqual(first, second)
@@ -0,0 +1,42 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api.models import Game, Player, Room
+
+User = get_user_model()
+
+
+class RoomHistoryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command("seed_games", stdout=StringIO())
+        cls.user = User.objects.create(username="h@example.com", email="h@example.com")
+        game = Game.objects.get(slug="confinamento-solitario")
+        now = timezone.now()
+        rooms = Room.objects.bulk_create([Room(code=f"{9000 + index}", game=game) for index in range(7)])
+        # Pairs share a join time, so pages must break ties on id.
+        Player.objects.bulk_create(
+            [Player(room=room, user=cls.user, joined_at=now - timedelta(minutes=index // 2)) for index, room in enumerate(rooms)]
+        )
+
+    def test_pages_cover_every_room_once_newest_first(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        codes, url = [], "/api/auth/history/?limit=3"
+        while url:
+            data = client.get(url).json()
+            codes += [entry["code"] for entry in data["results"]]
+            url = data["next"]
+        expected = Player.objects.filter(user=self.user).order_by("-joined_at", "-id").values_list("room__code", flat=True)
+        self.assertEqual(codes, list(expected))
+
+    def test_invalid_cursor_is_rejected(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        self.assertEqual(client.get("/api/auth/history/?cursor=nope").status_code, 404)
@@ -0,0 +1,99 @@
+import re
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from api import catalog
+from api.models import Room
+from api.tests.fixtures import CASES, prepared
+from api.views import RoomViewSet
+
+PLAYER_COUNTS = (2, 8, 16)
+
+# Upper bounds per action at any player count.
+QUERY_BUDGETS = {
+    "retrieve": 3,
+    "players": 2,
+    "join": 4,
+    "heartbeat": 3,
+    "ready": 4,
+    "state": 4,
+    "tv_ping": 2,
+    "end": 2,
+    "batch": 6,
+    "start": 8,
+    "restart": 6,
+    "change_game": 5,
+    "read_my_mind_mode": 4,
+    "read_my_mind_play": 9,
+    "read_my_mind_tick": 6,
+    "confinamento_guess": 8,
+    "confinamento_tick": 6,
+    "beleza_guess": 10,
+    "beleza_tick": 7,
+    "sugoroku_roll": 5,
+    "sugoroku_move": 4,
+    "sugoroku_unlock": 4,
+    "sugoroku_tick": 7,
+    "sugoroku_penalty_choice": 7,
+    "leilao_bid": 10,
+    "leilao_tick": 7,
+    "blef_jack_bet": 2,
+    "blef_jack_declare": 6,
+    "blef_jack_guess": 11,
+}
+
+ROOM_COLUMN = re.compile(r'"api_room"\."(\w+)"')
+
+
+class RoomActionQueryTests(TestCase):
+    """Every room action issues the same number of queries at any player count, within its budget."""
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command("seed_games", stdout=StringIO())
+
+    def setUp(self):
+        # Games cached by another test's database would not match this one's.
+        catalog.invalidate()
+
+    def test_every_case_has_a_budget(self):
+        self.assertEqual({case.name for case in CASES}, set(QUERY_BUDGETS))
+
+    def test_query_count_is_constant_and_within_budget(self):
+        for case in CASES:
+            with self.subTest(action=case.name, game=case.game):
+                expected = self.count_queries(case, PLAYER_COUNTS[0])
+                self.assertLessEqual(expected, QUERY_BUDGETS[case.name])
+                for player_count in PLAYER_COUNTS[1:]:
+                    with prepared(case, player_count) as send, self.assertNumQueries(expected):
+                        response = send()
+                    self.assertEqual(response.status_code, case.status)
+
+    def test_light_actions_load_only_their_room_columns(self):
+        light_cases = [case for case in CASES if case.name in RoomViewSet.light_action_fields]
+        self.assertTrue(light_cases)
+        for case in light_cases:
+            with self.subTest(action=case.name):
+                fields = RoomViewSet.light_action_fields[case.name]
+                allowed = {"id", *(Room._meta.get_field(field.split("__")[0]).attname for field in fields)}
+                for query in self.capture(case, PLAYER_COUNTS[0]):
+                    sql = query["sql"]
+                    if not sql.startswith("SELECT") or 'FROM "api_room"' not in sql:
+                        continue
+                    columns = set(ROOM_COLUMN.findall(sql.split(" FROM ", 1)[0]))
+                    self.assertLessEqual(columns, allowed, sql)
+                    if "state" not in fields:
+                        self.assertNotIn("state", columns)
+
+    def count_queries(self, case, player_count) -> int:
+        return len(self.capture(case, player_count))
+
+    def capture(self, case, player_count) -> list:
+        with prepared(case, player_count) as send, CaptureQueriesContext(connection) as captured:
+            response = send()
+        self.assertEqual(response.status_code, case.status)
+        return captured.captured_queries
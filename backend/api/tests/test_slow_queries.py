@@ -0,0 +1,31 @@
+from unittest import mock
+
+from django.db import connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from api import slow_queries
+from api.models import Game
+
+MISSING_TABLE_SQL = 'SELECT * FROM "missing_table"'
+
+
+class ExplainTests(TestCase):
+    def test_plan_of_a_select(self):
+        plan = slow_queries.explain(connection, 'SELECT * FROM "api_game" WHERE "slug" = %s', ["x"])
+        self.assertTrue(plan)
+        self.assertFalse(plan.startswith("EXPLAIN failed"))
+
+    def test_failed_explain_leaves_the_transaction_usable(self):
+        with transaction.atomic():
+            Game.objects.create(slug="kept", name="Kept")
+            self.assertTrue(slow_queries.explain(connection, MISSING_TABLE_SQL, []).startswith("EXPLAIN failed"))
+            self.assertTrue(Game.objects.filter(slug="kept").exists())
+        self.assertTrue(Game.objects.filter(slug="kept").exists())
+
+    def test_postgresql_explain_runs_in_a_savepoint(self):
+        with mock.patch.object(connection, "vendor", "postgresql"), CaptureQueriesContext(connection) as captured:
+            plan = slow_queries.explain(connection, MISSING_TABLE_SQL, [])
+        self.assertTrue(plan.startswith("EXPLAIN failed"))
+        statements = [query["sql"].split()[0] for query in captured]
+        self.assertEqual(statements, ["SAVEPOINT", "ROLLBACK", "RELEASE"])
@@ -0,0 +1,38 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from api import catalog, streams
+from api.models import Room
+from api.tests.fixtures import build_room
+
+
+class WSGIStreamTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command("seed_games", stdout=StringIO())
+
+    def setUp(self):
+        catalog.invalidate()
+        self.room = build_room("confinamento-solitario", 2, prefix="stream")
+
+    def stream(self):
+        return APIClient().get(f"/api/rooms/{self.room.code}/stream/?device_id=tv-1")
+
+    @override_settings(STREAM_WSGI_MAX_SECONDS=1)
+    def test_streams_a_snapshot_and_ends_within_the_bound(self):
+        with mock.patch.object(streams, "STREAM_POLL_SECONDS", 0.3):
+            response = self.stream()
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response["Content-Type"], "text/event-stream")
+            events = list(response.streaming_content)
+        self.assertTrue(events[0].startswith(b"retry:"))
+        self.assertEqual(sum(event.startswith(b"id:") for event in events), 1)
+        self.assertEqual(Room.objects.get(pk=self.room.pk).tv_device_id, "tv-1")
+
+    @override_settings(STREAM_WSGI_MAX_SECONDS=0)
+    def test_disabled_stream_answers_404(self):
+        self.assertEqual(self.stream().status_code, 404)
@@ -0,0 +1,84 @@
+import json
+import threading
+import time
+from io import StringIO
+
+from asgiref.sync import async_to_sync
+from django.core.management import call_command
+from django.db import connection
+from django.test import RequestFactory, TransactionTestCase, override_settings
+from rest_framework.authtoken.models import Token
+
+from api import async_views, catalog
+from api.models import Player, Room
+from api.tests.fixtures import build_room
+from api.views import RoomViewSet
+
+
+@override_settings(WAIT_WSGI_MAX_SECONDS=5)
+class RoomWaitTests(TransactionTestCase):
+    """`RoomViewSet.wait` (WSGI) and `async_views.room_wait` (ASGI) answer the same way."""
+
+    def setUp(self):
+        call_command("seed_games", stdout=StringIO())
+        catalog.invalidate()
+        self.room = build_room("confinamento-solitario", 2, prefix="wait")
+        self.version = Room.objects.get(pk=self.room.pk).version
+        host = Player.objects.filter(room=self.room).order_by("id").first()
+        self.auth = {"HTTP_AUTHORIZATION": f"Token {Token.objects.create(user=host.user).key}"}
+
+    def drf_wait(self, query):
+        # The view itself: with DJANGO_ASYNC_READ_VIEWS the route goes to the async view.
+        request = RequestFactory().get(f"/api/rooms/{self.room.code}/wait/", query, **self.auth)
+        response = RoomViewSet.as_view({"get": "wait"})(request, code=self.room.code)
+        return response.status_code, json.loads(response.render().content)
+
+    def async_wait(self, query):
+        request = RequestFactory().get(f"/api/rooms/{self.room.code}/wait/", query, **self.auth)
+        response = async_to_sync(async_views.room_wait)(request, code=self.room.code)
+        return response.status_code, json.loads(response.content)
+
+    def timed(self, wait, query):
+        started = time.monotonic()
+        result = wait(query)
+        return result, time.monotonic() - started
+
+    def bump_later(self, delay):
+        def bump():
+            time.sleep(delay)
+            room = Room.objects.get(pk=self.room.pk)
+            room.state = {**room.state, "bumped": True}
+            room.save(update_fields=["state"])
+            connection.close()
+
+        thread = threading.Thread(target=bump)
+        thread.start()
+        self.addCleanup(thread.join)
+
+    def check_wait(self, wait):
+        (status_code, data), took = self.timed(wait, {"version": self.version - 1, "timeout": 5})
+        self.assertEqual((status_code, data["changed"], data["version"]), (200, True, self.version))
+        self.assertEqual(data["room"]["code"], self.room.code)
+        self.assertLess(took, 1)
+
+        (status_code, data), took = self.timed(wait, {"version": self.version, "timeout": 0.6})
+        self.assertEqual((status_code, data), (200, {"changed": False, "version": self.version}))
+        self.assertGreaterEqual(took, 0.5)
+
+        self.bump_later(0.3)
+        (status_code, data), took = self.timed(wait, {"version": self.version, "timeout": 5})
+        self.assertEqual((status_code, data["changed"], data["version"]), (200, True, self.version + 1))
+        self.assertTrue(data["room"]["state"]["bumped"])
+        self.assertLess(took, 3)
+
+    def test_drf_action(self):
+        self.check_wait(self.drf_wait)
+
+    def test_async_view(self):
+        self.check_wait(self.async_wait)
+
+    @override_settings(WAIT_WSGI_MAX_SECONDS=0)
+    def test_wsgi_timeout_is_capped(self):
+        (status_code, data), took = self.timed(self.drf_wait, {"version": self.version, "timeout": 30})
+        self.assertEqual((status_code, data["changed"]), (200, False))
+        self.assertLess(took, 1)
@@ -0,0 +1,230 @@
+"""Lightweight tracing spans around the room engine.
+
+With `TRACING_EXPORTER` set, `TracingMiddleware` opens a root span per view
+call. The engine phases decorated with `traced` each open a child span:
+`_initialize_*`, `_resolve_*`, `_tick_*`, `_set_room_state`, `_fresh_room`
+and `RoomSerializer.to_representation`. Every span records:
+
+- `room.code`, `game.slug` and `room.players`, read from the first `Room`
+  argument;
+- `db.queries`: statements run while the span was open, children
+  included, counted by an execute wrapper (see
+  `signals.install_tracing_wrapper`).
+
+A trace is exported when its root span ends:
+
+- `jsonl`: one line per span appended to `TRACE_FILE`.
+- `otlp`: posted as OTLP/HTTP JSON to `TRACE_OTLP_ENDPOINT` from a
+  background thread (dropped when the queue is full). `trace_collector`
+  is a local stand-in for a collector that writes the same JSONL.
+
+`trace_report` breaks span durations and query counts down by player
+count. Actions run by room actors keep their parent span (`bind`).
+"""
+import contextvars
+import json
+import queue
+import secrets
+import threading
+import time
+import urllib.request
+from functools import wraps
+
+from django.conf import settings
+
+from . import catalog
+from .models import Game, Room
+
+SERVICE_NAME = "sabado-games-api"
+OTLP_QUEUE_SIZE = 256
+
+_stack = contextvars.ContextVar("trace_stack", default=())
+_uncounted = contextvars.ContextVar("trace_uncounted", default=False)
+_file_lock = threading.Lock()
+_otlp_queue = None
+
+
+def enabled() -> bool:
+    return bool(settings.TRACING_EXPORTER)
+
+
+class Span:
+    def __init__(self, name: str, parent: "Span | None" = None, attributes: dict | None = None):
+        self.name = name
+        self.parent = parent
+        self.root = parent.root if parent else self
+        self.trace_id = parent.trace_id if parent else secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.attributes = dict(attributes or {})
+        self.queries = 0
+        self.finished = []
+
+    def start(self) -> "Span":
+        self.start_ns = time.time_ns()
+        self._token = _stack.set((*_stack.get(), self))
+        return self
+
+    def end(self) -> None:
+        self.end_ns = time.time_ns()
+        _stack.reset(self._token)
+        self.attributes["db.queries"] = self.queries
+        self.root.finished.append(self)
+        if self.root is self:
+            export(self.finished)
+
+    def as_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent.span_id if self.parent else None,
+            "name": self.name,
+            "start_ns": self.start_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1_000_000, 3),
+            "attributes": self.attributes,
+        }
+
+
+def current() -> Span | None:
+    stack = _stack.get()
+    return stack[-1] if stack else None
+
+
+def start_span(name: str, attributes: dict | None = None) -> Span:
+    return Span(name, current(), attributes).start()
+
+
+def count_query(execute, sql, params, many, context):
+    if not _uncounted.get():
+        for span in _stack.get():
+            span.queries += 1
+    return execute(sql, params, many, context)
+
+
+def room_attributes(room: Room) -> dict:
+    """Span attributes for `room`.
+
+    The player count costs one query unless players are prefetched; it and
+    any catalog reload are left out of the spans' query counts.
+    """
+    token = _uncounted.set(True)
+    try:
+        players = getattr(room, "_prefetched_objects_cache", {}).get("players")
+        count = len(players) if players is not None else getattr(room, "_trace_player_count", None)
+        if count is None:
+            count = room._trace_player_count = room.players.count()
+        try:
+            slug = catalog.get_game(game_id=room.game_id).slug
+        except Game.DoesNotExist:
+            slug = None
+    finally:
+        _uncounted.reset(token)
+    return {"room.code": room.code, "game.slug": slug, "room.players": count}
+
+
+def traced(func):
+    """Run `func` in a span named after it, tagged with its first `Room` argument."""
+    name = func.__qualname__.lstrip("_")
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if not enabled() or current() is None:
+            return func(*args, **kwargs)
+        room = next((arg for arg in args if isinstance(arg, Room)), None)
+        span = start_span(name, room_attributes(room) if room is not None else None)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            span.end()
+
+    return wrapper
+
+
+def bind(fn):
+    """Carry the caller's open spans into `fn`, for work handed to another thread."""
+    stack = _stack.get()
+    if not stack:
+        return fn
+
+    def bound():
+        token = _stack.set(stack)
+        try:
+            return fn()
+        finally:
+            _stack.reset(token)
+
+    return bound
+
+
+def export(spans) -> None:
+    if settings.TRACING_EXPORTER == "otlp":
+        _enqueue_otlp(spans)
+        return
+    lines = "".join(json.dumps(span.as_dict()) + "\n" for span in spans)
+    with _file_lock:
+        with open(settings.TRACE_FILE, "a") as trace_file:
+            trace_file.write(lines)
+
+
+def _otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    return {"stringValue": str(value)}
+
+
+def otlp_payload(spans) -> dict:
+    return {
+        "resourceSpans": [
+            {
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+                "scopeSpans": [
+                    {
+                        "scope": {"name": "api.tracing"},
+                        "spans": [
+                            {
+                                "traceId": span.trace_id,
+                                "spanId": span.span_id,
+                                "parentSpanId": span.parent.span_id if span.parent else "",
+                                "name": span.name,
+                                "kind": 1,
+                                "startTimeUnixNano": str(span.start_ns),
+                                "endTimeUnixNano": str(span.end_ns),
+                                "attributes": [
+                                    {"key": key, "value": _otlp_value(value)}
+                                    for key, value in span.attributes.items()
+                                    if value is not None
+                                ],
+                            }
+                            for span in spans
+                        ],
+                    }
+                ],
+            }
+        ]
+    }
+
+
+def _enqueue_otlp(spans) -> None:
+    global _otlp_queue
+    if _otlp_queue is None:
+        with _file_lock:
+            if _otlp_queue is None:
+                _otlp_queue = queue.Queue(OTLP_QUEUE_SIZE)
+                threading.Thread(target=_post_otlp, args=(_otlp_queue,), name="otlp-exporter", daemon=True).start()
+    try:
+        _otlp_queue.put_nowait(otlp_payload(spans))
+    except queue.Full:
+        pass
+
+
+def _post_otlp(payloads: queue.Queue) -> None:
+    while True:
+        body = json.dumps(payloads.get()).encode()
+        request = urllib.request.Request(
+            settings.TRACE_OTLP_ENDPOINT, data=body, headers={"Content-Type": "application/json"}
+        )
+        try:
+            urllib.request.urlopen(request, timeout=5).close()
+        except OSError:
+            pass
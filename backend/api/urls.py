@@ -1,6 +1,8 @@
+from django.conf import settings
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
+from . import async_views
 from .views import AuthViewSet, GameViewSet, RoomViewSet
 
 router = DefaultRouter()
@@ -8,6 +10,20 @@ router.register("auth", AuthViewSet, basename="auth")
 router.register("games", GameViewSet, basename="game")
 router.register("rooms", RoomViewSet, basename="room")
 
-urlpatterns = [
+urlpatterns = []
+
+if settings.ASYNC_READ_VIEWS:
+    # Shadow the DRF routes for the hot read/presence paths, and the long-poll
+    # (`RoomViewSet.wait` holds a worker thread), with native async views.
+    urlpatterns += [
+        path("rooms/<str:code>/wait/", async_views.room_wait, name="room-wait"),
+        path("games/", async_views.game_list, name="game-list-async"),
+        path("rooms/<str:code>/", async_views.room_detail, name="room-detail-async"),
+        path("rooms/<str:code>/players/", async_views.room_players, name="room-players-async"),
+        path("rooms/<str:code>/heartbeat/", async_views.room_heartbeat, name="room-heartbeat-async"),
+        path("rooms/<str:code>/tv_ping/", async_views.room_tv_ping, name="room-tv-ping-async"),
+    ]
+
+urlpatterns += [
     path("", include(router.urls)),
 ]
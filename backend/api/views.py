@@ -1,12 +1,28 @@
 from datetime import timedelta
-import secrets
-
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.db.models.fields.json import KeyTransform
+from django.http import Http404, StreamingHttpResponse
 from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
 from rest_framework import mixins, permissions, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.authtoken.models import Token
 from rest_framework.response import Response
-
-from .models import Game, Player, Room
+from rest_framework.settings import api_settings
+
+from . import catalog, fieldsets, polling, presence, results, tracing
+from . import rng as room_rng
+from .actors import room_serialized
+from .models import Game, Player, Room, UserGameStats
+from .pagination import KeysetPagination, LeaderboardPagination
+from .renderers import ROOM_RENDERER_CLASSES, EventStreamRenderer
 from .serializers import (
     ChangeGameSerializer,
     GameSerializer,
@@ -14,13 +30,18 @@ from .serializers import (
     RegisterSerializer,
     HeartbeatSerializer,
     JoinRoomSerializer,
+    PlayerAckSerializer,
     PlayerSerializer,
     PlayerStateSerializer,
+    RoomHistorySerializer,
+    LeaderboardEntrySerializer,
+    UserGameStatsSerializer,
     PasswordChangeSerializer,
     ProfileUpdateSerializer,
     ReadMyMindModeSerializer,
     ReadMyMindPlaySerializer,
     ConfinamentoGuessSerializer,
+    BatchSerializer,
     BelezaGuessSerializer,
     FutureSugorokuMoveSerializer,
     FutureSugorokuUnlockSerializer,
@@ -35,6 +56,7 @@ from .serializers import (
     RoomSerializer,
     UserSerializer,
 )
+from .streams import aroom_events, room_events
 
 READ_MY_MIND_SLUG = "read-my-mind"
 READ_MY_MIND_MIN = 1
@@ -71,19 +93,30 @@ BLEF_JACK_RANKS = list(range(1, 15))
 BLEF_JACK_SUITS = ["hearts", "diamonds", "clubs", "spades"]
 BLEF_JACK_DECK_SIZE = len(BLEF_JACK_RANKS) * len(BLEF_JACK_SUITS)
 
+GAME_LIST_MAX_AGE = 300
+
 
 def _room_state(room: Room) -> dict:
     return room.state or {}
 
 
+@tracing.traced
 def _set_room_state(room: Room, state: dict) -> None:
-    room.state = state
     room.last_activity_at = timezone.now()
+    if results.needs_recording(room, state):
+        # Every game-ending path saves its final state through here.
+        with transaction.atomic():
+            results.record(room, state, ended_at=room.last_activity_at)
+            room.state = state
+            room.save(update_fields=["state", "last_activity_at"])
+        return
+    room.state = state
     room.save(update_fields=["state", "last_activity_at"])
 
 
+@tracing.traced
 def _fresh_room(room: Room) -> Room:
-    return Room.objects.select_related("game").prefetch_related("players").get(pk=room.pk)
+    return fieldsets.room_detail_queryset().get(pk=room.pk)
 
 
 def _all_players(room: Room):
@@ -95,11 +128,16 @@ def _active_players(room: Room):
     return [player for player in players if not player.state.get("eliminated")]
 
 
-def _deal_cards(players, round_number: int) -> None:
+def _save_player_states(players) -> None:
+    """Persist `state` for all of `players` in one UPDATE, however many there are."""
+    Player.objects.bulk_update(players, ["state"])
+
+
+def _deal_cards(players, round_number: int, rng) -> None:
     if not players:
         return
     total_cards = round_number * len(players)
-    deck = secrets.SystemRandom().sample(range(READ_MY_MIND_MIN, READ_MY_MIND_MAX + 1), total_cards)
+    deck = rng.sample(range(READ_MY_MIND_MIN, READ_MY_MIND_MAX + 1), total_cards)
     index = 0
     for player in players:
         hand = deck[index : index + round_number]
@@ -108,12 +146,14 @@ def _deal_cards(players, round_number: int) -> None:
         state["hand"] = hand
         state["eliminated"] = False
         player.state = state
-        player.save(update_fields=["state"])
+    _save_player_states(players)
 
 
+@tracing.traced
 def _initialize_read_my_mind(room: Room, mode: str) -> None:
     players = list(room.players.all())
     now = timezone.now()
+    rng_state, rng = room_rng.start()
     state = {
         "game": READ_MY_MIND_SLUG,
         "mode": mode,
@@ -125,28 +165,30 @@ def _initialize_read_my_mind(room: Room, mode: str) -> None:
         "phase": "playing",
         "deadline_ts": (now + timedelta(seconds=READ_MY_MIND_TURN_SECONDS)).timestamp(),
         "last_play_ts": None,
+        "rng": rng_state,
     }
     for player in players:
         player_state = player.state or {}
         player_state["eliminated"] = False
         player.state = player_state
-        player.save(update_fields=["state"])
-    _deal_cards(players, 1)
+    # Saved by the deal.
+    _deal_cards(players, 1, rng)
     _set_room_state(room, state)
 
 
+@tracing.traced
 def _initialize_confinamento(room: Room) -> None:
     players = list(room.players.all())
     if not players:
         return
-    rng = secrets.SystemRandom()
+    rng_state, rng = room_rng.start()
     for player in players:
         player_state = player.state or {}
         player_state["eliminated"] = False
         player_state["guess"] = None
         player_state["suit"] = rng.choice(CONFINAMENTO_SUITS)
         player.state = player_state
-        player.save(update_fields=["state"])
+    _save_player_states(players)
 
     previous_valete_id = (room.state or {}).get("valete_player_id")
     eligible = players
@@ -164,10 +206,12 @@ def _initialize_confinamento(room: Room) -> None:
         "last_round_eliminated_ids": [],
         "last_round_survivor_ids": [],
         "last_round_ts": None,
+        "rng": rng_state,
     }
     _set_room_state(room, state)
 
 
+@tracing.traced
 def _resolve_confinamento(room: Room, force: bool = False) -> dict:
     state = _room_state(room)
     if room.status != Room.STATUS_LIVE:
@@ -181,8 +225,9 @@ def _resolve_confinamento(room: Room, force: bool = False) -> dict:
         if any(player.state.get("guess") is None for player in active_players):
             return state
 
+    round_players = active_players
     eliminated_ids = []
-    for player in active_players:
+    for player in round_players:
         player_state = player.state or {}
         guess = player_state.get("guess")
         if guess is None or guess != player_state.get("suit"):
@@ -190,14 +235,13 @@ def _resolve_confinamento(room: Room, force: bool = False) -> dict:
             eliminated_ids.append(player.id)
         player_state["guess"] = None
         player.state = player_state
-        player.save(update_fields=["state"])
 
-    survivor_ids = [player.id for player in active_players if player.id not in eliminated_ids]
+    survivor_ids = [player.id for player in round_players if player.id not in eliminated_ids]
     state["last_round_eliminated_ids"] = eliminated_ids
     state["last_round_survivor_ids"] = survivor_ids
     state["last_round_ts"] = timezone.now().timestamp()
 
-    active_players = _active_players(room)
+    active_players = [player for player in round_players if not player.state.get("eliminated")]
     valete_id = state.get("valete_player_id")
     valete_eliminated = not any(player.id == valete_id for player in active_players)
 
@@ -214,14 +258,14 @@ def _resolve_confinamento(room: Room, force: bool = False) -> dict:
             state["round"] = (state.get("round") or 1) + 1
 
     if room.status == Room.STATUS_LIVE:
-        rng = secrets.SystemRandom()
-        for player in _active_players(room):
+        rng = room_rng.for_state(state)
+        for player in active_players:
             player_state = player.state or {}
             player_state["suit"] = rng.choice(CONFINAMENTO_SUITS)
             player_state["guess"] = None
             player.state = player_state
-            player.save(update_fields=["state"])
         state["valete_knows_self"] = rng.random() < 0.5
+    _save_player_states(round_players)
 
     state["deadline_ts"] = (timezone.now() + timedelta(seconds=CONFINAMENTO_TURN_SECONDS)).timestamp()
     return state
@@ -241,6 +285,7 @@ def _apply_beleza_timeout(room: Room) -> dict:
     return _tick_beleza(room)
 
 
+@tracing.traced
 def _tick_beleza(room: Room) -> dict:
     state = _room_state(room)
     phase = state.get("phase", "guess")
@@ -268,9 +313,12 @@ def _tick_beleza(room: Room) -> dict:
     return state
 
 
+def _in_sugoroku(player) -> bool:
+    return not player.state.get("eliminated") and not player.state.get("cleared")
+
+
 def _active_sugoroku_players(room: Room):
-    players = _all_players(room)
-    return [player for player in players if not player.state.get("eliminated") and not player.state.get("cleared")]
+    return [player for player in _all_players(room) if _in_sugoroku(player)]
 
 
 def _active_generic_players(room: Room):
@@ -300,10 +348,9 @@ def _blef_hand_value(cards, rank_count: int, use_full_deck: bool):
     return total
 
 
-def _deal_blef_cards(players):
+def _deal_blef_cards(players, rng):
     if not players:
         return
-    rng = secrets.SystemRandom()
     total_cards = len(players) * 2
     deck = rng.sample(range(BLEF_JACK_DECK_SIZE), total_cards)
     index = 0
@@ -314,9 +361,10 @@ def _deal_blef_cards(players):
         player_state["cards"] = hand
         player_state["guess_winner_id"] = None
         player.state = player_state
-        player.save(update_fields=["state"])
+    _save_player_states(players)
 
 
+@tracing.traced
 def _initialize_blef_jack(room: Room) -> None:
     players = _active_generic_players(room)
     for player in players:
@@ -324,8 +372,9 @@ def _initialize_blef_jack(room: Room) -> None:
         player_state["eliminated"] = False
         player_state["points"] = player_state.get("points", BLEF_JACK_START_POINTS)
         player.state = player_state
-        player.save(update_fields=["state"])
-    _deal_blef_cards(players)
+    rng_state, rng = room_rng.start()
+    # Saved by the deal.
+    _deal_blef_cards(players, rng)
     state = {
         "game": BLEF_JACK_SLUG,
         "round": 1,
@@ -333,6 +382,7 @@ def _initialize_blef_jack(room: Room) -> None:
         "winners": [],
         "deck_size": BLEF_JACK_DECK_SIZE,
         "rank_count": len(BLEF_JACK_RANKS),
+        "rng": rng_state,
     }
     _set_room_state(room, state)
 
@@ -352,7 +402,7 @@ def _blef_start_next_round(room: Room, state: dict) -> dict:
     state["winners"] = []
     state["deck_size"] = BLEF_JACK_DECK_SIZE
     state["rank_count"] = len(BLEF_JACK_RANKS)
-    _deal_blef_cards(active_players)
+    _deal_blef_cards(active_players, room_rng.for_state(state))
     return state
 
 
@@ -389,7 +439,7 @@ def _blef_resolve_round(room: Room, state: dict) -> dict:
                 delta -= 4
         player_state["points"] = player_state.get("points", 0) + delta
         player.state = player_state
-        player.save(update_fields=["state"])
+    _save_player_states(players)
     return _blef_start_next_round(room, state)
 
 
@@ -419,8 +469,9 @@ def _in_bounds(coord):
     return 0 <= x < SUGOROKU_SIZE and 0 <= y < SUGOROKU_SIZE
 
 
+@tracing.traced
 def _initialize_sugoroku(room: Room) -> None:
-    rng = secrets.SystemRandom()
+    rng_state, rng = room_rng.start()
     exit_coord = (rng.randrange(SUGOROKU_SIZE), rng.randrange(SUGOROKU_SIZE))
     if exit_coord == (0, 0):
         exit_coord = (SUGOROKU_SIZE - 1, SUGOROKU_SIZE - 1)
@@ -432,7 +483,8 @@ def _initialize_sugoroku(room: Room) -> None:
             continue
         penalties[_coord_key(coord)] = rng.choice([1, 2, 3])
 
-    for player in room.players.all():
+    players = list(room.players.all())
+    for player in players:
         player_state = player.state or {}
         player_state.update(
             {
@@ -446,7 +498,7 @@ def _initialize_sugoroku(room: Room) -> None:
             }
         )
         player.state = player_state
-        player.save(update_fields=["state"])
+    _save_player_states(players)
 
     state = {
         "game": SUGOROKU_SLUG,
@@ -461,13 +513,14 @@ def _initialize_sugoroku(room: Room) -> None:
         "winners": [],
         "losers": [],
         "deadline_ts": None,
+        "rng": rng_state,
     }
     _set_room_state(room, state)
 
 
 def _roll_sugoroku(room: Room) -> dict:
     state = _room_state(room)
-    rng = secrets.SystemRandom()
+    rng = room_rng.for_state(state)
     dice = {}
     players = _active_sugoroku_players(room)
     rooms_with_players = {}
@@ -487,6 +540,7 @@ def _roll_sugoroku(room: Room) -> dict:
     return state
 
 
+@tracing.traced
 def _resolve_sugoroku(room: Room) -> dict:
     state = _room_state(room)
     dice = state.get("dice") or {}
@@ -496,7 +550,9 @@ def _resolve_sugoroku(room: Room) -> dict:
     locked_rooms = state.get("locked_rooms") or {}
     penalty_entries = {}
 
-    players = _active_sugoroku_players(room)
+    # One load for the whole turn; every change is saved together at the end.
+    all_players = _all_players(room)
+    players = [player for player in all_players if _in_sugoroku(player)]
     rooms_with_players = {}
     for player in players:
         pos = player.state.get("position") or [0, 0]
@@ -544,7 +600,6 @@ def _resolve_sugoroku(room: Room) -> dict:
                 player_state["can_back"] = False
                 player_state["choice"] = None
                 player.state = player_state
-                player.save(update_fields=["state"])
                 target_key = _coord_key(target)
                 if target_key in state.get("penalties", {}):
                     penalty_entries.setdefault(target_key, []).append(player.id)
@@ -556,7 +611,6 @@ def _resolve_sugoroku(room: Room) -> dict:
                     player_state["locked"] = True
                     player_state["choice"] = None
                     player.state = player_state
-                    player.save(update_fields=["state"])
 
         # Stay players (by choice or locked)
         for player in stay_players:
@@ -568,7 +622,6 @@ def _resolve_sugoroku(room: Room) -> dict:
                 player_state["can_back"] = True
             player_state["choice"] = None
             player.state = player_state
-            player.save(update_fields=["state"])
 
         for player in back_players:
             player_state = player.state or {}
@@ -583,7 +636,6 @@ def _resolve_sugoroku(room: Room) -> dict:
                 player_state["can_back"] = True
             player_state["choice"] = None
             player.state = player_state
-            player.save(update_fields=["state"])
 
         locked_rooms[key] = {"unlockers": []}
 
@@ -594,7 +646,7 @@ def _resolve_sugoroku(room: Room) -> dict:
     losers = state.get("losers", [])
     exit_coord = state.get("exit")
 
-    for player in room.players.all():
+    for player in all_players:
         player_state = player.state or {}
         if player_state.get("eliminated") or player_state.get("cleared"):
             continue
@@ -617,23 +669,21 @@ def _resolve_sugoroku(room: Room) -> dict:
             player_state["eliminated"] = True
             losers.append(player.id)
         player.state = player_state
-        player.save(update_fields=["state"])
 
     state["winners"] = list(dict.fromkeys(winners))
     state["losers"] = list(dict.fromkeys(losers))
     # Auto-apply penalties if only one player is in that room.
+    players_by_id = {player.id: player for player in all_players}
     for key, info in list(pending.items()):
         player_ids = info.get("player_ids", [])
         if len(player_ids) == 1:
-            try:
-                target = room.players.get(id=player_ids[0])
-                target_state = target.state or {}
-                target_state["points"] = target_state.get("points", SUGOROKU_START_POINTS) - info.get("amount", 0)
-                target.state = target_state
-                target.save(update_fields=["state"])
-                pending.pop(key, None)
-            except Player.DoesNotExist:
+            target = players_by_id.get(player_ids[0])
+            if target is None:
                 continue
+            target_state = target.state or {}
+            target_state["points"] = target_state.get("points", SUGOROKU_START_POINTS) - info.get("amount", 0)
+            target.state = target_state
+            pending.pop(key, None)
 
     state["locked_rooms"] = locked_rooms
     state["pending_penalties"] = pending
@@ -643,23 +693,24 @@ def _resolve_sugoroku(room: Room) -> dict:
 
     state["turn"] = state.get("turn", 1) + 1
     if state["turn"] > state.get("max_turns", SUGOROKU_TURNS):
-        for player in _active_sugoroku_players(room):
+        for player in [player for player in all_players if _in_sugoroku(player)]:
             player_state = player.state or {}
             player_state["eliminated"] = True
             player.state = player_state
-            player.save(update_fields=["state"])
             if player.id not in state["losers"]:
                 state["losers"].append(player.id)
         room.status = Room.STATUS_ENDED
         room.save(update_fields=["status"])
 
-    if not _active_sugoroku_players(room):
+    _save_player_states(all_players)
+    if not any(_in_sugoroku(player) for player in all_players):
         room.status = Room.STATUS_ENDED
         room.save(update_fields=["status"])
 
     return state
 
 
+@tracing.traced
 def _tick_sugoroku(room: Room) -> dict:
     state = _room_state(room)
     deadline_ts = state.get("deadline_ts")
@@ -678,9 +729,11 @@ def _tick_sugoroku(room: Room) -> dict:
     return _resolve_sugoroku(room)
 
 
+@tracing.traced
 def _initialize_leilao(room: Room) -> None:
-    rng = secrets.SystemRandom()
-    for player in room.players.all():
+    rng_state, rng = room_rng.start()
+    players = list(room.players.all())
+    for player in players:
         player_state = player.state or {}
         player_state["eliminated"] = False
         player_state["points"] = rng.randint(100, 200)
@@ -688,7 +741,7 @@ def _initialize_leilao(room: Room) -> None:
         player_state["submitted"] = False
         player_state["won"] = 0
         player.state = player_state
-        player.save(update_fields=["state"])
+    _save_player_states(players)
 
     state = {
         "game": LEILAO_SLUG,
@@ -705,10 +758,12 @@ def _initialize_leilao(room: Room) -> None:
         "sudden_death": False,
         "tie_players": [],
         "round_bid_total": 0,
+        "rng": rng_state,
     }
     _set_room_state(room, state)
 
 
+@tracing.traced
 def _resolve_leilao(room: Room, force: bool = False) -> dict:
     state = _room_state(room)
     if room.status != Room.STATUS_LIVE:
@@ -751,7 +806,7 @@ def _resolve_leilao(room: Room, force: bool = False) -> dict:
         player_state["bid"] = 0
         player_state["submitted"] = False
         player.state = player_state
-        player.save(update_fields=["state"])
+    _save_player_states(active_players)
     state["losers"] = list(dict.fromkeys(losers))
 
     new_carry = max(0, state.get("round_bid_total", 0) - LEILAO_BASE_POT)
@@ -805,7 +860,7 @@ def _resolve_leilao(room: Room, force: bool = False) -> dict:
             player_state = player.state or {}
             player_state["eliminated"] = True
             player.state = player_state
-            player.save(update_fields=["state"])
+        _save_player_states(ranked[2:])
         state["losers"] = list(dict.fromkeys([player.id for player in ranked[2:]] + state.get("losers", [])))
         state["round"] = state.get("max_rounds", LEILAO_ROUNDS)
 
@@ -828,7 +883,7 @@ def _resolve_leilao(room: Room, force: bool = False) -> dict:
             player_state["bid"] = 0
             player_state["submitted"] = False
             player.state = player_state
-            player.save(update_fields=["state"])
+        _save_player_states(top_two)
         state["deadline_ts"] = timezone.now().timestamp() + LEILAO_BID_SECONDS
         return state
     else:
@@ -842,6 +897,7 @@ def _resolve_leilao(room: Room, force: bool = False) -> dict:
     return state
 
 
+@tracing.traced
 def _tick_leilao(room: Room) -> dict:
     state = _room_state(room)
     deadline_ts = state.get("deadline_ts")
@@ -851,6 +907,7 @@ def _tick_leilao(room: Room) -> dict:
     return _resolve_leilao(room, force=False)
 
 
+@tracing.traced
 def _initialize_beleza(room: Room) -> None:
     players = list(room.players.all())
     for player in players:
@@ -859,7 +916,7 @@ def _initialize_beleza(room: Room) -> None:
         player_state["score"] = 0
         player_state["guess"] = None
         player.state = player_state
-        player.save(update_fields=["state"])
+    _save_player_states(players)
 
     state = {
         "game": BELEZA_SLUG,
@@ -876,6 +933,7 @@ def _initialize_beleza(room: Room) -> None:
     _set_room_state(room, state)
 
 
+@tracing.traced
 def _resolve_beleza(room: Room, force: bool = False) -> dict:
     state = _room_state(room)
     if room.status != Room.STATUS_LIVE:
@@ -948,7 +1006,6 @@ def _resolve_beleza(room: Room, force: bool = False) -> dict:
         if player in winners:
             player_state["guess"] = None
             player.state = player_state
-            player.save(update_fields=["state"])
             continue
         if zero_hundred_rule and zero_present and guesses[player.id] == 0:
             player_state["score"] = player_state.get("score", 0) + penalty
@@ -957,7 +1014,6 @@ def _resolve_beleza(room: Room, force: bool = False) -> dict:
                 state["eliminations"] = state.get("eliminations", 0) + 1
             player_state["guess"] = None
             player.state = player_state
-            player.save(update_fields=["state"])
             continue
         player_state["score"] = player_state.get("score", 0) + penalty
         if player_state["score"] <= BELEZA_THRESHOLD:
@@ -965,9 +1021,9 @@ def _resolve_beleza(room: Room, force: bool = False) -> dict:
             state["eliminations"] = state.get("eliminations", 0) + 1
         player_state["guess"] = None
         player.state = player_state
-        player.save(update_fields=["state"])
+    _save_player_states(active_players)
 
-    active_players = _active_players(room)
+    active_players = [player for player in active_players if not player.state.get("eliminated")]
     if any_loss:
         state["no_loss_streak"] = 0
     else:
@@ -1005,7 +1061,7 @@ def _apply_timeout(room: Room) -> dict:
         state["played"] = []
         state["last_cut_player_id"] = None
         state["last_cutter_player_id"] = None
-        _deal_cards(_active_players(room), round_number)
+        _deal_cards(_active_players(room), round_number, room_rng.for_state(state))
         state["deadline_ts"] = (timezone.now() + timedelta(seconds=READ_MY_MIND_TURN_SECONDS)).timestamp()
         return state
 
@@ -1026,7 +1082,7 @@ def _apply_timeout(room: Room) -> dict:
             room.status = Room.STATUS_ENDED
             room.save(update_fields=["status"])
     else:
-        eliminated = secrets.choice(players)
+        eliminated = room_rng.for_state(state).choice(players)
         eliminated_state = eliminated.state or {}
         eliminated_state["eliminated"] = True
         eliminated_state["hand"] = []
@@ -1139,14 +1195,36 @@ def _apply_play(room: Room, player, card: int) -> dict:
     return state
 
 
+def conditional_game_list(request, response, data):
+    etag = quote_etag(hashlib.sha1(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest())
+    response["ETag"] = etag
+    patch_cache_control(response, public=True, max_age=GAME_LIST_MAX_AGE)
+    return get_conditional_response(request, etag=etag, response=response)
+
+
 class GameViewSet(viewsets.ModelViewSet):
     queryset = Game.objects.filter(is_active=True)
     serializer_class = GameSerializer
     http_method_names = ["get", "post", "head", "options"]
+    replica_read_actions = {"list", "retrieve", "leaderboard"}
+
+    def list(self, request, *args, **kwargs):
+        data = self.get_serializer(catalog.active_games(), many=True).data
+        return conditional_game_list(request, Response(data), data)
+
+    @action(detail=True, methods=["get"])
+    def leaderboard(self, request, pk=None):
+        """Most wins first (then points): GET /games/{id}/leaderboard/?limit=N&cursor=..."""
+        game = self.get_object()
+        stats = UserGameStats.objects.filter(game=game).select_related("user__profile")
+        paginator = LeaderboardPagination()
+        page = paginator.paginate_queryset(stats, request, view=self)
+        return paginator.get_paginated_response(LeaderboardEntrySerializer(page, many=True).data)
 
 
 class AuthViewSet(viewsets.ViewSet):
     permission_classes = [permissions.AllowAny]
+    replica_read_actions = {"me", "history", "stats"}
 
     @action(detail=False, methods=["post"])
     def register(self, request):
@@ -1165,10 +1243,39 @@ class AuthViewSet(viewsets.ViewSet):
         result = serializer.save()
         return Response({"token": result["token"].key, "user": UserSerializer(result["user"]).data})
 
+    @action(detail=False, methods=["post"], permission_classes=[permissions.IsAuthenticated])
+    def logout(self, request):
+        Token.objects.filter(user=request.user).delete()
+        return Response({"ok": True})
+
     @action(detail=False, methods=["get"], permission_classes=[permissions.IsAuthenticated])
     def me(self, request):
         return Response({"user": UserSerializer(request.user).data})
 
+    @action(detail=False, methods=["get"], permission_classes=[permissions.IsAuthenticated])
+    def history(self, request):
+        """Rooms the user joined, newest first: GET /auth/history/?limit=N&cursor=..."""
+        players = (
+            Player.objects.filter(user=request.user)
+            .select_related("room__game")
+            .only("id", "name", "is_host", "joined_at", "room__code", "room__status", "room__game__slug", "room__game__name")
+            .annotate(room_winners=KeyTransform("winners", "room__state"))
+        )
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(players, request, view=self)
+        return paginator.get_paginated_response(RoomHistorySerializer(page, many=True).data)
+
+    @action(detail=False, methods=["get"], permission_classes=[permissions.IsAuthenticated])
+    def stats(self, request):
+        stats = UserGameStats.objects.filter(user=request.user).select_related("game").order_by("game__name")
+        data = UserGameStatsSerializer(stats, many=True).data
+        totals = {
+            "played": sum(row["played"] for row in data),
+            "wins": sum(row["wins"] for row in data),
+            "points": sum(row["points"] for row in data),
+        }
+        return Response({"totals": totals, "games": data})
+
     @action(detail=False, methods=["put"], permission_classes=[permissions.IsAuthenticated])
     def profile(self, request):
         serializer = ProfileUpdateSerializer(data=request.data, context={"request": request})
@@ -1187,7 +1294,22 @@ class AuthViewSet(viewsets.ViewSet):
 class RoomViewSet(mixins.CreateModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet):
     queryset = Room.objects.select_related("game").prefetch_related("players")
     serializer_class = RoomSerializer
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, *ROOM_RENDERER_CLASSES]
     lookup_field = "code"
+    replica_read_actions = {"retrieve", "players"}
+    # Room columns loaded by actions that only touch a few fields; these skip the
+    # player prefetch and the `state` blob. `code` and `version` stay loaded
+    # because `Room.save()` reads them.
+    light_action_fields = {
+        "join": ("code", "version", "last_activity_at"),
+        "heartbeat": ("code", "version", "last_activity_at"),
+        "ready": ("code", "version", "last_activity_at"),
+        "state": ("code", "version", "last_activity_at"),
+        "end": ("code", "version", "status", "state"),
+        "tv_ping": ("code", "version", "tv_last_seen_at", "tv_device_id"),
+        "stream": ("code",),
+        "sugoroku_move": ("code", "version", "status", "last_activity_at", "game__slug"),
+    }
 
     def get_permissions(self):
         open_actions = {
@@ -1203,12 +1325,14 @@ class RoomViewSet(mixins.CreateModelMixin, mixins.RetrieveModelMixin, viewsets.G
             "sugoroku_tick",
             "leilao_tick",
             "tv_ping",
+            "stream",
         }
         if self.action in open_actions:
             return [permissions.AllowAny()]
         if self.action in {
             "join",
             "heartbeat",
+            "batch",
             "ready",
             "state",
             "read_my_mind_play",
@@ -1225,6 +1349,31 @@ class RoomViewSet(mixins.CreateModelMixin, mixins.RetrieveModelMixin, viewsets.G
             return [permissions.IsAuthenticated()]
         return [permissions.AllowAny()]
 
+    def get_queryset(self):
+        fields = self.light_action_fields.get(self.action)
+        if fields is not None:
+            queryset = Room.objects.only(*fields)
+            if any(field.startswith("game__") for field in fields):
+                queryset = queryset.select_related("game")
+            return queryset
+        if self.action in ("retrieve", "wait"):
+            return fieldsets.room_detail_queryset(*self.requested_fieldsets())
+        if self.action == "batch":
+            return fieldsets.room_detail_queryset()
+        if self.action == "players":
+            return Room.objects.select_related("game")
+        return super().get_queryset()
+
+    def requested_fieldsets(self):
+        if self.action not in ("retrieve", "wait"):
+            return None, None
+        return fieldsets.requested_fieldsets(self.request.query_params)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["fields"], context["player_fields"] = self.requested_fieldsets()
+        return context
+
     def get_serializer_class(self):
         if self.action == "create":
             return RoomCreateSerializer
@@ -1264,6 +1413,28 @@ class RoomViewSet(mixins.CreateModelMixin, mixins.RetrieveModelMixin, viewsets.G
             return BlefJackGuessSerializer
         return RoomSerializer
 
+    def action_ack(self, room, player=None, **extra):
+        """Small versioned ack for a room action; `?snapshot=full` returns the full room instead.
+
+        Engine helpers save the room through the instance they are given, so its
+        `version` and `status` are current. Pass `player` only when the action
+        holds an up-to-date instance; otherwise the caller's player is re-read.
+        """
+        if self.request.query_params.get("snapshot") == "full":
+            room = _fresh_room(room)
+            return Response(RoomDetailSerializer(room, context=self.get_serializer_context()).data)
+        if player is None and self.request.user.is_authenticated:
+            player = (
+                Player.objects.filter(room_id=room.pk, user=self.request.user)
+                .only("id", "user_id", "ready", "state")
+                .first()
+            )
+        player_data = None
+        if player is not None:
+            player.room = room
+            player_data = PlayerAckSerializer(player, context=self.get_serializer_context()).data
+        return Response({"ok": True, "version": room.version, "status": room.status, "player": player_data, **extra})
+
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -1274,17 +1445,33 @@ class RoomViewSet(mixins.CreateModelMixin, mixins.RetrieveModelMixin, viewsets.G
     def retrieve(self, request, *args, **kwargs):
         room = self.get_object()
         if request.user.is_authenticated:
-            try:
-                player = room.players.get(user=request.user)
-            except Player.DoesNotExist:
-                player = None
+            player = next((player for player in room.players.all() if player.user_id == request.user.id), None)
             if player:
                 player.last_seen_at = timezone.now()
                 player.save(update_fields=["last_seen_at"])
         serializer = RoomDetailSerializer(room, context=self.get_serializer_context())
         return Response(serializer.data)
 
+    @action(detail=True, methods=["get"])
+    def wait(self, request, code=None):
+        """Long-poll under WSGI, with the params and responses of `async_views.room_wait`.
+
+        Holds this worker thread while it waits, so the timeout is capped at
+        `WAIT_WSGI_MAX_SECONDS`.
+        """
+        self.requested_fieldsets()  # Reject bad fieldsets before waiting.
+        since = polling.wait_since(request.query_params)
+        timeout = polling.wait_timeout(request.query_params.get("timeout"), settings.WAIT_WSGI_MAX_SECONDS)
+        version = polling.wait_for_version(code, since, timeout)
+        if version is None:
+            raise Http404
+        if since is not None and version == since:
+            return Response({"changed": False, "version": version})
+        data = self.retrieve(request, code=code).data
+        return Response({"changed": True, "version": data.get("version", version), "room": data})
+
     @action(detail=True, methods=["post"])
+    @room_serialized
     def join(self, request, code=None):
         room = self.get_object()
         serializer = self.get_serializer(data=request.data, context={"room": room, "request": request})
@@ -1305,12 +1492,15 @@ class RoomViewSet(mixins.CreateModelMixin, mixins.RetrieveModelMixin, viewsets.G
     @action(detail=True, methods=["post"])
     def heartbeat(self, request, code=None):
         room = self.get_object()
-        serializer = self.get_serializer(data=request.data, context={"room": room, "request": request})
+        serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        player = serializer.save()
-        return Response({"ok": True, "player_id": player.id})
+        player_id = serializer.validated_data["player_id"]
+        if not presence.record_heartbeat(room.id, player_id, request.user):
+            return Response({"detail": "Player not in room."}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({"ok": True, "player_id": player_id})
 
     @action(detail=True, methods=["post"])
+    @room_serialized
     def start(self, request, code=None):
         room = self.get_object()
         if room.players.exists() and room.players.filter(ready=False).exists():
@@ -1338,31 +1528,36 @@ class RoomViewSet(mixins.CreateModelMixin, mixins.RetrieveModelMixin, viewsets.G
         if room.game.slug == BLEF_JACK_SLUG:
             _initialize_blef_jack(room)
         room.status = Room.STATUS_LIVE
-        room.save(update_fields=["status"])
-        room = _fresh_room(room)
-        return Response(RoomDetailSerializer(room, context=self.get_serializer_context()).data)
+        room.game_number += 1
+        room.save(update_fields=["status", "game_number"])
+        return self.action_ack(room)
 
     @action(detail=True, methods=["post"])
+    @room_serialized
     def end(self, request, code=None):
         room = self.get_object()
         room.status = Room.STATUS_ENDED
-        room.save(update_fields=["status"])
+        # A game the host stops has no result to count; ended games are recorded once.
+        room.state = {**_room_state(room), results.RECORDED_KEY: True}
+        room.save(update_fields=["status", "state"])
         return Response({"status": room.status})
 
     @action(detail=True, methods=["post"])
+    @room_serialized
     def change_game(self, request, code=None):
         room = self.get_object()
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         game = serializer.validated_data["game"]
+        room.players.update(ready=True, state={})
         room.game = game
         room.status = Room.STATUS_LOBBY
         room.state = {}
         room.save(update_fields=["game", "status", "state"])
-        room.players.update(ready=True, state={})
-        return Response(RoomDetailSerializer(room, context=self.get_serializer_context()).data)
+        return self.action_ack(room)
 
     @action(detail=True, methods=["post"], permission_classes=[permissions.IsAuthenticated])
+    @room_serialized
     def restart(self, request, code=None):
         room = self.get_object()
         try:
@@ -1371,14 +1566,14 @@ class RoomViewSet(mixins.CreateModelMixin, mixins.RetrieveModelMixin, viewsets.G
             return Response({"detail": "Player not in room."}, status=status.HTTP_400_BAD_REQUEST)
         if not player.is_host:
             return Response({"detail": "Only host can restart."}, status=status.HTTP_403_FORBIDDEN)
+        room.players.update(ready=True, state={})
         room.status = Room.STATUS_LOBBY
         room.state = {}
         room.save(update_fields=["status", "state"])
-        room.players.update(ready=True, state={})
-        room = _fresh_room(room)
-        return Response(RoomDetailSerializer(room, context=self.get_serializer_context()).data)
+        return self.action_ack(room)
 
     @action(detail=True, methods=["post"])
+    @room_serialized
     def ready(self, request, code=None):
         room = self.get_object()
         serializer = self.get_serializer(data=request.data, context={"room": room, "request": request})
@@ -1387,6 +1582,7 @@ class RoomViewSet(mixins.CreateModelMixin, mixins.RetrieveModelMixin, viewsets.G
         return Response({"player_id": player.id, "ready": player.ready})
 
     @action(detail=True, methods=["post"])
+    @room_serialized
     def state(self, request, code=None):
         room = self.get_object()
         serializer = self.get_serializer(data=request.data, context={"room": room, "request": request})
@@ -1394,27 +1590,105 @@ class RoomViewSet(mixins.CreateModelMixin, mixins.RetrieveModelMixin, viewsets.G
         player = serializer.save()
         return Response({"player_id": player.id, "state": player.state})
 
+    @action(detail=True, methods=["post"])
+    @room_serialized
+    def batch(self, request, code=None):
+        """Run the caller's ordered `ops` against one room load, in one transaction.
+
+        Body: `{"ops": [{"op": "heartbeat"}, {"op": "ready", "data": {"ready": true}}, {"op": "retrieve"}]}`.
+        Each result has the shape of the matching single endpoint. Writes are
+        applied to the loaded player and flushed before a `retrieve`, so the
+        snapshot includes them.
+        """
+        batch = BatchSerializer(data=request.data)
+        batch.is_valid(raise_exception=True)
+        room = self.get_object()
+        player = next((player for player in room.players.all() if player.user_id == request.user.id), None)
+        if player is None:
+            return Response({"detail": "Player not in room."}, status=status.HTTP_400_BAD_REQUEST)
+
+        player_fields = set()
+        room_changed = False
+
+        def flush():
+            nonlocal room_changed
+            player.last_seen_at = timezone.now()
+            player.save(update_fields=["last_seen_at", *sorted(player_fields)])
+            player_fields.clear()
+            if room_changed:
+                room.touch()
+            else:
+                room.last_activity_at = player.last_seen_at
+                room.save(update_fields=["last_activity_at"])
+            room_changed = False
+
+        op_results = []
+        pending = False
+        with transaction.atomic():
+            for index, operation in enumerate(batch.validated_data["ops"]):
+                op, data = operation["op"], operation["data"]
+                if op == "retrieve":
+                    flush()
+                    pending = False
+                    op_results.append(RoomDetailSerializer(room, context=self.get_serializer_context()).data)
+                    continue
+                pending = True
+                if op == "heartbeat":
+                    op_results.append({"ok": True, "player_id": player.id})
+                elif op == "ready":
+                    player.ready = self.validate_batch_op(index, ReadySerializer, data)["ready"]
+                    player_fields.add("ready")
+                    room_changed = True
+                    op_results.append({"player_id": player.id, "ready": player.ready})
+                elif op == "state":
+                    player.state = self.validate_batch_op(index, PlayerStateSerializer, data)["state"]
+                    player_fields.add("state")
+                    room_changed = True
+                    op_results.append({"player_id": player.id, "state": player.state})
+            if pending:
+                flush()
+        return Response({"results": op_results})
+
+    def validate_batch_op(self, index, serializer_class, data):
+        serializer = serializer_class(data=data)
+        if not serializer.is_valid():
+            raise ValidationError({"ops": {str(index): serializer.errors}})
+        return serializer.validated_data
+
     @action(detail=True, methods=["get"])
     def players(self, request, code=None):
         room = self.get_object()
-        players = room.players.all()
+        players = room.players.select_related("user__profile")
         data = PlayerSerializer(players, many=True, context=self.get_serializer_context()).data
         return Response({"players": data})
 
     @action(detail=True, methods=["post"])
     def tv_ping(self, request, code=None):
         room = self.get_object()
-        device_id = (request.data.get("device_id") or "").strip()
-        now = timezone.now()
-        room.tv_last_seen_at = now
-        update_fields = ["tv_last_seen_at"]
-        if device_id:
-            room.tv_device_id = device_id
-            update_fields.append("tv_device_id")
-        room.save(update_fields=update_fields)
-        return Response({"ok": True, "tv_connected": True, "tv_last_seen_at": room.tv_last_seen_at})
+        ack = presence.record_tv_ping(room.code, request.data.get("device_id"))
+        if ack is None:
+            raise Http404
+        return Response(ack)
+
+    @action(detail=True, methods=["get"], renderer_classes=[EventStreamRenderer])
+    def stream(self, request, code=None):
+        room = self.get_object()
+        device_id = (request.query_params.get("device_id") or "").strip()[:120]
+        if isinstance(request._request, ASGIRequest):
+            events = aroom_events(room.pk, device_id)
+        elif settings.STREAM_WSGI_MAX_SECONDS > 0:
+            # Holds this worker thread until the stream ends (see `room_events`).
+            events = room_events(room.pk, device_id, settings.STREAM_WSGI_MAX_SECONDS)
+        else:
+            # Clients fall back to polling on this 404.
+            return Response({"detail": "Streaming requires the ASGI server."}, status=status.HTTP_404_NOT_FOUND)
+        response = StreamingHttpResponse(events, content_type="text/event-stream")
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
 
     @action(detail=True, methods=["post"])
+    @room_serialized
     def read_my_mind_mode(self, request, code=None):
         room = self.get_object()
         if room.game.slug != READ_MY_MIND_SLUG:
@@ -1425,9 +1699,10 @@ class RoomViewSet(mixins.CreateModelMixin, mixins.RetrieveModelMixin, viewsets.G
         state["game"] = READ_MY_MIND_SLUG
         state["mode"] = serializer.validated_data["mode"]
         _set_room_state(room, state)
-        return Response(RoomDetailSerializer(room, context=self.get_serializer_context()).data)
+        return self.action_ack(room)
 
     @action(detail=True, methods=["post"])
+    @room_serialized
     def read_my_mind_play(self, request, code=None):
         room = self.get_object()
         if room.game.slug != READ_MY_MIND_SLUG:
@@ -1442,37 +1717,41 @@ class RoomViewSet(mixins.CreateModelMixin, mixins.RetrieveModelMixin, viewsets.G
         room.state = state
         if room.status == Room.STATUS_ENDED:
             _set_room_state(room, state)
-            return Response(RoomDetailSerializer(room, context=self.get_serializer_context()).data)
+            return self.action_ack(room)
         try:
             state = _apply_play(room, player, serializer.validated_data["card"])
         except ValueError as exc:
             return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
         _set_room_state(room, state)
-        room = _fresh_room(room)
-        return Response(RoomDetailSerializer(room, context=self.get_serializer_context()).data)
+        return self.action_ack(room)
 
     @action(detail=True, methods=["post"])
+    @room_serialized
     def read_my_mind_tick(self, request, code=None):
         room = self.get_object()
         if room.game.slug != READ_MY_MIND_SLUG:
             return Response({"detail": "Invalid game."}, status=status.HTTP_400_BAD_REQUEST)
+        if room.status == Room.STATUS_ENDED:
+            return self.action_ack(room)
         state = _apply_timeout(room)
         _set_room_state(room, state)
-        room = _fresh_room(room)
-        return Response(RoomDetailSerializer(room, context=self.get_serializer_context()).data)
+        return self.action_ack(room)
 
     @action(detail=True, methods=["post"])
+    @room_serialized
     def confinamento_guess(self, request, code=None):
         room = self.get_object()
         if room.game.slug != CONFINAMENTO_SLUG:
             return Response({"detail": "Invalid game."}, status=status.HTTP_400_BAD_REQUEST)
+        if room.status == Room.STATUS_ENDED:
+            return self.action_ack(room)
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         state = _apply_confinamento_timeout(room)
         room.state = state
         if room.status == Room.STATUS_ENDED:
             _set_room_state(room, state)
-            return Response(RoomDetailSerializer(room, context=self.get_serializer_context()).data)
+            return self.action_ack(room)
         try:
             player = room.players.get(user=request.user)
         except Player.DoesNotExist:
@@ -1485,29 +1764,35 @@ class RoomViewSet(mixins.CreateModelMixin, mixins.RetrieveModelMixin, viewsets.G
         player.save(update_fields=["state"])
         state = _resolve_confinamento(room, force=False)
         _set_room_state(room, state)
-        return Response(RoomDetailSerializer(room, context=self.get_serializer_context()).data)
+        return self.action_ack(room)
 
     @action(detail=True, methods=["post"])
+    @room_serialized
     def confinamento_tick(self, request, code=None):
         room = self.get_object()
         if room.game.slug != CONFINAMENTO_SLUG:
             return Response({"detail": "Invalid game."}, status=status.HTTP_400_BAD_REQUEST)
+        if room.status == Room.STATUS_ENDED:
+            return self.action_ack(room)
         state = _apply_confinamento_timeout(room)
         _set_room_state(room, state)
-        return Response(RoomDetailSerializer(room, context=self.get_serializer_context()).data)
+        return self.action_ack(room)
 
     @action(detail=True, methods=["post"])
+    @room_serialized
     def beleza_guess(self, request, code=None):
         room = self.get_object()
         if room.game.slug != BELEZA_SLUG:
             return Response({"detail": "Invalid game."}, status=status.HTTP_400_BAD_REQUEST)
+        if room.status == Room.STATUS_ENDED:
+            return self.action_ack(room)
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         state = _apply_beleza_timeout(room)
         room.state = state
         if room.status == Room.STATUS_ENDED:
             _set_room_state(room, state)
-            return Response(RoomDetailSerializer(room, context=self.get_serializer_context()).data)
+            return self.action_ack(room)
         try:
             player = room.players.get(user=request.user)
         except Player.DoesNotExist:
@@ -1522,27 +1807,32 @@ class RoomViewSet(mixins.CreateModelMixin, mixins.RetrieveModelMixin, viewsets.G
         player.save(update_fields=["state"])
         state = _tick_beleza(room)
         _set_room_state(room, state)
-        return Response(RoomDetailSerializer(room, context=self.get_serializer_context()).data)
+        return self.action_ack(room)
 
     @action(detail=True, methods=["post"])
+    @room_serialized
     def beleza_tick(self, request, code=None):
         room = self.get_object()
         if room.game.slug != BELEZA_SLUG:
             return Response({"detail": "Invalid game."}, status=status.HTTP_400_BAD_REQUEST)
+        if room.status == Room.STATUS_ENDED:
+            return self.action_ack(room)
         state = _tick_beleza(room)
         _set_room_state(room, state)
-        return Response(RoomDetailSerializer(room, context=self.get_serializer_context()).data)
+        return self.action_ack(room)
 
     @action(detail=True, methods=["post"])
+    @room_serialized
     def sugoroku_roll(self, request, code=None):
         room = self.get_object()
         if room.game.slug != SUGOROKU_SLUG:
             return Response({"detail": "Invalid game."}, status=status.HTTP_400_BAD_REQUEST)
         state = _roll_sugoroku(room)
         _set_room_state(room, state)
-        return Response(RoomDetailSerializer(room, context=self.get_serializer_context()).data)
+        return self.action_ack(room)
 
     @action(detail=True, methods=["post"])
+    @room_serialized
     def sugoroku_move(self, request, code=None):
         room = self.get_object()
         if room.game.slug != SUGOROKU_SLUG:
@@ -1561,9 +1851,11 @@ class RoomViewSet(mixins.CreateModelMixin, mixins.RetrieveModelMixin, viewsets.G
         player_state["choice"] = {"action": action, "direction": direction}
         player.state = player_state
         player.save(update_fields=["state"])
-        return Response({"ok": True})
+        room.touch()
+        return self.action_ack(room, player=player)
 
     @action(detail=True, methods=["post"])
+    @room_serialized
     def sugoroku_unlock(self, request, code=None):
         room = self.get_object()
         if room.game.slug != SUGOROKU_SLUG:
@@ -1586,22 +1878,26 @@ class RoomViewSet(mixins.CreateModelMixin, mixins.RetrieveModelMixin, viewsets.G
         locked_rooms[key] = locked_info
         state["locked_rooms"] = locked_rooms
         _set_room_state(room, state)
-        return Response({"ok": True, "unlockers": locked_info["unlockers"]})
+        return self.action_ack(room, player=player, unlockers=locked_info["unlockers"])
 
     @action(detail=True, methods=["post"])
+    @room_serialized
     def sugoroku_tick(self, request, code=None):
         room = self.get_object()
         if room.game.slug != SUGOROKU_SLUG:
             return Response({"detail": "Invalid game."}, status=status.HTTP_400_BAD_REQUEST)
+        if room.status == Room.STATUS_ENDED:
+            return self.action_ack(room)
         state = _room_state(room)
         if not state.get("dice"):
             state = _roll_sugoroku(room)
             _set_room_state(room, state)
         state = _tick_sugoroku(room)
         _set_room_state(room, state)
-        return Response(RoomDetailSerializer(room, context=self.get_serializer_context()).data)
+        return self.action_ack(room)
 
     @action(detail=True, methods=["post"])
+    @room_serialized
     def sugoroku_penalty_choice(self, request, code=None):
         room = self.get_object()
         if room.game.slug != SUGOROKU_SLUG:
@@ -1633,9 +1929,10 @@ class RoomViewSet(mixins.CreateModelMixin, mixins.RetrieveModelMixin, viewsets.G
                 break
         state["pending_penalties"] = penalties
         _set_room_state(room, state)
-        return Response({"ok": True})
+        return self.action_ack(room)
 
     @action(detail=True, methods=["post"])
+    @room_serialized
     def leilao_bid(self, request, code=None):
         room = self.get_object()
         if room.game.slug != LEILAO_SLUG:
@@ -1675,18 +1972,22 @@ class RoomViewSet(mixins.CreateModelMixin, mixins.RetrieveModelMixin, viewsets.G
         player.save(update_fields=["state"])
         state = _tick_leilao(room)
         _set_room_state(room, state)
-        return Response({"ok": True})
+        return self.action_ack(room)
 
     @action(detail=True, methods=["post"])
+    @room_serialized
     def leilao_tick(self, request, code=None):
         room = self.get_object()
         if room.game.slug != LEILAO_SLUG:
             return Response({"detail": "Invalid game."}, status=status.HTTP_400_BAD_REQUEST)
+        if room.status == Room.STATUS_ENDED:
+            return self.action_ack(room)
         state = _tick_leilao(room)
         _set_room_state(room, state)
-        return Response(RoomDetailSerializer(room, context=self.get_serializer_context()).data)
+        return self.action_ack(room)
 
     @action(detail=True, methods=["post"])
+    @room_serialized
     def blef_jack_bet(self, request, code=None):
         room = self.get_object()
         if room.game.slug != BLEF_JACK_SLUG:
@@ -1694,6 +1995,7 @@ class RoomViewSet(mixins.CreateModelMixin, mixins.RetrieveModelMixin, viewsets.G
         return Response({"detail": "Betting not supported."}, status=status.HTTP_400_BAD_REQUEST)
 
     @action(detail=True, methods=["post"])
+    @room_serialized
     def blef_jack_declare(self, request, code=None):
         room = self.get_object()
         if room.game.slug != BLEF_JACK_SLUG:
@@ -1718,10 +2020,10 @@ class RoomViewSet(mixins.CreateModelMixin, mixins.RetrieveModelMixin, viewsets.G
             if _blef_all_declared(active_players):
                 state["phase"] = "guess"
         _set_room_state(room, state)
-        room = _fresh_room(room)
-        return Response(RoomDetailSerializer(room, context=self.get_serializer_context()).data)
+        return self.action_ack(room)
 
     @action(detail=True, methods=["post"])
+    @room_serialized
     def blef_jack_guess(self, request, code=None):
         room = self.get_object()
         if room.game.slug != BLEF_JACK_SLUG:
@@ -1746,5 +2048,5 @@ class RoomViewSet(mixins.CreateModelMixin, mixins.RetrieveModelMixin, viewsets.G
         if _blef_all_guessed(active_players):
             state = _blef_resolve_round(room, state)
         _set_room_state(room, state)
-        room = _fresh_room(room)
-        return Response(RoomDetailSerializer(room, context=self.get_serializer_context()).data)
+        return self.action_ack(room)
+
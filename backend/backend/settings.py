@@ -39,6 +39,16 @@ def env_int(name: str, default: int) -> int:
         return default
 
 
+def env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
 def env_list(name: str) -> list[str]:
     value = os.getenv(name, "")
     return [item.strip() for item in value.split(",") if item.strip()]
@@ -85,8 +95,10 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
+    "api.middleware.APICompressionMiddleware",
     'django.middleware.security.SecurityMiddleware',
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "api.middleware.AsyncWhiteNoiseMiddleware",
+    "api.middleware.ReplicaReadMiddleware",
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -126,6 +138,22 @@ DATABASES = {
     )
 }
 
+# Optional read replica for poll traffic (see api/db_router.py). Locally this
+# can be a second Postgres database or a copy of the SQLite file.
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL")
+if DATABASE_REPLICA_URL:
+    DATABASES["replica"] = dj_database_url.parse(
+        DATABASE_REPLICA_URL,
+        conn_max_age=env_int("DJANGO_CONN_MAX_AGE", 60),
+        conn_health_checks=True,
+    )
+    DATABASES["replica"]["TEST"] = {"MIRROR": "default"}
+
+DATABASE_ROUTERS = ["api.db_router.ReplicaRouter"]
+
+# Seconds a client keeps reading from the primary after a successful write.
+REPLICA_PIN_SECONDS = env_int("DJANGO_REPLICA_PIN_SECONDS", 5)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -172,9 +200,92 @@ if CORS_ALLOWED_ORIGINS:
 
 CSRF_TRUSTED_ORIGINS = env_list("CSRF_TRUSTED_ORIGINS")
 
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+REDIS_URL = os.getenv("DJANGO_REDIS_URL")
+if REDIS_URL:
+    CACHES["default"] = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": REDIS_URL,
+    }
+
+# Replica pins (api/db_router.py) must be seen by every worker, or a client's
+# next read can land on a worker that doesn't know it just wrote.
+if DATABASE_REPLICA_URL and not REDIS_URL:
+    raise RuntimeError("DATABASE_REPLICA_URL requires DJANGO_REDIS_URL (a cache shared by all workers).")
+
+# How long a token -> user lookup is cached (api/authentication.py). Deleting a
+# token or editing its user invalidates the entry, but only in the cache that
+# worker uses: with the per-process LocMem cache, other workers keep honouring
+# a revoked token for up to this long, so the default stays short without Redis.
+AUTH_TOKEN_CACHE_SECONDS = env_int("AUTH_TOKEN_CACHE_SECONDS", 30 if REDIS_URL else 5)
+
+# Serialize each room's actions through an in-process actor (see api/actors.py).
+# Requires the proxy to pin rooms to workers when running more than one process.
+ROOM_ACTORS_ENABLED = env_bool("ROOM_ACTORS_ENABLED", False)
+ROOM_ACTOR_SHARDS = env_int("ROOM_ACTOR_SHARDS", 4)
+ROOM_ACTOR_THREADS = env_int("ROOM_ACTOR_THREADS", 4)
+
+# Serve room retrieve/players, the game list and presence pings from native
+# async views (api/async_views.py). Meant for the ASGI entry point.
+ASYNC_READ_VIEWS = env_bool("DJANGO_ASYNC_READ_VIEWS", False)
+
+# Under WSGI, each open room stream (api/streams.py) holds a worker thread for
+# up to this many seconds before the client reconnects. Keep it below the
+# server's worker timeout (gunicorn: 30s) and run threaded workers; 0 answers
+# 404 so clients poll instead.
+STREAM_WSGI_MAX_SECONDS = env_int("DJANGO_STREAM_WSGI_MAX_SECONDS", 25)
+# Same for the `wait` long-poll: its timeout is capped at this under WSGI.
+WAIT_WSGI_MAX_SECONDS = env_int("DJANGO_WAIT_WSGI_MAX_SECONDS", 25)
+
+# Registration/login password hashing is bounded by a concurrency limit (see
+# api/hashing.py). It runs inline by default; set workers > 0 to opt into a
+# process pool.
+PASSWORD_HASH_WORKERS = env_int("PASSWORD_HASH_WORKERS", 0)
+PASSWORD_HASH_MAX_PENDING = env_int("PASSWORD_HASH_MAX_PENDING", 8)
+PASSWORD_HASH_WAIT_SECONDS = env_int("PASSWORD_HASH_WAIT_SECONDS", 5)
+
+# Opt-in request profiling (see api/profiling.py): a sampled fraction of
+# requests, plus any sent with `X-Profile: <DJANGO_PROFILE_TOKEN>`.
+PROFILE_SAMPLE_RATE = env_float("DJANGO_PROFILE_SAMPLE_RATE", 0.0)
+PROFILE_TOKEN = os.getenv("DJANGO_PROFILE_TOKEN", "")
+PROFILE_DIR = os.getenv("DJANGO_PROFILE_DIR", str(BASE_DIR / "profiles"))
+PROFILE_INTERVAL_MS = env_int("DJANGO_PROFILE_INTERVAL_MS", 2)
+if PROFILE_SAMPLE_RATE > 0 or PROFILE_TOKEN:
+    MIDDLEWARE.append("api.middleware.ProfilingMiddleware")
+
+# Log statements slower than DJANGO_SLOW_QUERY_MS (0 = off) with their call
+# site and EXPLAIN plan (see api/slow_queries.py). EXPLAIN ANALYZE re-runs the
+# SELECT on Postgres, so it is a separate switch.
+SLOW_QUERY_MS = env_float("DJANGO_SLOW_QUERY_MS", 0.0)
+SLOW_QUERY_LOG = os.getenv("DJANGO_SLOW_QUERY_LOG", str(BASE_DIR / "slow_queries.jsonl"))
+SLOW_QUERY_EXPLAIN_ANALYZE = env_bool("DJANGO_SLOW_QUERY_EXPLAIN_ANALYZE", False)
+
+# Engine tracing spans (see api/tracing.py): "jsonl" appends spans to
+# DJANGO_TRACE_FILE, "otlp" posts OTLP/HTTP JSON to DJANGO_TRACE_OTLP_ENDPOINT.
+TRACING_EXPORTER = os.getenv("DJANGO_TRACING", "")
+TRACE_FILE = os.getenv("DJANGO_TRACE_FILE", str(BASE_DIR / "traces.jsonl"))
+TRACE_OTLP_ENDPOINT = os.getenv("DJANGO_TRACE_OTLP_ENDPOINT", "http://127.0.0.1:4318/v1/traces")
+if TRACING_EXPORTER:
+    MIDDLEWARE.append("api.middleware.TracingMiddleware")
+
+# Opt-in traffic recording for replay_traffic (see api/recording.py): API
+# requests with anonymized bodies and hashed users, as gzipped JSONL files in
+# DJANGO_TRAFFIC_DIR. First in the stack so timings cover all middleware.
+TRAFFIC_RECORD = env_bool("DJANGO_RECORD_TRAFFIC", False)
+TRAFFIC_DIR = os.getenv("DJANGO_TRAFFIC_DIR", str(BASE_DIR / "traffic"))
+if TRAFFIC_RECORD:
+    MIDDLEWARE.insert(0, "api.middleware.TrafficRecorderMiddleware")
+
+API_COMPRESSION_PATH_PREFIX = "/api/"
+API_COMPRESSION_MIN_BYTES = env_int("API_COMPRESSION_MIN_BYTES", 512)
+
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.TokenAuthentication",
+        "api.authentication.CachedTokenAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ],
 }
@@ -1,4 +1,4 @@
-import type { Game, Player, Room } from './types'
+import type { Game, LeaderboardEntry, Player, Room, RoomAck, RoomHistoryEntry, UserGameStats } from './types'
 
 const DEFAULT_API = 'https://sabadogames.pythonanywhere.com'
 const API_URL = (import.meta.env.VITE_API_URL as string | undefined) ?? DEFAULT_API
@@ -58,6 +58,12 @@ export async function loginAccount(payload: { email: string; password: string })
   })
 }
 
+export async function logoutAccount(): Promise<{ ok: boolean }> {
+  const result = await request<{ ok: boolean }>('/auth/logout/', { method: 'POST' })
+  clearToken()
+  return result
+}
+
 export async function getMe(): Promise<{ user: { id?: number; email?: string; profile?: { nickname: string } } }> {
   return request('/auth/me/')
 }
@@ -80,6 +86,44 @@ export async function updatePassword(payload: {
   })
 }
 
+// Rooms the signed-in user joined, newest first; pass `nextCursor` back for the next page.
+export async function getRoomHistory(
+  cursor?: string,
+  limit = 20,
+): Promise<{ results: RoomHistoryEntry[]; nextCursor: string | null }> {
+  const params = new URLSearchParams({ limit: String(limit) })
+  if (cursor) params.set('cursor', cursor)
+  const page = await request<{ next: string | null; results: RoomHistoryEntry[] }>(`/auth/history/?${params}`)
+  return {
+    results: page.results,
+    nextCursor: page.next ? new URL(page.next).searchParams.get('cursor') : null,
+  }
+}
+
+export async function getMyStats(): Promise<{
+  totals: { played: number; wins: number; points: number }
+  games: UserGameStats[]
+}> {
+  return request('/auth/stats/')
+}
+
+// Most wins first; pass `nextCursor` back for the next page.
+export async function getLeaderboard(
+  gameId: number,
+  cursor?: string,
+  limit = 20,
+): Promise<{ results: LeaderboardEntry[]; nextCursor: string | null }> {
+  const params = new URLSearchParams({ limit: String(limit) })
+  if (cursor) params.set('cursor', cursor)
+  const page = await request<{ next: string | null; results: LeaderboardEntry[] }>(
+    `/games/${gameId}/leaderboard/?${params}`,
+  )
+  return {
+    results: page.results,
+    nextCursor: page.next ? new URL(page.next).searchParams.get('cursor') : null,
+  }
+}
+
 export async function listGames(): Promise<Game[]> {
   return request<Game[]>('/games/')
 }
@@ -95,8 +139,44 @@ export async function createRoom(params: {
   })
 }
 
-export async function getRoom(code: string): Promise<Room> {
-  return request<Room>(`/rooms/${code}/`)
+// Named field profiles: the response carries only the fields that screen reads.
+export type RoomProfile = 'tv' | 'lobby' | 'controller'
+
+export async function getRoom(code: string, profile?: RoomProfile): Promise<Room> {
+  return request<Room>(profile ? `/rooms/${code}/?profile=${profile}` : `/rooms/${code}/`)
+}
+
+export const DEFAULT_POLL_MS = 5000
+
+// Run `poll` (after `initialDelayMs`), then again after the `next_poll_ms` hint of the room it returns.
+export function startPolling(poll: () => Promise<Room | undefined>, initialDelayMs = 0): () => void {
+  let stopped = false
+  let timer: number | undefined
+  async function run() {
+    let room: Room | undefined
+    try {
+      room = await poll()
+    } finally {
+      if (!stopped) {
+        timer = window.setTimeout(run, room?.next_poll_ms ?? DEFAULT_POLL_MS)
+      }
+    }
+  }
+  timer = window.setTimeout(run, initialDelayMs)
+  return () => {
+    stopped = true
+    window.clearTimeout(timer)
+  }
+}
+
+export async function waitForRoom(
+  code: string,
+  version?: number,
+  timeoutSeconds = 25,
+): Promise<{ changed: boolean; version: number; room?: Room }> {
+  const params = new URLSearchParams({ timeout: String(timeoutSeconds) })
+  if (version !== undefined) params.set('version', String(version))
+  return request(`/rooms/${code}/wait/?${params.toString()}`)
 }
 
 export async function listRoomPlayers(code: string): Promise<{ players: Player[] }> {
@@ -117,8 +197,48 @@ export async function sendHeartbeat(code: string, playerId: number): Promise<{ o
   })
 }
 
-export async function startRoom(code: string, payload?: { mode?: 'coop' | 'versus' }): Promise<Room> {
-  return request<Room>(`/rooms/${code}/start/`, {
+export type BatchOp =
+  | { op: 'heartbeat' }
+  | { op: 'ready'; data: { ready: boolean } }
+  | { op: 'state'; data: { state: Record<string, unknown> } }
+  | { op: 'retrieve' }
+
+export async function batchRoom(code: string, ops: BatchOp[]): Promise<{ results: unknown[] }> {
+  return request<{ results: unknown[] }>(`/rooms/${code}/batch/`, {
+    method: 'POST',
+    body: JSON.stringify({ ops }),
+  })
+}
+
+// Heartbeat and room fetch in one round trip (the player must have joined).
+export async function heartbeatAndGetRoom(code: string): Promise<Room> {
+  const { results } = await batchRoom(code, [{ op: 'heartbeat' }, { op: 'retrieve' }])
+  return results[1] as Room
+}
+
+// Room actions answer with a small RoomAck; pass `snapshot` 'full' where the
+// screen needs the whole room right away instead of on the next poll.
+type Snapshot = 'full' | undefined
+type RoomActionResult<S extends Snapshot> = S extends 'full' ? Room : RoomAck
+
+function roomActionPath(code: string, action: string, snapshot?: Snapshot) {
+  return `/rooms/${code}/${action}/${snapshot ? `?snapshot=${snapshot}` : ''}`
+}
+
+// Fold an ack into the room on screen: the caller's own player, status and version.
+export function applyRoomAck(room: Room | null, ack: RoomAck): Room | null {
+  if (!room) return room
+  const mine = ack.player
+  const players = mine ? room.players?.map((player) => (player.id === mine.id ? { ...player, ...mine } : player)) : room.players
+  return { ...room, status: ack.status, version: ack.version, players }
+}
+
+export async function startRoom<S extends Snapshot = undefined>(
+  code: string,
+  payload?: { mode?: 'coop' | 'versus' },
+  snapshot?: S,
+): Promise<RoomActionResult<S>> {
+  return request<RoomActionResult<S>>(roomActionPath(code, 'start', snapshot), {
     method: 'POST',
     body: payload ? JSON.stringify(payload) : undefined,
   })
@@ -130,14 +250,18 @@ export async function endRoom(code: string): Promise<{ status: Room['status'] }>
   })
 }
 
-export async function restartRoom(code: string): Promise<Room> {
-  return request<Room>(`/rooms/${code}/restart/`, {
+export async function restartRoom<S extends Snapshot = undefined>(code: string, snapshot?: S): Promise<RoomActionResult<S>> {
+  return request<RoomActionResult<S>>(roomActionPath(code, 'restart', snapshot), {
     method: 'POST',
   })
 }
 
-export async function changeRoomGame(code: string, payload: { game_id?: number; game_slug?: string }): Promise<Room> {
-  return request<Room>(`/rooms/${code}/change_game/`, {
+export async function changeRoomGame<S extends Snapshot = undefined>(
+  code: string,
+  payload: { game_id?: number; game_slug?: string },
+  snapshot?: S,
+): Promise<RoomActionResult<S>> {
+  return request<RoomActionResult<S>>(roomActionPath(code, 'change_game', snapshot), {
     method: 'POST',
     body: JSON.stringify(payload),
   })
@@ -171,54 +295,74 @@ export async function tvPing(code: string, payload?: { device_id?: string }): Pr
   })
 }
 
-export async function setReadMyMindMode(code: string, mode: 'coop' | 'versus'): Promise<Room> {
-  return request<Room>(`/rooms/${code}/read_my_mind_mode/`, {
+export function subscribeRoomStream(
+  code: string,
+  deviceId: string,
+  onRoom: (room: Room) => void,
+  onUnavailable: () => void,
+): (() => void) | null {
+  if (typeof EventSource === 'undefined') return null
+  const params = new URLSearchParams({ device_id: deviceId })
+  const source = new EventSource(`${BASE_URL}/rooms/${code}/stream/?${params.toString()}`)
+  source.addEventListener('room', (event) => {
+    onRoom(JSON.parse((event as MessageEvent<string>).data) as Room)
+  })
+  // EventSource retries dropped connections itself; it only closes for good on
+  // an error response, e.g. the 404 a server with streaming turned off sends.
+  source.addEventListener('error', () => {
+    if (source.readyState === EventSource.CLOSED) onUnavailable()
+  })
+  return () => source.close()
+}
+
+export async function setReadMyMindMode(code: string, mode: 'coop' | 'versus'): Promise<RoomAck> {
+  return request<RoomAck>(`/rooms/${code}/read_my_mind_mode/`, {
     method: 'POST',
     body: JSON.stringify({ mode }),
   })
 }
 
-export async function playReadMyMindCard(code: string, card: number): Promise<Room> {
-  return request<Room>(`/rooms/${code}/read_my_mind_play/`, {
+export async function playReadMyMindCard(code: string, card: number): Promise<RoomAck> {
+  return request<RoomAck>(`/rooms/${code}/read_my_mind_play/`, {
     method: 'POST',
     body: JSON.stringify({ card }),
   })
 }
 
-export async function tickReadMyMind(code: string): Promise<Room> {
-  return request<Room>(`/rooms/${code}/read_my_mind_tick/`, {
+export async function tickReadMyMind<S extends Snapshot = undefined>(code: string, snapshot?: S): Promise<RoomActionResult<S>> {
+  return request<RoomActionResult<S>>(roomActionPath(code, 'read_my_mind_tick', snapshot), {
     method: 'POST',
   })
 }
 
-export async function submitConfinamentoGuess(code: string, guess: 'hearts' | 'diamonds' | 'clubs' | 'spades'): Promise<Room> {
-  return request<Room>(`/rooms/${code}/confinamento_guess/`, {
+export async function submitConfinamentoGuess(code: string, guess: 'hearts' | 'diamonds' | 'clubs' | 'spades'): Promise<RoomAck> {
+  return request<RoomAck>(`/rooms/${code}/confinamento_guess/`, {
     method: 'POST',
     body: JSON.stringify({ guess }),
   })
 }
 
-export async function tickConfinamento(code: string): Promise<Room> {
-  return request<Room>(`/rooms/${code}/confinamento_tick/`, {
+export async function tickConfinamento(code: string): Promise<RoomAck> {
+  return request<RoomAck>(`/rooms/${code}/confinamento_tick/`, {
     method: 'POST',
   })
 }
 
-export async function submitBelezaGuess(code: string, value: number): Promise<Room> {
-  return request<Room>(`/rooms/${code}/beleza_guess/`, {
+export async function submitBelezaGuess(code: string, value: number): Promise<RoomAck> {
+  return request<RoomAck>(`/rooms/${code}/beleza_guess/`, {
     method: 'POST',
     body: JSON.stringify({ value }),
   })
 }
 
-export async function tickBeleza(code: string): Promise<Room> {
-  return request<Room>(`/rooms/${code}/beleza_tick/`, {
+export async function tickBeleza(code: string): Promise<RoomAck> {
+  return request<RoomAck>(`/rooms/${code}/beleza_tick/`, {
     method: 'POST',
   })
 }
 
-export async function rollSugoroku(code: string): Promise<Room> {
-  return request<Room>(`/rooms/${code}/sugoroku_roll/`, {
+export async function rollSugoroku<S extends Snapshot = undefined>(code: string, snapshot?: S): Promise<RoomActionResult<S>> {
+  return request<RoomActionResult<S>>(roomActionPath(code, 'sugoroku_roll', snapshot), {
     method: 'POST',
   })
 }
@@ -226,62 +370,62 @@ export async function rollSugoroku(code: string): Promise<Room> {
 export async function moveSugoroku(
   code: string,
   payload: { action: 'move' | 'stay' | 'back'; direction?: 'N' | 'S' | 'E' | 'W' },
-): Promise<{ ok: boolean }> {
-  return request<{ ok: boolean }>(`/rooms/${code}/sugoroku_move/`, {
+): Promise<RoomAck> {
+  return request<RoomAck>(`/rooms/${code}/sugoroku_move/`, {
     method: 'POST',
     body: JSON.stringify(payload),
   })
 }
 
-export async function unlockSugoroku(code: string): Promise<{ ok: boolean }> {
-  return request<{ ok: boolean }>(`/rooms/${code}/sugoroku_unlock/`, {
+export async function unlockSugoroku(code: string): Promise<RoomAck & { unlockers: number[] }> {
+  return request<RoomAck & { unlockers: number[] }>(`/rooms/${code}/sugoroku_unlock/`, {
     method: 'POST',
     body: JSON.stringify({ ready: true }),
   })
 }
 
-export async function tickSugoroku(code: string): Promise<Room> {
-  return request<Room>(`/rooms/${code}/sugoroku_tick/`, {
+export async function tickSugoroku(code: string): Promise<RoomAck> {
+  return request<RoomAck>(`/rooms/${code}/sugoroku_tick/`, {
     method: 'POST',
   })
 }
 
-export async function chooseSugorokuPenalty(code: string, target_player_id: number): Promise<{ ok: boolean }> {
-  return request<{ ok: boolean }>(`/rooms/${code}/sugoroku_penalty_choice/`, {
+export async function chooseSugorokuPenalty(code: string, target_player_id: number): Promise<RoomAck> {
+  return request<RoomAck>(`/rooms/${code}/sugoroku_penalty_choice/`, {
     method: 'POST',
     body: JSON.stringify({ target_player_id }),
   })
 }
 
-export async function bidLeilao(code: string, bid: number): Promise<{ ok: boolean }> {
-  return request<{ ok: boolean }>(`/rooms/${code}/leilao_bid/`, {
+export async function bidLeilao(code: string, bid: number): Promise<RoomAck> {
+  return request<RoomAck>(`/rooms/${code}/leilao_bid/`, {
     method: 'POST',
     body: JSON.stringify({ bid }),
   })
 }
 
-export async function tickLeilao(code: string): Promise<Room> {
-  return request<Room>(`/rooms/${code}/leilao_tick/`, {
+export async function tickLeilao(code: string): Promise<RoomAck> {
+  return request<RoomAck>(`/rooms/${code}/leilao_tick/`, {
     method: 'POST',
   })
 }
 
-export async function betBlefJack(code: string, bet: number): Promise<Room> {
-  return request<Room>(`/rooms/${code}/blef_jack_bet/`, {
+export async function betBlefJack(code: string, bet: number): Promise<RoomAck> {
+  return request<RoomAck>(`/rooms/${code}/blef_jack_bet/`, {
     method: 'POST',
     body: JSON.stringify({ bet }),
   })
 }
 
-export async function declareBlefJack(code: string, declared_value: number): Promise<Room> {
-  return request<Room>(`/rooms/${code}/blef_jack_declare/`, {
+export async function declareBlefJack(code: string, declared_value: number): Promise<RoomAck> {
+  return request<RoomAck>(`/rooms/${code}/blef_jack_declare/`, {
     method: 'POST',
     body: JSON.stringify({ declared_value }),
   })
 }
 
-export async function guessBlefJack(code: string, winner_player_id: number): Promise<Room> {
-  return request<Room>(`/rooms/${code}/blef_jack_guess/`, {
+export async function guessBlefJack(code: string, winner_player_id: number): Promise<RoomAck> {
+  return request<RoomAck>(`/rooms/${code}/blef_jack_guess/`, {
     method: 'POST',
     body: JSON.stringify({ winner_player_id }),
   })
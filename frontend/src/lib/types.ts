@@ -19,6 +19,8 @@ export type Player = {
       nickname: string
     }
   }
+  // The only user reference in the `lobby` and `controller` profiles.
+  user_id?: number
   device_id: string
   is_host: boolean
   ready: boolean
@@ -42,4 +44,44 @@ export type Room = {
   tv_connected?: boolean
   players?: Player[]
   state?: Record<string, unknown>
+  version?: number
+  next_poll_ms?: number
+}
+
+export type RoomHistoryEntry = {
+  id: number
+  code: string
+  game_slug: string
+  game_name: string
+  status: Room['status']
+  name: string
+  is_host: boolean
+  joined_at: string
+  won: boolean | null
+}
+
+export type UserGameStats = {
+  game_slug: string
+  game_name: string
+  played: number
+  wins: number
+  points: number
+  best_points: number
+  last_played_at: string | null
+}
+
+export type LeaderboardEntry = {
+  user_id: number
+  nickname: string
+  played: number
+  wins: number
+  points: number
+  best_points: number
+}
+
+export type RoomAck = {
+  ok: boolean
+  version: number
+  status: Room['status']
+  player: Pick<Player, 'id' | 'ready' | 'state' | 'is_valete'> | null
 }
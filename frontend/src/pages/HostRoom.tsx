@@ -22,7 +22,7 @@ import {
 } from '@mui/icons-material'
 import anime from 'animejs'
 import { useAuth } from '../context/useAuth'
-import { changeRoomGame, endRoom, getRoom, listGames, setReady, startRoom } from '../lib/api'
+import { changeRoomGame, DEFAULT_POLL_MS, endRoom, getRoom, listGames, setReady, startPolling, startRoom } from '../lib/api'
 import { saveLastRoom } from '../lib/roomHistory'
 import type { Game, Player, Room } from '../lib/types'
 
@@ -111,21 +111,24 @@ export default function HostRoom() {
     if (!code) return
     const roomCode = code
     let active = true
-    const interval = window.setInterval(async () => {
+    async function pollRoom() {
       try {
-        const data = await getRoom(roomCode)
+        const data = await getRoom(roomCode, 'lobby')
         if (!active) return
         setRoom(data)
         setPlayers(data.players ?? [])
         setTvConnected(Boolean(data.tv_connected))
+        return data
       } catch (err) {
         if (!active) return
         setError(err instanceof Error ? err.message : 'Erro ao atualizar sala.')
       }
-    }, 5000)
+    }
+    // loadInitial above fetches the room on mount.
+    const stopPolling = startPolling(pollRoom, DEFAULT_POLL_MS)
     return () => {
       active = false
-      window.clearInterval(interval)
+      stopPolling()
     }
   }, [code])
 
@@ -163,7 +166,7 @@ export default function HostRoom() {
       return
     }
     try {
-      const updated = await changeRoomGame(code, { game_id: game.id })
+      const updated = await changeRoomGame(code, { game_id: game.id }, 'full')
       setRoom(updated)
       setPlayers(updated.players ?? [])
     } catch (err) {
@@ -227,7 +230,7 @@ export default function HostRoom() {
 
   const hostPlayer = useMemo(() => {
     if (!user?.id) return null
-    return players.find((player) => player.user?.id === user.id) ?? null
+    return players.find((player) => (player.user_id ?? player.user?.id) === user.id) ?? null
   }, [players, user?.id])
 
   async function handleHostReadyToggle() {
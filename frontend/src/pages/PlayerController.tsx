@@ -2,7 +2,7 @@ import { useState, useEffect } from 'react'
 import { useParams, useNavigate } from 'react-router-dom'
 import { Box, Typography, Button } from '@mui/material'
 import { useAuth } from '../context/useAuth'
-import { getRoom, joinRoom, sendHeartbeat, setReady } from '../lib/api'
+import { getRoom, heartbeatAndGetRoom, joinRoom, setReady, startPolling } from '../lib/api'
 import { clearStayInLobby, getStayInLobby, saveLastRoom } from '../lib/roomHistory'
 import type { Player, Room } from '../lib/types'
 
@@ -49,13 +49,16 @@ export default function PlayerController() {
     }
   }, [code, isAuthenticated])
 
+  const playerId = player?.id
+
   useEffect(() => {
     if (!code) return
     const roomCode = code
     let active = true
     async function pollRoom() {
       try {
-        const data = await getRoom(roomCode)
+        // Once joined, the heartbeat rides along with the room fetch.
+        const data = playerId ? await heartbeatAndGetRoom(roomCode) : await getRoom(roomCode, 'lobby')
         if (!active) return
         setRoom(data)
         if (data.status === 'live') {
@@ -71,32 +74,18 @@ export default function PlayerController() {
             clearStayInLobby(roomCode)
           }
         }
+        return data
       } catch (err) {
         if (!active) return
         setError(err instanceof Error ? err.message : 'Erro ao atualizar sala.')
       }
     }
-    pollRoom()
-    const interval = window.setInterval(pollRoom, 5000)
+    const stopPolling = startPolling(pollRoom)
     return () => {
       active = false
-      window.clearInterval(interval)
-    }
-  }, [code, navigate])
-
-  useEffect(() => {
-    if (!code || !player) return
-    const roomCode = code
-    const playerId = player.id
-    const interval = window.setInterval(() => {
-      sendHeartbeat(roomCode, playerId).catch(() => {
-        // Ignore heartbeat errors
-      })
-    }, 10000)
-    return () => {
-      window.clearInterval(interval)
+      stopPolling()
     }
-  }, [code, player])
+  }, [code, navigate, playerId])
 
   async function handleReadyToggle() {
     if (!code) return
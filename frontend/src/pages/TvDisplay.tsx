@@ -1,7 +1,7 @@
 import { useEffect, useMemo, useState } from 'react'
 import { useParams, useNavigate } from 'react-router-dom'
 import { Box, Typography, Button, Avatar, Chip } from '@mui/material'
-import { getRoom, tvPing } from '../lib/api'
+import { getRoom, startPolling, subscribeRoomStream, tvPing } from '../lib/api'
 import type { Room } from '../lib/types'
 
 export default function TvDisplay() {
@@ -25,19 +25,24 @@ export default function TvDisplay() {
     const roomCode = code
     let active = true
 
+    function showRoom(data: Room) {
+      setRoom(data)
+      if (data.status === 'live') {
+        if (data.game?.slug === 'read-my-mind') {
+          navigate(`/game/${roomCode}/read-my-mind?view=tv`)
+        } else {
+          navigate(`/game/${roomCode}?view=tv`)
+        }
+      }
+    }
+
     async function poll() {
       try {
         await tvPing(roomCode, { device_id: deviceId })
-        const data = await getRoom(roomCode)
+        const data = await getRoom(roomCode, 'tv')
         if (!active) return
-        setRoom(data)
-        if (data.status === 'live') {
-          if (data.game?.slug === 'read-my-mind') {
-            navigate(`/game/${roomCode}/read-my-mind?view=tv`)
-          } else {
-            navigate(`/game/${roomCode}?view=tv`)
-          }
-        }
+        showRoom(data)
+        return data
       } catch (err) {
         if (!active) return
         setError(err instanceof Error ? err.message : 'Erro ao carregar sala.')
@@ -48,11 +53,28 @@ export default function TvDisplay() {
       }
     }
 
-    poll()
-    const interval = window.setInterval(poll, 5000)
+    let stopPolling: (() => void) | null = null
+    function fallBackToPolling() {
+      if (active && !stopPolling) stopPolling = startPolling(poll)
+    }
+
+    // The stream also counts as TV presence, so no tv_ping is needed while it is open.
+    const unsubscribe = subscribeRoomStream(
+      roomCode,
+      deviceId,
+      (data) => {
+        if (!active) return
+        setError('')
+        setLoading(false)
+        showRoom(data)
+      },
+      fallBackToPolling,
+    )
+    if (!unsubscribe) fallBackToPolling()
     return () => {
       active = false
-      window.clearInterval(interval)
+      unsubscribe?.()
+      stopPolling?.()
     }
   }, [code, deviceId, navigate])
 
@@ -2,7 +2,7 @@ import { useEffect, useMemo, useState } from 'react'
 import { useNavigate, useParams, useSearchParams } from 'react-router-dom'
 import { Box, Button, Chip, CircularProgress, TextField, Typography } from '@mui/material'
 import { useAuth } from '../../context/useAuth'
-import { getRoom, submitBelezaGuess, tickBeleza } from '../../lib/api'
+import { applyRoomAck, getRoom, startPolling, submitBelezaGuess, tickBeleza } from '../../lib/api'
 import { saveLastRoom, setStayInLobby } from '../../lib/roomHistory'
 import type { Player, Room } from '../../lib/types'
 import { formatSeconds, useCountdown } from '../../games/utils'
@@ -53,6 +53,7 @@ export default function BelezaGame() {
         const data = await getRoom(roomCode)
         if (!active) return
         setRoom(data)
+        return data
       } catch (err) {
         if (!active) return
         setError(err instanceof Error ? err.message : 'Failed to load room.')
@@ -63,11 +64,10 @@ export default function BelezaGame() {
       }
     }
 
-    poll()
-    const interval = window.setInterval(poll, 5000)
+    const stopPolling = startPolling(poll)
     return () => {
       active = false
-      window.clearInterval(interval)
+      stopPolling()
     }
   }, [code, viewMode])
 
@@ -117,8 +117,8 @@ export default function BelezaGame() {
     setSubmitting(true)
     setError('')
     try {
-      const data = await submitBelezaGuess(code, value)
-      setRoom(data)
+      const ack = await submitBelezaGuess(code, value)
+      setRoom((current) => applyRoomAck(current, ack))
       setSubmitted(true)
     } catch (err) {
       setError(err instanceof Error ? err.message : 'Failed to submit guess.')
@@ -2,7 +2,7 @@ import { useEffect, useMemo, useState } from 'react'
 import { useNavigate, useParams, useSearchParams } from 'react-router-dom'
 import { Box, Button, Chip, CircularProgress, MenuItem, TextField, Typography } from '@mui/material'
 import { useAuth } from '../../context/useAuth'
-import { getRoom, guessBlefJack } from '../../lib/api'
+import { applyRoomAck, getRoom, guessBlefJack, startPolling } from '../../lib/api'
 import { saveLastRoom, setStayInLobby } from '../../lib/roomHistory'
 import type { Player, Room } from '../../lib/types'
 
@@ -66,6 +66,7 @@ export default function BlefJackGame() {
         const data = await getRoom(roomCode)
         if (!active) return
         setRoom(data)
+        return data
       } catch (err) {
         if (!active) return
         setError(err instanceof Error ? err.message : 'Failed to load room.')
@@ -76,11 +77,10 @@ export default function BlefJackGame() {
       }
     }
 
-    poll()
-    const interval = window.setInterval(poll, 5000)
+    const stopPolling = startPolling(poll)
     return () => {
       active = false
-      window.clearInterval(interval)
+      stopPolling()
     }
   }, [code])
 
@@ -130,8 +130,8 @@ export default function BlefJackGame() {
     setSubmitting(true)
     setError('')
     try {
-      const data = await guessBlefJack(code, value)
-      setRoom(data)
+      const ack = await guessBlefJack(code, value)
+      setRoom((current) => applyRoomAck(current, ack))
       setGuessWinner('')
     } catch (err) {
       setError(err instanceof Error ? err.message : 'Failed to guess.')
@@ -2,7 +2,7 @@ import { useEffect, useMemo, useState } from 'react'
 import { useNavigate, useParams, useSearchParams } from 'react-router-dom'
 import { Box, Button, Chip, CircularProgress, Typography } from '@mui/material'
 import { useAuth } from '../../context/useAuth'
-import { getRoom, submitConfinamentoGuess, tickConfinamento } from '../../lib/api'
+import { applyRoomAck, getRoom, startPolling, submitConfinamentoGuess, tickConfinamento } from '../../lib/api'
 import { saveLastRoom, setStayInLobby } from '../../lib/roomHistory'
 import type { Player, Room } from '../../lib/types'
 import { formatSeconds, useCountdown } from '../../games/utils'
@@ -59,6 +59,7 @@ export default function ConfinamentoGame() {
         const data = await getRoom(roomCode)
         if (!active) return
         setRoom(data)
+        return data
       } catch (err) {
         if (!active) return
         setError(err instanceof Error ? err.message : 'Failed to load room.')
@@ -69,11 +70,10 @@ export default function ConfinamentoGame() {
       }
     }
 
-    poll()
-    const interval = window.setInterval(poll, 5000)
+    const stopPolling = startPolling(poll)
     return () => {
       active = false
-      window.clearInterval(interval)
+      stopPolling()
     }
   }, [code, viewMode])
 
@@ -130,8 +130,8 @@ export default function ConfinamentoGame() {
     setSubmitting(true)
     setError('')
     try {
-      const data = await submitConfinamentoGuess(code, guess)
-      setRoom(data)
+      const ack = await submitConfinamentoGuess(code, guess)
+      setRoom((current) => applyRoomAck(current, ack))
       setLastGuess(guess)
     } catch (err) {
       setError(err instanceof Error ? err.message : 'Failed to submit guess.')
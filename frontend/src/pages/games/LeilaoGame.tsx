@@ -2,7 +2,7 @@ import { useEffect, useMemo, useState } from 'react'
 import { useNavigate, useParams, useSearchParams } from 'react-router-dom'
 import { Box, Button, Chip, CircularProgress, TextField, Typography } from '@mui/material'
 import { useAuth } from '../../context/useAuth'
-import { bidLeilao, getRoom, tickLeilao } from '../../lib/api'
+import { applyRoomAck, bidLeilao, getRoom, startPolling, tickLeilao } from '../../lib/api'
 import { saveLastRoom, setStayInLobby } from '../../lib/roomHistory'
 import type { Player, Room } from '../../lib/types'
 import { formatSeconds, useCountdown } from '../../games/utils'
@@ -52,6 +52,7 @@ export default function LeilaoGame() {
         const data = await getRoom(roomCode)
         if (!active) return
         setRoom(data)
+        return data
       } catch (err) {
         if (!active) return
         setError(err instanceof Error ? err.message : 'Failed to load room.')
@@ -62,11 +63,10 @@ export default function LeilaoGame() {
       }
     }
 
-    poll()
-    const interval = window.setInterval(poll, 5000)
+    const stopPolling = startPolling(poll)
     return () => {
       active = false
-      window.clearInterval(interval)
+      stopPolling()
     }
   }, [code, viewMode])
 
@@ -129,9 +129,8 @@ export default function LeilaoGame() {
     setSubmitting(true)
     setError('')
     try {
-      await bidLeilao(code, value)
-      const data = await getRoom(code)
-      setRoom(data)
+      const ack = await bidLeilao(code, value)
+      setRoom((current) => applyRoomAck(current, ack))
       setBidValue('')
     } catch (err) {
       setError(err instanceof Error ? err.message : 'Failed to bid.')
@@ -4,7 +4,7 @@ import { Box, Button, CircularProgress, Typography } from '@mui/material'
 import { useAuth } from '../../context/useAuth'
 import { TvView, PlayerView, HostView } from '../../games/ReadMyMind'
 import type { GameMode, GameState } from '../../games/ReadMyMind'
-import { getRoom, playReadMyMindCard, restartRoom, startRoom, tickReadMyMind, tvPing } from '../../lib/api'
+import { applyRoomAck, getRoom, playReadMyMindCard, restartRoom, startPolling, startRoom, tickReadMyMind, tvPing } from '../../lib/api'
 import { saveLastRoom, setStayInLobby } from '../../lib/roomHistory'
 import type { Room } from '../../lib/types'
 
@@ -155,6 +155,7 @@ export default function ReadMyMindGame() {
         const data = await getRoom(roomCode)
         if (!active) return
         setRoom(data)
+        return data
       } catch (err) {
         if (!active) return
         setError(err instanceof Error ? err.message : 'Erro ao carregar sala.')
@@ -164,11 +165,10 @@ export default function ReadMyMindGame() {
         }
       }
     }
-    loadRoom()
-    const interval = window.setInterval(loadRoom, 5000)
+    const stopPolling = startPolling(loadRoom)
     return () => {
       active = false
-      window.clearInterval(interval)
+      stopPolling()
     }
   }, [code, viewMode, deviceId])
 
@@ -176,7 +176,7 @@ export default function ReadMyMindGame() {
     if (!code) return
     setError('')
     try {
-      const data = await startRoom(code, { mode })
+      const data = await startRoom(code, { mode }, 'full')
       setRoom(data)
     } catch (err) {
       setError(err instanceof Error ? err.message : 'Erro ao iniciar jogo.')
@@ -187,8 +187,8 @@ export default function ReadMyMindGame() {
     if (!code || !playerId) return
     setError('')
     try {
-      const data = await playReadMyMindCard(code, cardValue)
-      setRoom(data)
+      const ack = await playReadMyMindCard(code, cardValue)
+      setRoom((current) => applyRoomAck(current, ack))
     } catch (err) {
       setError(err instanceof Error ? err.message : 'Erro ao jogar carta.')
     }
@@ -202,7 +202,7 @@ export default function ReadMyMindGame() {
     if (!code) return
     setError('')
     try {
-      const data = await restartRoom(code)
+      const data = await restartRoom(code, 'full')
       setRoom(data)
       setHostScreen('control')
     } catch (err) {
@@ -214,7 +214,7 @@ export default function ReadMyMindGame() {
     if (!code) return
     setError('')
     try {
-      const data = await tickReadMyMind(code)
+      const data = await tickReadMyMind(code, 'full')
       setRoom(data)
     } catch (err) {
       setError(err instanceof Error ? err.message : 'Erro ao avancar rodada.')
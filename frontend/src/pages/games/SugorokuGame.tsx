@@ -2,7 +2,7 @@ import { useEffect, useMemo, useState } from 'react'
 import { useNavigate, useParams, useSearchParams } from 'react-router-dom'
 import { Box, Button, Chip, CircularProgress, Typography } from '@mui/material'
 import { useAuth } from '../../context/useAuth'
-import { getRoom, moveSugoroku, rollSugoroku, tickSugoroku, unlockSugoroku } from '../../lib/api'
+import { applyRoomAck, getRoom, moveSugoroku, rollSugoroku, startPolling, tickSugoroku, unlockSugoroku } from '../../lib/api'
 import { saveLastRoom, setStayInLobby } from '../../lib/roomHistory'
 import type { Player, Room } from '../../lib/types'
 import { formatSeconds, useCountdown } from '../../games/utils'
@@ -57,6 +57,7 @@ export default function SugorokuGame() {
         const data = await getRoom(roomCode)
         if (!active) return
         setRoom(data)
+        return data
       } catch (err) {
         if (!active) return
         setError(err instanceof Error ? err.message : 'Failed to load room.')
@@ -67,11 +68,10 @@ export default function SugorokuGame() {
       }
     }
 
-    poll()
-    const interval = window.setInterval(poll, 5000)
+    const stopPolling = startPolling(poll)
     return () => {
       active = false
-      window.clearInterval(interval)
+      stopPolling()
     }
   }, [code, viewMode])
 
@@ -124,9 +124,8 @@ export default function SugorokuGame() {
     setSubmitting(true)
     setError('')
     try {
-      await moveSugoroku(code, { action, direction })
-      const data = await getRoom(code)
-      setRoom(data)
+      const ack = await moveSugoroku(code, { action, direction })
+      setRoom((current) => applyRoomAck(current, ack))
     } catch (err) {
       setError(err instanceof Error ? err.message : 'Failed to submit move.')
     } finally {
@@ -139,9 +138,8 @@ export default function SugorokuGame() {
     setSubmitting(true)
     setError('')
     try {
-      await unlockSugoroku(code)
-      const data = await getRoom(code)
-      setRoom(data)
+      const ack = await unlockSugoroku(code)
+      setRoom((current) => applyRoomAck(current, ack))
     } catch (err) {
       setError(err instanceof Error ? err.message : 'Failed to unlock room.')
     } finally {
@@ -154,7 +152,8 @@ export default function SugorokuGame() {
     setSubmitting(true)
     setError('')
     try {
-      const data = await rollSugoroku(code)
+      // Everyone waits on the dice, so show them now rather than on the next poll.
+      const data = await rollSugoroku(code, 'full')
       setRoom(data)
     } catch (err) {
       setError(err instanceof Error ? err.message : 'Failed to roll dice.')